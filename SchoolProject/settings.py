@@ -43,10 +43,14 @@ INSTALLED_APPS = [
     'web',
     'django_browser_reload',
     'notice',
+    'search',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'web.middleware.StaticFilesMiddleware',
+    'web.middleware.LoadSheddingMiddleware',
+    'web.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -76,6 +80,24 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'SchoolProject.wsgi.application'
 
+# Under ASGI (asgi.py sets DJANGO_ASYNC_VIEWS=1) the JSON endpoints and file
+# downloads are served by the async views in web/async_views.py.
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS') == '1'
+
+
+# Behind the reverse proxy, the META key of the header carrying the visitor's
+# address (e.g. HTTP_X_FORWARDED_FOR), used for throttling and the metrics
+# allow-list (see web.throttle.client_ip). Unset, REMOTE_ADDR is used.
+CLIENT_IP_HEADER = os.environ.get('DJANGO_CLIENT_IP_HEADER') or None
+CLIENT_IP_PROXY_COUNT = int(os.environ.get('DJANGO_CLIENT_IP_PROXY_COUNT', '1'))
+
+# Addresses that may read /metrics/ without a staff login, e.g. the
+# Prometheus host: DJANGO_METRICS_ALLOWED_IPS=10.0.0.5,10.0.0.6. Empty, only
+# staff can.
+METRICS_ALLOWED_IPS = tuple(
+    address.strip() for address in os.environ.get('DJANGO_METRICS_ALLOWED_IPS', '').split(',') if address.strip()
+)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -89,6 +111,31 @@ DATABASES = {
 }
 
 
+# Cache: a per-process LRU in front of a cache shared by all workers (see
+# web/cache_backends.py). The shared tier is Redis when REDIS_URL is set
+# (needs the redis package), otherwise files under DJANGO_CACHE_DIR.
+CACHES = {
+    'default': {
+        'BACKEND': 'web.cache_backends.TwoTierCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'L2': 'shared',
+            'L1_MAX_ENTRIES': 2000,
+            'L1_MAX_BYTES': 64 * 1024 * 1024,
+        },
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    } if os.environ.get('REDIS_URL') else {
+        # FileBasedCache with atomic add(), which the cache locks rely on.
+        'BACKEND': 'web.cache_backends.LockingFileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', os.path.join(BASE_DIR, '.cache')),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -137,6 +184,17 @@ STATICFILES_FINDERS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are stored once per unique content under media/blobs/ (see web/storage.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'web.storage.ContentAddressedStorage',
+    },
+    # Fingerprinted names plus .gz/.br variants, written by collectstatic
+    'staticfiles': {
+        'BACKEND': 'web.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -9,8 +9,9 @@ urlpatterns = [
     
     path('', include('web.urls')),
     path('', include('notice.urls')),
+    path('', include('search.urls')),
     # path('jet_api/', include('jet_django.urls')),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+# Static files are served by web.middleware.StaticFilesMiddleware (or runserver in DEBUG)
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
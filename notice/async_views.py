@@ -0,0 +1,19 @@
+# notice/async_views.py
+
+"""Async notice endpoints, used under ASGI like web/async_views.py."""
+
+from django.shortcuts import aget_object_or_404
+from web.async_views import file_response
+from .models import Notice
+from .views import notices_listing
+
+
+__all__ = ['filter_notices', 'download_notice']
+
+
+filter_notices = notices_listing.async_view()
+
+
+async def download_notice(request, pk):
+    notice = await aget_object_or_404(Notice, pk=pk)
+    return await file_response(request, notice.file, as_attachment=True)
@@ -1,13 +1,14 @@
 from django.shortcuts import render
-from django.http import JsonResponse, FileResponse
-from .models import Notice, NoticeType
-from web.models import Class, Department
-import random
+from django.http import FileResponse
+from .models import Notice
+from web.listings import Listing
+from web.taxonomy import taxonomy
 
 def notice_list(request):
-    classes = Class.objects.all().order_by('numeric_value')
-    departments = Department.objects.all()
-    notice_types = NoticeType.objects.all()
+    snapshot = taxonomy()
+    classes = snapshot.classes
+    departments = snapshot.departments
+    notice_types = snapshot.notice_types
 
     context = {
         'classes': classes,
@@ -16,39 +17,23 @@ def notice_list(request):
     }
     return render(request, 'notice/notice_list.html', context)
 
-def filter_notices(request):
-    notice_type_slug = request.GET.get('type_slug')
-    class_id = request.GET.get('class_id')
-    dept_slug = request.GET.get('dept_slug')
-
-    notices = Notice.objects.filter(is_active=True)
-
-    if notice_type_slug:
-        notices = notices.filter(notice_type__slug=notice_type_slug)
-    if class_id and class_id.isdigit():
-        notices = notices.filter(class_name_id=int(class_id))
-    elif dept_slug:
-        notices = notices.filter(department__slug=dept_slug)
-
-    notices = notices.order_by('-created_at')
-
-    notices_data = []
-    colors = ['#FF5733', '#33FF57', '#3357FF', '#FF33FF', '#33FFFF', '#FFFF33'] # Example colors
-
-    for notice in notices:
-        notices_data.append({
-            'id': notice.id,
-            'title': notice.title,
-            'short_description': notice.short_description,
-            'file_url': notice.file.url,
-            'download_url': f'/download-notice/{notice.id}/',
-            'background_color': random.choice(colors),
-            'notice_type': notice.notice_type.name,
-            'class_name': notice.class_name.name if notice.class_name else '',
-            'department': notice.department.name if notice.department else '',
-        })
-
-    return JsonResponse({'notices': notices_data})
+NOTICE_COLORS = ['#FF5733', '#33FF57', '#3357FF', '#FF33FF', '#33FFFF', '#FFFF33'] # Example colors
+
+
+def _notice_extra(row, values, snapshot):
+    notice_type = snapshot.notice_type_by_id.get(values['notice_type_id'])
+    row['short_description'] = values['short_description']
+    # Picked from the pk rather than at random so a cached page keeps the same colours.
+    row['background_color'] = NOTICE_COLORS[values['id'] % len(NOTICE_COLORS)]
+    row['notice_type'] = notice_type.name if notice_type else ''
+
+
+notices_listing = Listing(
+    'notices', Notice, 'download_notice', params={'type_slug': 'notice_type'},
+    fields=('short_description', 'notice_type_id'), order_by='-created_at', extra=_notice_extra,
+)
+filter_notices = notices_listing.view()
+
 
 def download_notice(request, pk):
     notice = Notice.objects.get(pk=pk)
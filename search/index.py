@@ -0,0 +1,104 @@
+# search/index.py
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.html import escape
+
+from .models import SearchDocument
+from .registry import INDEXED_MODELS, KINDS, spec_for_model
+from .text import highlight, query_terms
+
+
+FTS_TABLE = 'search_fts'
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def index_object(obj):
+    """Create, update or remove the SearchDocument for one object."""
+    spec = spec_for_model(type(obj))
+    if spec is None:
+        return
+    if not spec.is_searchable(obj):
+        remove_object(type(obj), obj.pk)
+        return
+    SearchDocument.objects.update_or_create(kind=spec.kind, object_id=obj.pk, defaults=spec.document(obj))
+
+
+def remove_object(model, pk):
+    spec = spec_for_model(model)
+    if spec is not None:
+        SearchDocument.objects.filter(kind=spec.kind, object_id=pk).delete()
+
+
+@transaction.atomic
+def rebuild(kinds=None):
+    """Re-index every registered model from scratch. Returns the number of documents."""
+    specs = [spec for spec in INDEXED_MODELS if not kinds or spec.kind in kinds]
+    SearchDocument.objects.filter(kind__in=[spec.kind for spec in specs]).delete()
+    documents = [
+        SearchDocument(kind=spec.kind, object_id=obj.pk, **spec.document(obj))
+        for spec in specs
+        for obj in spec.queryset().iterator()
+    ]
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+    if fts_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+    return len(documents)
+
+
+def search(query, kind=None, limit=20):
+    """
+    Ranked matches for a free-text query: a list of dicts with kind, label,
+    title, url, updated_at and an HTML snippet with <mark> around hits.
+    The query goes through the same analysis as the documents (search/text.py).
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+    if kind is not None and kind not in KINDS:
+        return []
+    documents = _fts_search(terms, kind, limit) if fts_available() else _fallback_search(terms, kind, limit)
+    wanted, prefix = set(terms), terms[-1]
+    return [
+        {
+            'kind': doc.kind,
+            'label': KINDS[doc.kind].label,
+            'title': doc.title,
+            'snippet': (
+                highlight(doc.body, wanted, prefix, escape=escape)
+                or highlight(doc.title, wanted, prefix, escape=escape)
+            ),
+            'url': doc.url,
+            'updated_at': doc.updated_at.isoformat() if doc.updated_at else None,
+        }
+        for doc in documents
+    ]
+
+
+def _fts_search(terms, kind, limit):
+    # Every term must match; the last one as a prefix so results show up while typing.
+    match = ' '.join(f'"{term}"' for term in terms) + '*'
+    sql = f"""
+        SELECT d.*
+        FROM {FTS_TABLE}
+        JOIN {SearchDocument._meta.db_table} d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s {'AND d.kind = %s' if kind else ''}
+        ORDER BY bm25({FTS_TABLE}, 10.0, 1.0)
+        LIMIT %s
+    """
+    params = [match] + ([kind] if kind else []) + [limit]
+    return list(SearchDocument.objects.raw(sql, params))
+
+
+def _fallback_search(terms, kind, limit):
+    """Databases without FTS5: AND of icontains over the analysed term columns."""
+    documents = SearchDocument.objects.all()
+    if kind:
+        documents = documents.filter(kind=kind)
+    for term in terms:
+        documents = documents.filter(Q(title_terms__icontains=term) | Q(body_terms__icontains=term))
+    return list(documents.order_by('-updated_at')[:limit])
@@ -0,0 +1,114 @@
+import random
+import re
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from search.registry import INDEXED_MODELS
+from search.text import BENGALI_DIGITS, query_terms, terms
+
+
+ASCII_TO_BENGALI_DIGITS = {ascii_digit: bengali for bengali, ascii_digit in BENGALI_DIGITS.items()}
+BENGALI_RE = re.compile('[ঀ-৿]')
+WORD_RE = re.compile(r'\S+')
+PUNCTUATION = '.,;:!?()[]{}"\'।-'
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline benchmark of the search analysers on a corpus built from the indexed models: "
+        "indexing throughput and recall@k for the default unicode61 tokenizer vs the Bengali analyser."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help="Index the corpus this many times when timing throughput.")
+        parser.add_argument('--k', type=int, default=10, help="Cut-off for recall@k (default: 10).")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        documents = (spec.document(obj) for spec in INDEXED_MODELS for obj in spec.queryset())
+        corpus = [(document['title'], document['body']) for document in documents]
+        if not corpus:
+            raise CommandError("No indexed content to build a corpus from.")
+        queries = self.build_queries(corpus, random.Random(options['seed']))
+        self.stdout.write(f"Corpus: {len(corpus)} document(s), {len(queries)} query variant(s)\n")
+
+        analysers = {
+            'unicode61': (
+                "tokenize='unicode61 remove_diacritics 2'",
+                lambda text: text,
+                lambda query: ' '.join(f'"{word.strip(PUNCTUATION)}"' for word in query.split() if word.strip(PUNCTUATION)),
+            ),
+            'bengali': (
+                "tokenize='ascii'",
+                terms,
+                lambda query: ' '.join(f'"{term}"' for term in query_terms(query)),
+            ),
+        }
+        for name, (tokenizer, analyse, build_match) in analysers.items():
+            db = sqlite3.connect(':memory:')
+            db.execute(f"CREATE VIRTUAL TABLE fts USING fts5(title, body, {tokenizer})")
+
+            started = time.perf_counter()
+            for _ in range(options['repeat']):
+                db.executemany(
+                    "INSERT INTO fts(title, body) VALUES (?, ?)",
+                    ((analyse(title), analyse(body)) for title, body in corpus),
+                )
+            elapsed = time.perf_counter() - started
+            indexed = len(corpus) * options['repeat']
+
+            # Recall is measured on a single copy of the corpus.
+            db.execute("DELETE FROM fts")
+            db.executemany(
+                "INSERT INTO fts(rowid, title, body) VALUES (?, ?, ?)",
+                ((rowid, analyse(title), analyse(body)) for rowid, (title, body) in enumerate(corpus)),
+            )
+            found = 0
+            started = time.perf_counter()
+            for query, relevant in queries:
+                match = build_match(query)
+                if not match:
+                    continue
+                rows = db.execute(
+                    "SELECT rowid FROM fts WHERE fts MATCH ? ORDER BY bm25(fts, 10.0, 1.0) LIMIT ?",
+                    (match, options['k']),
+                ).fetchall()
+                found += any(rowid in relevant for rowid, in rows)
+            query_ms = (time.perf_counter() - started) * 1000 / max(len(queries), 1)
+
+            self.stdout.write(
+                f"{name:>10}: {indexed / elapsed:>10.0f} docs/s indexed, "
+                f"recall@{options['k']} = {found / max(len(queries), 1):.3f}, {query_ms:.3f} ms/query"
+            )
+
+    def build_queries(self, corpus, rng):
+        """
+        Queries a parent would plausibly type for each title word: the word
+        itself and variants with the other digit script, the other long/short
+        vowel spelling and an inflectional ending. The relevant set is every
+        document with the same title.
+        """
+        rowids_by_title = {}
+        for rowid, (title, _) in enumerate(corpus):
+            rowids_by_title.setdefault(title, set()).add(rowid)
+
+        queries = []
+        for title, relevant in rowids_by_title.items():
+            words = [word.strip(PUNCTUATION) for word in WORD_RE.findall(title)]
+            for word in filter(None, words):
+                for variant in {word, *self.variants(word, rng)}:
+                    queries.append((variant, relevant))
+        return queries
+
+    def variants(self, word, rng):
+        variants = []
+        if any(char.isdigit() for char in word):
+            swapped = ''.join(ASCII_TO_BENGALI_DIGITS.get(char, char) for char in word.translate(BENGALI_DIGITS))
+            variants.append(swapped if swapped != word else word.translate(BENGALI_DIGITS))
+        if BENGALI_RE.search(word):
+            if 'ি' in word or 'ী' in word:
+                variants.append(word.replace('ি', '\0').replace('ী', 'ি').replace('\0', 'ী'))
+            if not word[-1].isdigit():
+                variants.append(word + rng.choice(('ের', 'গুলো', 'টি', 'কে')))
+        return variants
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from search.index import rebuild
+from search.registry import KINDS
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from the indexed models."
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f"Only rebuild these document kinds ({', '.join(sorted(KINDS))}).")
+
+    def handle(self, *args, **options):
+        unknown = set(options['kinds']) - set(KINDS)
+        if unknown:
+            raise CommandError(f"Unknown kind(s): {', '.join(sorted(unknown))}")
+        count = rebuild(options['kinds'] or None)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} document(s)."))
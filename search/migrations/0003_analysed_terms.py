@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_search_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchdocument',
+            name='body_terms',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='searchdocument',
+            name='title_terms',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
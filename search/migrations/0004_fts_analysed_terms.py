@@ -0,0 +1,65 @@
+import importlib
+
+from django.db import migrations
+
+from search.text import terms
+
+
+# Rebuild search_fts over the analysed term columns. The terms are already
+# normalised and split by search/text.py, so the 'ascii' tokenizer only has
+# to split on spaces; unlike unicode61 it never breaks a Bengali word apart
+# at a vowel sign.
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS search_fts_au",
+    "DROP TRIGGER IF EXISTS search_fts_ad",
+    "DROP TRIGGER IF EXISTS search_fts_ai",
+    "DROP TABLE IF EXISTS search_fts",
+]
+
+CREATE_SQL = DROP_SQL + [
+    """CREATE VIRTUAL TABLE search_fts USING fts5(
+        title_terms, body_terms,
+        content='search_searchdocument', content_rowid='id',
+        tokenize='ascii'
+    )""",
+    """CREATE TRIGGER search_fts_ai AFTER INSERT ON search_searchdocument BEGIN
+        INSERT INTO search_fts(rowid, title_terms, body_terms) VALUES (new.id, new.title_terms, new.body_terms);
+    END""",
+    """CREATE TRIGGER search_fts_ad AFTER DELETE ON search_searchdocument BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title_terms, body_terms)
+        VALUES ('delete', old.id, old.title_terms, old.body_terms);
+    END""",
+    """CREATE TRIGGER search_fts_au AFTER UPDATE ON search_searchdocument BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title_terms, body_terms)
+        VALUES ('delete', old.id, old.title_terms, old.body_terms);
+        INSERT INTO search_fts(rowid, title_terms, body_terms) VALUES (new.id, new.title_terms, new.body_terms);
+    END""",
+    "INSERT INTO search_fts(search_fts) VALUES ('rebuild')",
+]
+
+
+def analyse_and_reindex(apps, schema_editor):
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    for doc in SearchDocument.objects.all():
+        SearchDocument.objects.filter(pk=doc.pk).update(title_terms=terms(doc.title), body_terms=terms(doc.body))
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in CREATE_SQL:
+            schema_editor.execute(statement)
+
+
+def restore_raw_text_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        previous = importlib.import_module('search.migrations.0002_search_fts')
+        for statement in DROP_SQL + previous.CREATE_SQL + ["INSERT INTO search_fts(search_fts) VALUES ('rebuild')"]:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_analysed_terms'),
+    ]
+
+    operations = [
+        migrations.RunPython(analyse_and_reindex, restore_raw_text_fts),
+    ]
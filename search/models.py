@@ -0,0 +1,30 @@
+# search/models.py
+
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable row per indexed object (see search/registry.py).
+    title/body keep the original text for display; title_terms/body_terms
+    hold the analysed terms (search/text.py) that the FTS5 table search_fts
+    indexes through triggers on SQLite.
+    """
+    kind = models.CharField(max_length=20, db_index=True)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    title_terms = models.TextField(blank=True, editable=False)
+    body_terms = models.TextField(blank=True, editable=False)
+    url = models.CharField(max_length=255)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'সার্চ ইনডেক্স'
+        verbose_name_plural = 'সার্চ ইনডেক্স'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} - {self.title}"
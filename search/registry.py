@@ -0,0 +1,99 @@
+# search/registry.py
+
+from django.apps import apps
+from django.urls import reverse
+
+from .text import terms
+
+
+class IndexedModel:
+    """How one model is turned into SearchDocument rows."""
+
+    def __init__(self, kind, model, title='title', body=(), url_name=None, url_anchor=None,
+                 active=None, exclude=None, related=()):
+        self.kind = kind
+        self.model_label = model
+        self.title = title
+        self.body = body
+        self.url_name = url_name
+        self.url_anchor = url_anchor
+        self.active = active or {}
+        self.exclude = exclude or {}
+        self.related = related
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def label(self):
+        return str(self.model._meta.verbose_name)
+
+    def queryset(self):
+        """Objects that should be searchable."""
+        queryset = self.model._default_manager.filter(**self.active)
+        if self.exclude:
+            queryset = queryset.exclude(**self.exclude)
+        return queryset.select_related(*self.related)
+
+    def is_searchable(self, obj):
+        if any(getattr(obj, field) != value for field, value in self.active.items()):
+            return False
+        return not any(getattr(obj, field) == value for field, value in self.exclude.items())
+
+    def url(self, obj):
+        if self.url_anchor:
+            return f'{reverse(self.url_anchor)}#item-{obj.pk}'
+        return reverse(self.url_name, kwargs={'pk': obj.pk})
+
+    def document(self, obj):
+        """Field values for the SearchDocument of obj."""
+        parts = []
+        for field in self.body:
+            display = getattr(obj, f'get_{field}_display', None)
+            parts.append(str(display() if display else getattr(obj, field) or ''))
+        # Class and department names make "দশম শ্রেণি ফলাফল" style queries work.
+        for field in self.related:
+            related_obj = getattr(obj, field, None)
+            if related_obj is not None:
+                parts.append(str(related_obj))
+        title = str(getattr(obj, self.title))[:255]
+        body = '\n'.join(part for part in parts if part)
+        return {
+            'title': title,
+            'body': body,
+            'title_terms': terms(title),
+            'body_terms': terms(body),
+            'url': self.url(obj),
+            'updated_at': getattr(obj, 'updated_at', None) or getattr(obj, 'created_at', None),
+        }
+
+
+INDEXED_MODELS = [
+    IndexedModel('notice', 'notice.Notice', body=('short_description',), url_name='download_notice',
+                 active={'is_active': True}, related=('notice_type', 'class_name', 'department')),
+    IndexedModel('web_notice', 'web.Notice', body=('type',), url_name='download_notice_file',
+                 active={'is_active': True}),
+    IndexedModel('result', 'web.Result', url_name='view_result_pdf',
+                 active={'is_active': True}, related=('class_name', 'department')),
+    IndexedModel('admission', 'web.Admission', url_name='view_admission_pdf',
+                 active={'is_active': True}, related=('class_name', 'department')),
+    IndexedModel('book', 'web.Book', url_name='download_book',
+                 active={'is_active': True}, related=('class_name', 'department')),
+    IndexedModel('syllabus', 'web.Syllabus', url_name='download_syllabus',
+                 active={'is_active': True}, exclude={'file': ''}, related=('class_name', 'department')),
+    IndexedModel('routine', 'web.Routine', body=('category',), url_name='download_routine',
+                 active={'is_active': True}, related=('routine_type', 'class_name', 'department')),
+    IndexedModel('event', 'web.EventAndNews', body=('description', 'type'), url_anchor='samprotik_khobor',
+                 active={'status': True}),
+]
+
+KINDS = {spec.kind: spec for spec in INDEXED_MODELS}
+
+
+def spec_for_model(model):
+    label = model._meta.label
+    for spec in INDEXED_MODELS:
+        if spec.model_label == label:
+            return spec
+    return None
@@ -0,0 +1,21 @@
+# search/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .index import index_object, remove_object
+from .registry import spec_for_model
+
+
+@receiver(post_save)
+def update_search_document(sender, instance, raw=False, **kwargs):
+    """Keep the index current one object at a time instead of rebuilding it."""
+    if raw or spec_for_model(sender) is None:
+        return
+    index_object(instance)
+
+
+@receiver(post_delete)
+def delete_search_document(sender, instance, **kwargs):
+    if spec_for_model(sender) is not None:
+        remove_object(sender, instance.pk)
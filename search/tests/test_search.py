@@ -0,0 +1,97 @@
+# search/tests/test_search.py
+
+from django.test import TestCase
+from django.urls import reverse
+from web.models import Book, Class, Department
+from search.index import rebuild, search
+from search.models import SearchDocument
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.ten = Class.objects.create(name='দশম শ্রেণি', name_en='Class 10', numeric_value=10)
+        self.science = Department.objects.create(name='বিজ্ঞান', name_en='Science', icon='fa-flask')
+
+    def make_book(self, title, **fields):
+        return Book.objects.create(title=title, file=f'books/{title}.pdf', **fields)
+
+    def titles(self, query, **kwargs):
+        return [result['title'] for result in search(query, **kwargs)]
+
+    def test_matches_spelling_variants_and_inflections(self):
+        self.make_book('দশম শ্রেণীর বাংলা বই')
+
+        self.assertEqual(self.titles('শ্রেণি'), ['দশম শ্রেণীর বাংলা বই'])
+        self.assertEqual(self.titles('বইগুলো'), ['দশম শ্রেণীর বাংলা বই'])
+
+    def test_last_term_is_a_prefix(self):
+        self.make_book('বাংলা ব্যাকরণ')
+
+        self.assertEqual(self.titles('বাং'), ['বাংলা ব্যাকরণ'])
+        self.assertEqual(self.titles('Gram'), [])
+
+    def test_every_term_must_match(self):
+        self.make_book('Physics first paper')
+        self.make_book('Physics second paper')
+
+        self.assertEqual(self.titles('physics second'), ['Physics second paper'])
+
+    def test_bengali_and_ascii_digits_match(self):
+        self.make_book('Class ১০ Mathematics')
+
+        self.assertEqual(self.titles('10 math'), ['Class ১০ Mathematics'])
+        self.assertEqual(self.titles('১০'), ['Class ১০ Mathematics'])
+
+    def test_class_and_department_names_are_searchable(self):
+        self.make_book('Chemistry', class_name=self.ten, department=self.science)
+
+        self.assertEqual(self.titles('দশম বিজ্ঞান'), ['Chemistry'])
+
+    def test_matches_are_highlighted_and_escaped(self):
+        self.make_book('<b>Biology</b> guide')
+
+        snippet = search('biology')[0]['snippet']
+
+        self.assertIn('<mark>Biology</mark>', snippet)
+        self.assertIn('&lt;/b&gt;', snippet)
+
+    def test_inactive_and_deleted_rows_leave_the_index(self):
+        hidden = self.make_book('Geography')
+        deleted = self.make_book('Geology')
+
+        hidden.is_active = False
+        hidden.save()
+        deleted.delete()
+
+        self.assertEqual(self.titles('geo'), [])
+        self.assertFalse(SearchDocument.objects.exists())
+
+    def test_filter_by_kind(self):
+        self.make_book('Calendar')
+
+        self.assertEqual(self.titles('calendar', kind='book'), ['Calendar'])
+        self.assertEqual(self.titles('calendar', kind='result'), [])
+        self.assertEqual(self.titles('calendar', kind='no-such-kind'), [])
+
+    def test_query_syntax_is_not_passed_through(self):
+        self.make_book('English grammar')
+
+        self.assertEqual(self.titles('"english*" ^gram'), ['English grammar'])
+        self.assertEqual(self.titles('NEAR(english grammar)'), [])
+        self.assertEqual(self.titles('"*'), [])
+
+    def test_rebuild(self):
+        self.make_book('Accounting')
+        SearchDocument.objects.all().delete()
+
+        self.assertEqual(rebuild(), 1)
+        self.assertEqual(self.titles('accounting'), ['Accounting'])
+
+    def test_view(self):
+        self.make_book('Economics')
+
+        response = self.client.get(reverse('search'), {'q': 'econ', 'type': 'book'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['title'] for result in response.json()['results']], ['Economics'])
+        self.assertEqual(self.client.get(reverse('search')).json()['count'], 0)
@@ -0,0 +1,31 @@
+# search/tests/test_text.py
+
+from django.test import SimpleTestCase
+from search.text import normalize, query_terms, stem, terms
+
+
+class TextTests(SimpleTestCase):
+    def test_spelling_variants_fold_together(self):
+        self.assertEqual(normalize('শ্রেণী'), normalize('শ্রেণি'))
+        self.assertEqual(normalize('উৎসব'), 'উতসব')
+        self.assertEqual(normalize('ঈদ'), 'ইদ')
+
+    def test_joiners_are_dropped(self):
+        self.assertEqual(normalize('র‍্যাব'), 'র্যাব')
+
+    def test_bengali_digits_become_ascii(self):
+        self.assertEqual(normalize('২০২৫'), '2025')
+        self.assertEqual(terms('ক্লাস ১০'), 'ক্লাস 10')
+
+    def test_case_is_folded(self):
+        self.assertEqual(terms('Annual RESULT'), 'annual result')
+
+    def test_inflections_are_stemmed(self):
+        self.assertEqual(stem(normalize('শ্রেণির')), normalize('শ্রেণি'))
+        self.assertEqual(stem('ছাত্রদের'), 'ছাত্র')
+        self.assertEqual(stem('বইগুলো'), 'বই')
+        self.assertEqual(stem('results'), 'result')
+        self.assertEqual(stem('class'), 'class')
+
+    def test_mixed_scripts_are_split(self):
+        self.assertEqual(query_terms('ক্লাস১০Result'), ['ক্লাস', '10', 'result'])
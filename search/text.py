@@ -0,0 +1,107 @@
+# search/text.py
+
+"""
+Bengali-aware text analysis for the search index.
+
+The same pipeline runs at index and query time:
+normalise -> tokenise -> stem. The FTS5 table only ever sees the resulting
+space-separated terms, so SQLite's own tokenizer never splits a word on a
+vowel sign (া, ি, ে ...) or a hasanta the way unicode61 does.
+"""
+
+import re
+import unicodedata
+
+
+BENGALI_DIGITS = str.maketrans('০১২৩৪৫৬৭৮৯', '0123456789')
+
+# Spelling variants people type interchangeably: long/short i and u
+# (শ্রেণী/শ্রেণি), khanda ta (ৎ/ত্), and the independent vowel forms.
+FOLDS = str.maketrans({
+    'ী': 'ি', 'ূ': 'ু', 'ঈ': 'ই', 'ঊ': 'উ', 'ৎ': 'ত',
+    '\u200c': None, '\u200d': None, '\u00ad': None,  # ZWNJ, ZWJ, soft hyphen
+})
+
+BENGALI_DIGIT_RANGE = '\u09e6-\u09ef'
+BENGALI_LETTER_RANGE = '\u0980-\u09e5\u09f0-\u09ff\u200c\u200d'
+TOKEN_RE = re.compile(rf'[{BENGALI_LETTER_RANGE}{BENGALI_DIGIT_RANGE}]+|[^\W_]+')
+# Split mixed runs like "ক্লাস১০Result" into Bengali letters, digits and everything else.
+SCRIPT_RUN_RE = re.compile(rf'[{BENGALI_LETTER_RANGE}]+|[0-9{BENGALI_DIGIT_RANGE}]+|[^0-9{BENGALI_LETTER_RANGE}{BENGALI_DIGIT_RANGE}]+')
+VOWEL_SIGNS = 'ািীুূৃেৈোৌ'
+
+# Case endings, plural markers and classifiers, longest first.
+_SUFFIXES = (
+    'গুলোর', 'গুলির', 'দেরকে', 'গুলো', 'গুলি', 'দের', 'য়ের', 'য়ে', 'টির', 'টার',
+    'খানা', 'েরা', 'ের', 'এর', 'কে', 'তে', 'টি', 'টা', 'রা',
+)
+MIN_STEM_LENGTH = 2
+
+
+def normalize(text):
+    """NFC, drop joiners, fold Bengali digits to ASCII and common spelling variants, casefold."""
+    text = unicodedata.normalize('NFC', text or '')
+    return text.translate(FOLDS).translate(BENGALI_DIGITS).casefold()
+
+
+SUFFIXES = tuple(normalize(suffix) for suffix in _SUFFIXES)
+
+
+def stem(token):
+    """Light, dictionary-free stemming: strip one inflectional ending."""
+    if token.isascii():
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            return token[:-1]
+        return token
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    # Genitive -র after a vowel sign: শ্রেণির -> শ্রেণি
+    if token.endswith('র') and len(token) > MIN_STEM_LENGTH + 1 and token[-2] in VOWEL_SIGNS:
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Yields (term, start, end) with offsets into the original text."""
+    for match in TOKEN_RE.finditer(text or ''):
+        for run in SCRIPT_RUN_RE.finditer(match.group()):
+            term = stem(normalize(run.group()))
+            if term:
+                yield term, match.start() + run.start(), match.start() + run.end()
+
+
+def terms(text):
+    """Space-separated terms as stored in the FTS5 index."""
+    return ' '.join(term for term, _, _ in tokenize(text))
+
+
+def query_terms(query):
+    return [term for term, _, _ in tokenize(query)]
+
+
+def highlight(text, wanted, prefix=None, window=12, start_mark='<mark>', end_mark='</mark>', escape=str):
+    """
+    A window of about `window` tokens of text around the first matching term,
+    with matches wrapped in start_mark/end_mark. `prefix` also matches terms
+    that merely start with it (the word being typed). Returns '' if nothing matches.
+    """
+    tokens = list(tokenize(text))
+    hits = [
+        index for index, (term, _, _) in enumerate(tokens)
+        if term in wanted or (prefix and term.startswith(prefix))
+    ]
+    if not hits:
+        return ''
+    first = max(hits[0] - window // 3, 0)
+    last = min(first + window, len(tokens)) - 1
+    start, end = tokens[first][1], tokens[last][2]
+
+    pieces, cursor = [], start
+    for index in hits:
+        if first <= index <= last:
+            _, token_start, token_end = tokens[index]
+            pieces.append(escape(text[cursor:token_start]))
+            pieces.append(start_mark + escape(text[token_start:token_end]) + end_mark)
+            cursor = token_end
+    pieces.append(escape(text[cursor:end]))
+    return ('… ' if start > 0 else '') + ''.join(pieces) + (' …' if end < len(text) else '')
@@ -0,0 +1,29 @@
+# search/views.py
+
+import time
+
+from django.http import JsonResponse
+
+from .index import search as search_index
+
+
+def search(request):
+    """
+    JSON search across notices, results, admissions, books, syllabus,
+    routines and events: /search/?q=<text>[&type=<kind>][&limit=<n>]
+    """
+    query = request.GET.get('q', '').strip()
+    kind = request.GET.get('type') or None
+    limit = request.GET.get('limit', '')
+    limit = min(int(limit), 50) if limit.isdigit() and int(limit) > 0 else 20
+
+    started = time.perf_counter()
+    results = search_index(query, kind=kind, limit=limit) if query else []
+    took_ms = (time.perf_counter() - started) * 1000
+
+    return JsonResponse({
+        'query': query,
+        'results': results,
+        'count': len(results),
+        'took_ms': round(took_ms, 2),
+    })
@@ -1,12 +1,19 @@
 # web/admin.py
 
-from django.contrib import admin
+import json
+
+from django.contrib import admin, messages
+from django.db.models import Q
+from django.http import JsonResponse
+from django.urls import path
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin
 from import_export import resources, fields
 from import_export.widgets import ForeignKeyWidget
 from import_export.admin import ImportExportModelAdmin
 from .models import *
+from .lookup import autocomplete, matching_keys, normalize_number
+from . import result_shards
 
 
 class CustomModelAdmin(ImportExportModelAdmin, ModelAdmin):
@@ -59,6 +66,30 @@ class ResultResource(resources.ModelResource):
     class Meta:
         model = Result
 
+class StudentResultResource(resources.ModelResource):
+    """
+    Marks sheet import: one row per student. Columns other than the ones
+    below are taken as subject names and collected into `marks`.
+    """
+    result = fields.Field(attribute='result', column_name='exam', widget=ForeignKeyWidget(Result))
+    class_name = fields.Field(attribute='class_name', widget=ForeignKeyWidget(Class, field='name'))
+
+    class Meta:
+        model = StudentResult
+        fields = ('result', 'class_name', 'roll_number', 'student_name', 'registration_number', 'total', 'gpa', 'grade', 'remarks', 'marks')
+        export_order = fields
+        import_id_fields = ('result', 'class_name', 'roll_number')
+        skip_unchanged = True
+
+    def before_import_row(self, row, **kwargs):
+        row['roll_number'] = normalize_number(str(row.get('roll_number') or ''))
+        if not row.get('marks'):
+            columns = {field.column_name for field in self.get_import_fields()}
+            row['marks'] = json.dumps({
+                column: value for column, value in row.items()
+                if column not in columns and value not in (None, '')
+            }, ensure_ascii=False, default=str)
+
 class AdmissionResource(resources.ModelResource):
     class_name = fields.Field(attribute='class_name', widget=ForeignKeyWidget(Class, field='name'))
     department = fields.Field(attribute='department', widget=ForeignKeyWidget(Department, field='name'))
@@ -174,6 +205,44 @@ class StudentAdmin(CustomModelAdmin):
         ('Guardian Information', {'fields': ('guardian_name', 'guardian_phone', 'address')}),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Name, roll and registration number go through the prefix index
+        (web.lookup) instead of icontains scans over the student table.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        queryset = queryset.filter(
+            Q(pk__in=matching_keys(search_term).values('student_id'))
+            | Q(class_name__in=Class.objects.filter(name__icontains=search_term))
+            | Q(department__in=Department.objects.filter(name__icontains=search_term))
+        )
+        return queryset, False
+
+    def get_urls(self):
+        return [
+            path('typeahead/', self.admin_site.admin_view(self.typeahead_view), name='web_student_typeahead'),
+        ] + super().get_urls()
+
+    def typeahead_view(self, request):
+        """JSON typeahead: ?q=<name, roll or registration prefix>[&class_id=<id>]"""
+        if not self.has_view_or_change_permission(request):
+            return JsonResponse({'error': 'permission denied'}, status=403)
+        class_id = request.GET.get('class_id')
+        students = autocomplete(
+            request.GET.get('q', ''),
+            class_id=class_id if class_id and class_id.isdigit() else None,
+        )
+        return JsonResponse({'results': [{
+            'id': student.id,
+            'name': student.name,
+            'roll': student.roll_number,
+            'registration': student.registration_number,
+            'class_name': student.class_name.name if student.class_name else '',
+            'department': student.department.name if student.department else '',
+        } for student in students]})
+
 @admin.register(Notice)
 class NoticeAdmin(CustomModelAdmin):
     list_display = ('title', 'type', 'date', 'is_active')
@@ -250,6 +319,26 @@ class ResultAdmin(CustomModelAdmin):
     search_fields = ('title',)
     autocomplete_fields = ('class_name', 'department')
     list_editable = ('is_active',)
+    actions = ['publish_result_shards']
+
+    @admin.action(description='Publish per-student result files')
+    def publish_result_shards(self, request, queryset):
+        """Pre-render every student's result to static files (see web.result_shards)."""
+        for result in queryset:
+            try:
+                generation, count = result_shards.publish(result)
+                self.message_user(request, f"{result}: published {count} student result(s) ({generation}).", messages.SUCCESS)
+            except result_shards.ShardError as e:
+                self.message_user(request, str(e), messages.WARNING)
+
+@admin.register(StudentResult)
+class StudentResultAdmin(CustomModelAdmin):
+    resource_class = StudentResultResource
+    list_display = ('roll_number', 'student_name', 'result', 'class_name', 'gpa', 'grade')
+    list_filter = ('result', 'class_name')
+    search_fields = ('=roll_number', 'student_name', 'registration_number')
+    autocomplete_fields = ('result', 'class_name')
+    list_select_related = ('result', 'class_name')
 
 @admin.register(Admission)
 class AdmissionAdmin(CustomModelAdmin):
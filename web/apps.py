@@ -6,4 +6,5 @@ class WebConfig(AppConfig):
     name = 'web'
     
     def ready(self):
+        import web.checks
         import web.signals
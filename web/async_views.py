@@ -0,0 +1,271 @@
+# web/async_views.py
+
+"""
+Async versions of the JSON filter endpoints and the file downloads, used in
+place of the ones in views.py when the site runs under ASGI (see
+settings.ASYNC_VIEWS and SchoolProject/asgi.py), e.g.
+
+    uvicorn SchoolProject.asgi:application --workers 2
+
+Queries go through the async ORM and files are streamed by web/responses.py,
+so a slow mobile download holds a coroutine instead of a worker thread.
+The payloads are built by the same helpers as the sync views.
+"""
+
+import logging
+import os
+import time
+from contextlib import aclosing
+
+from django.conf import settings
+from django.http import (
+    HttpResponse, HttpResponseNotFound, HttpResponseServerError, JsonResponse, StreamingHttpResponse,
+)
+from django.shortcuts import aget_object_or_404
+from django.views.decorators.cache import cache_control
+from .changelog import alatest_cursor, changes_since, event, parse_cursor, updates_payload
+from .models import *
+from .pubsub import feed
+from .responses import stream_file
+from .taxonomy import ataxonomy
+from .views import (
+    _event_news_data, _facility_data, _filtered_facilities, _filtered_gallery_images, _gallery_image_data,
+    _principal_message_data, _student_data, _student_query, _students_response, _video_data, admissions_listing,
+    books_listing, results_listing, routines_listing, syllabus_listing,
+)
+
+
+__all__ = [
+    'download_notice_file', 'filter_students', 'filter_routines', 'download_routine', 'filter_books',
+    'filter_syllabus', 'download_book', 'download_syllabus', 'filter_results', 'download_result',
+    'view_result_pdf', 'filter_admissions', 'download_admission', 'view_admission_pdf', 'filter_gallery_images',
+    'filter_gallery_videos', 'filter_facilities', 'event_news_detail', 'api_principal_message', 'api_updates',
+    'api_updates_stream', 'notice_stream',
+]
+
+logger = logging.getLogger(__name__)
+
+
+async def file_response(request, field_file, as_attachment=False, content_type=None):
+    if not field_file:
+        return HttpResponseNotFound('The requested file was not found.')
+    try:
+        return await stream_file(
+            request, field_file.path, os.path.basename(field_file.name), as_attachment, content_type
+        )
+    except FileNotFoundError:
+        return HttpResponseNotFound('The requested file was not found.')
+    except Exception:
+        logger.exception("Error downloading %s", field_file.name)
+        return HttpResponseServerError('An error occurred during download.')
+
+
+async def download_notice_file(request, pk):
+    item = await aget_object_or_404(Notice, pk=pk)
+    return await file_response(request, item.file, as_attachment=True)
+
+
+async def filter_students(request):
+    students, male_count, female_count = _student_query(request, await ataxonomy())
+    students_data = [_student_data(student) async for student in students]
+    return _students_response(students_data, male_count, female_count)
+
+
+filter_routines = routines_listing.async_view()
+filter_books = books_listing.async_view()
+filter_syllabus = syllabus_listing.async_view()
+filter_results = results_listing.async_view()
+filter_admissions = admissions_listing.async_view()
+
+
+async def download_routine(request, pk):
+    routine = await aget_object_or_404(Routine, pk=pk)
+    return await file_response(request, routine.file, as_attachment=True)
+
+
+
+
+
+
+async def download_book(request, pk):
+    book = await Book.objects.filter(pk=pk).afirst()
+    if book is None:
+        return HttpResponseNotFound('Book not found.')
+    return await file_response(request, book.file, as_attachment=True, content_type='application/pdf')
+
+
+async def download_syllabus(request, pk):
+    syllabus = await Syllabus.objects.filter(pk=pk).afirst()
+    if syllabus is None:
+        return HttpResponseNotFound('Syllabus not found.')
+    return await file_response(request, syllabus.file, as_attachment=True, content_type='application/pdf')
+
+
+
+
+async def download_result(request, pk):
+    result = await Result.objects.filter(pk=pk).afirst()
+    if result is None:
+        return HttpResponseNotFound('Result not found.')
+    return await file_response(request, result.file, as_attachment=True, content_type='application/pdf')
+
+
+async def view_result_pdf(request, pk):
+    result = await aget_object_or_404(Result, pk=pk)
+    return await file_response(request, result.file, content_type='application/pdf')
+
+
+
+
+async def download_admission(request, pk):
+    admission = await Admission.objects.filter(pk=pk).afirst()
+    if admission is None:
+        return HttpResponseNotFound('Admission not found.')
+    return await file_response(request, admission.file, as_attachment=True, content_type='application/pdf')
+
+
+async def view_admission_pdf(request, pk):
+    admission = await Admission.objects.filter(pk=pk).afirst()
+    if admission is None:
+        return HttpResponseNotFound('Admission not found.')
+    return await file_response(request, admission.file, content_type='application/pdf')
+
+
+async def filter_gallery_images(request):
+    images = _filtered_gallery_images(request)
+    return JsonResponse({'images': [_gallery_image_data(request, image) async for image in images]})
+
+
+async def filter_gallery_videos(request):
+    videos_data = []
+    async for video in Video.objects.filter(is_active=True).order_by('-created_at'):
+        # Ensure we have a valid YouTube ID
+        if not video.youtube_id and video.youtube_url:
+            video.youtube_id = video.extract_youtube_id(video.youtube_url)
+            await video.asave()
+
+        if video.youtube_id:
+            videos_data.append(_video_data(video))
+
+    return JsonResponse({'videos': videos_data})
+
+
+async def filter_facilities(request):
+    facilities = _filtered_facilities(request)
+    return JsonResponse({'facilities': [_facility_data(facility) async for facility in facilities]})
+
+
+async def event_news_detail(request, pk):
+    try:
+        item = await EventAndNews.objects.prefetch_related('gallery_images').aget(pk=pk, status=True)
+    except EventAndNews.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Item not found'})
+    return JsonResponse({'success': True, 'data': _event_news_data(item)})
+
+
+async def api_principal_message(request):
+    try:
+        principal_message = await AboutMessage.objects.filter(
+            is_active=True,
+            show_on_home_page=True
+        ).select_related('role').afirst()
+
+        data = _principal_message_data(principal_message)
+
+    except Exception as e:
+        data = {
+            'success': False,
+            'message': f'Error fetching principal message: {str(e)}'
+        }
+
+    return JsonResponse(data)
+
+
+@cache_control(no_cache=True)
+async def api_updates(request):
+    since = parse_cursor(request.GET.get('since'))
+    if since is None:
+        return JsonResponse({'cursor': await alatest_cursor(), 'changes': [], 'has_more': False})
+    rows = [row async for row in changes_since(since)]
+    if not rows:
+        return HttpResponse(status=204)
+    return JsonResponse(updates_payload(rows))
+
+
+NOTICE_KINDS = ('notice', 'web_notice')
+
+
+def _stream_cursor(request):
+    """Where a stream starts: Last-Event-ID after a reconnect, else ?since=, else None (from now on)."""
+    cursor = parse_cursor(request.headers.get('Last-Event-ID'))
+    return cursor if cursor is not None else parse_cursor(request.GET.get('since'))
+
+
+def _update_event(cursor, rows):
+    return event(updates_payload(rows, limit=len(rows)))
+
+
+def _notice_event(cursor, rows):
+    """
+    Newly published notices of both kinds, once each and only if still
+    published at the end of the batch; other rows only move the client's cursor.
+    """
+    published = {}
+    for row in rows:
+        key = (row['kind'], row['object_id'])
+        if row['kind'] not in NOTICE_KINDS:
+            continue
+        if row['action'] == 'removed':
+            published.pop(key, None)
+        elif row['action'] == 'published' or key in published:
+            published.pop(key, None)
+            published[key] = row
+    notices = [
+        {'kind': row['kind'], 'id': row['object_id'], 'title': row['title'], 'url': row['url'],
+         'at': row['created_at'].isoformat()}
+        for row in published.values()
+    ]
+    if not notices:
+        return f"id: {rows[-1]['id']}\n\n"
+    return event({'cursor': rows[-1]['id'], 'notices': notices}, name='notices')
+
+
+async def _events(name, cursor, encode):
+    # Streams end after a while; EventSource then reconnects with Last-Event-ID.
+    closes_at = time.monotonic() + getattr(settings, 'EVENT_STREAM_MAX_AGE', 300)
+    keepalive = getattr(settings, 'EVENT_STREAM_KEEPALIVE', 20)
+    yield f"retry: {int(getattr(settings, 'EVENT_STREAM_RETRY', 5) * 1000)}\n\n"
+    async with aclosing(feed.listen(cursor, keepalive)) as batches:
+        async for start, rows in batches:
+            if rows:
+                yield feed.encoded((name, start, rows[-1]['id']), lambda: encode(start, rows))
+            else:
+                yield ': keep-alive\n\n'
+            if time.monotonic() >= closes_at:
+                break
+
+
+def _event_stream(request, name, encode):
+    if feed.subscribers >= getattr(settings, 'EVENT_STREAM_MAX_CONNECTIONS', 5000):
+        response = HttpResponse(status=503)
+        response['Retry-After'] = '30'
+        return response
+    response = StreamingHttpResponse(
+        _events(name, _stream_cursor(request), encode), content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def api_updates_stream(request):
+    """/api/updates/ as server-sent events, resuming from Last-Event-ID or ?since=."""
+    return _event_stream(request, 'updates', _update_event)
+
+
+async def notice_stream(request):
+    """
+    Server-sent "notices" events for notices (notice.Notice and web.Notice)
+    as they are published or re-activated, for the navbar ticker.
+    """
+    return _event_stream(request, 'notices', _notice_event)
@@ -0,0 +1,366 @@
+# web/cache_backends.py
+
+"""
+Two-tier cache: a small LRU inside each process (L1) in front of a cache
+shared by all workers (L2, another entry of settings.CACHES).
+
+Only keys with one of L1_PREFIXES go through L1. Those are values that can
+be served slightly late because they are immutable for their key
+('compressed:') or carry the content version they were built from
+(fragments, sections, single-flight pages; see web.versions). Everything
+else, e.g. version counters, locks and throttle buckets, goes straight to
+L2. add(), incr() and decr() always go to L2 too.
+
+clear() and invalidate() bump a generation counter stored in L2. Each
+process reads it at most once every GENERATION_CHECK_INTERVAL seconds and
+drops its L1 when it has changed. L1 entries also expire after
+L1_TIMEOUT seconds at most, and never outlive the L2 entry they were
+copied from: L1-prefixed values are stored in L2 together with their
+expiry time (see Stored).
+
+Locks (web.singleflight, web.throttle) are cache.add() calls, so they need
+an L2 whose add() is atomic across workers: Redis, or, without REDIS_URL,
+LockingFileBasedCache, which serialises add() and incr() with a lock file.
+"""
+
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import PyLibMCCache, PyMemcacheCache
+from django.core.cache.backends.redis import RedisCache
+from . import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so the file cache cannot lock either.
+    fcntl = None
+
+
+L1_PREFIXES = ('fragment:', 'section:', 'template:', 'layout:', 'singleflight:', 'compressed:')
+GENERATION_KEY = 'two-tier:generation'
+LOCK_FILE_NAME = 'lock'
+# Backends whose add() is atomic for every process that shares them.
+ATOMIC_ADD_BACKENDS = (RedisCache, PyMemcacheCache, PyLibMCCache, LocMemCache)
+
+
+@contextmanager
+def file_lock(path):
+    """Holds an exclusive lock on `path` (created if missing) against every process and thread on this host."""
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class Stored:
+    """An L1-prefixed value as kept in L2, with the time it expires there (None: never)."""
+
+    __slots__ = ('value', 'expires_at')
+
+    def __init__(self, value, expires_at):
+        self.value = value
+        self.expires_at = expires_at
+
+    def __getstate__(self):
+        return (self.value, self.expires_at)
+
+    def __setstate__(self, state):
+        self.value, self.expires_at = state
+
+
+class LockingFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache whose add(), incr() and decr() are atomic for every
+    process on this host: FileBasedCache checks and writes in two steps, so
+    these hold an flock on <LOCATION>/lock around both. Plain set() and
+    delete() do not take it; they replace or remove a file in one step.
+    """
+
+    atomic_add = fcntl is not None
+
+    @contextmanager
+    def _exclusive(self):
+        if not self.atomic_add:
+            yield
+            return
+        self._createdir()
+        with file_lock(os.path.join(self._dir, LOCK_FILE_NAME)):
+            yield
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._exclusive():
+            return super().add(key, value, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        with self._exclusive():
+            return super().incr(key, delta, version)
+
+    def decr(self, key, delta=1, version=None):
+        with self._exclusive():
+            return super().decr(key, delta, version)
+
+
+def can_lock(backend=None):
+    """
+    Whether add() on the shared cache (L2 of the default cache) can serve as
+    a lock that only one worker gets. That is Redis or Memcached, the
+    in-process LocMemCache, or LockingFileBasedCache where fcntl exists.
+    Plain FileBasedCache and DatabaseCache check and write in two steps,
+    so several workers can all "get" the lock.
+    """
+    backend = backend or caches['default']
+    backend = getattr(backend, 'l2', backend)
+    return isinstance(backend, ATOMIC_ADD_BACKENDS) or getattr(backend, 'atomic_add', False)
+
+
+class LocalStore:
+    """The L1 of one process: a size-bounded LRU of pickled values."""
+
+    def __init__(self, name, max_entries, max_bytes):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (pickled value, expires at)
+        self.size = 0
+        self.lock = threading.Lock()
+        self.generation = None
+        self.checked_at = 0
+        self.stats = dict.fromkeys(
+            ('l1_hits', 'l2_hits', 'misses', 'sets', 'evictions', 'expirations', 'flushes'), 0
+        )
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self.stats['expirations'] += 1
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, pickled, timeout):
+        if len(pickled) > self.max_bytes:
+            return
+        with self.lock:
+            self._remove(key)
+            self.entries[key] = (pickled, time.monotonic() + timeout)
+            self.size += len(pickled)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.stats['evictions'] += 1
+
+    def delete(self, key):
+        with self.lock:
+            self._remove(key)
+
+    def flush(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.stats['flushes'] += 1
+
+    def count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    def samples(self):
+        with self.lock:
+            stats = dict(self.stats)
+            entries, size = len(self.entries), self.size
+        labels = {'cache': self.name}
+        lookups = stats['l1_hits'] + stats['l2_hits'] + stats['misses']
+        return [
+            *((f'cache_{stat}_total', labels, value) for stat, value in stats.items()),
+            ('cache_l1_entries', labels, entries),
+            ('cache_l1_bytes', labels, size),
+            ('cache_hit_ratio', labels, (stats['l1_hits'] + stats['l2_hits']) / lookups if lookups else 0),
+        ]
+
+
+# Django creates a backend instance per thread; the L1 is shared by all of them.
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    """
+    CACHES entry:
+
+        'default': {
+            'BACKEND': 'web.cache_backends.TwoTierCache',
+            'LOCATION': 'default',          # name of the L1 store
+            'OPTIONS': {'L2': 'shared', 'L1_MAX_ENTRIES': 2000, 'L1_MAX_BYTES': 64 * 1024 * 1024},
+        }
+    """
+
+    def __init__(self, location, params):
+        options = params.get('OPTIONS', {})
+        super().__init__(params)
+        self.l2_alias = options.get('L2', 'shared')
+        self.l1_timeout = options.get('L1_TIMEOUT', 300)
+        self.check_interval = options.get('GENERATION_CHECK_INTERVAL', 1)
+        name = location or 'default'
+        with _stores_lock:
+            if name not in _stores:
+                _stores[name] = LocalStore(
+                    name, options.get('L1_MAX_ENTRIES', 1000), options.get('L1_MAX_BYTES', 32 * 1024 * 1024),
+                )
+                metrics.register_collector(_stores[name].samples)
+            self.store = _stores[name]
+
+    @property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _local(self, key):
+        return key.startswith(L1_PREFIXES)
+
+    def _seconds(self, timeout):
+        # get_backend_timeout() gives an expiry time, not a duration.
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def _l1_timeout(self, timeout):
+        timeout = self._seconds(timeout)
+        return self.l1_timeout if timeout is None else min(timeout, self.l1_timeout)
+
+    def _stored(self, value, timeout):
+        timeout = self._seconds(timeout)
+        return Stored(value, None if timeout is None else time.time() + timeout)
+
+    def _check_generation(self):
+        now = time.monotonic()
+        if now - self.store.checked_at < self.check_interval:
+            return
+        self.store.checked_at = now
+        generation = self.l2.get(GENERATION_KEY)
+        if generation != self.store.generation:
+            # Also when this process saw no generation yet: the first clear()
+            # sets one, and that must drop what was cached before it.
+            self.store.flush()
+            self.store.generation = generation
+
+    def get(self, key, default=None, version=None):
+        if not self._local(key):
+            return self.l2.get(key, default, version)
+        self._check_generation()
+        local_key = self.make_and_validate_key(key, version)
+        pickled = self.store.get(local_key)
+        if pickled is not None:
+            self.store.count('l1_hits')
+            return pickle.loads(pickled)
+        stored = self.l2.get(key, self, version)
+        if stored is self:
+            self.store.count('misses')
+            return default
+        self.store.count('l2_hits')
+        if not isinstance(stored, Stored):
+            # Written before values carried their expiry; L1_TIMEOUT bounds it.
+            stored = Stored(stored, None)
+        timeout = self.l1_timeout
+        if stored.expires_at is not None:
+            timeout = min(timeout, stored.expires_at - time.time())
+        if timeout > 0:
+            self.store.set(local_key, pickle.dumps(stored.value, pickle.HIGHEST_PROTOCOL), timeout)
+        return stored.value
+
+    def get_many(self, keys, version=None):
+        local_keys = [key for key in keys if self._local(key)]
+        values = self.l2.get_many([key for key in keys if not self._local(key)], version)
+        for key in local_keys:
+            value = self.get(key, self, version)
+            if value is not self:
+                values[key] = value
+        return values
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self._local(key):
+            self.l2.set(key, value, timeout, version)
+            return
+        self.l2.set(key, self._stored(value, timeout), timeout, version)
+        self.store.count('sets')
+        self.store.set(
+            self.make_and_validate_key(key, version), pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            self._l1_timeout(timeout),
+        )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        for key, value in data.items():
+            self.set(key, value, timeout, version)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self._local(key):
+            return self.l2.add(key, value, timeout, version)
+        self.store.delete(self.make_and_validate_key(key, version))
+        return self.l2.add(key, self._stored(value, timeout), timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        return self.l2.incr(key, delta, version)
+
+    def decr(self, key, delta=1, version=None):
+        return self.l2.decr(key, delta, version)
+
+    def has_key(self, key, version=None):
+        return self.l2.has_key(key, version)
+
+    def delete(self, key, version=None):
+        # Other processes may serve their copy until it expires from their
+        # L1; call invalidate() when that matters.
+        if self._local(key):
+            self.store.delete(self.make_and_validate_key(key, version))
+        return self.l2.delete(key, version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.delete(key, version)
+
+    def clear(self):
+        self.l2.clear()
+        self.invalidate()
+
+    def invalidate(self):
+        """Make every process drop its L1 (within GENERATION_CHECK_INTERVAL)."""
+        self.l2.set(GENERATION_KEY, time.time_ns(), None)
+        self.store.flush()
+        self.store.generation = None
+        self.store.checked_at = 0
+
+    def stats(self):
+        """The L1 counters of this process, with its size and hit ratio."""
+        return {name.removeprefix('cache_').removesuffix('_total'): value for name, _, value in self.store.samples()}
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+
+metrics.describe('cache_l1_hits_total', 'counter', 'Two-tier cache lookups answered by this process.')
+metrics.describe('cache_l2_hits_total', 'counter', 'Two-tier cache lookups answered by the shared cache.')
+metrics.describe('cache_misses_total', 'counter', 'Two-tier cache lookups found in neither tier.')
+metrics.describe('cache_sets_total', 'counter', 'Values stored in the two-tier cache.')
+metrics.describe('cache_evictions_total', 'counter', 'L1 entries dropped to stay within its size limits.')
+metrics.describe('cache_expirations_total', 'counter', 'L1 entries dropped after L1_TIMEOUT.')
+metrics.describe('cache_flushes_total', 'counter', 'Times this process dropped its L1 after a generation bump.')
+metrics.describe('cache_l1_entries', 'gauge', 'Entries in the L1 of this process.')
+metrics.describe('cache_l1_bytes', 'gauge', 'Pickled size of the L1 of this process.')
+metrics.describe('cache_hit_ratio', 'gauge', 'Share of two-tier lookups answered by either tier.')
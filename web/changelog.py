@@ -0,0 +1,107 @@
+# web/changelog.py
+
+"""
+"What's new" feed: every time a public item (the models indexed by the
+search app, see search/registry.py) is published, edited or withdrawn, a
+ChangeLog row is appended. Its auto-increment id is the client's cursor:
+
+    GET /api/updates/              -> {"cursor": 41, "changes": [], "has_more": false}
+    GET /api/updates/?since=41     -> 204 No Content while nothing has changed
+    GET /api/updates/?since=41     -> {"cursor": 43, "changes": [...], "has_more": false}
+
+A poll is one range scan on the primary key. Under ASGI,
+/api/updates/stream/ sends the same batches as server-sent events, and
+/api/notices/stream/ only newly published notices (see web.pubsub).
+
+Rows are written after the content's transaction commits, so ids follow
+commit order (exactly on SQLite, where writes are serialised). Old rows are
+dropped by prune_change_log; a client whose cursor is older simply misses
+them and should reload.
+"""
+
+import json
+
+from django.db import transaction
+from search.registry import spec_for_model
+from .models import ChangeLog
+
+
+UPDATES_LIMIT = 100
+CHANGE_FIELDS = ('id', 'kind', 'object_id', 'action', 'title', 'url', 'created_at')
+
+
+def was_visible(spec, obj):
+    """Whether the stored row (before this save) is public."""
+    queryset = spec.model._default_manager.filter(pk=obj.pk, **spec.active)
+    if spec.exclude:
+        queryset = queryset.exclude(**spec.exclude)
+    return queryset.exists()
+
+
+def _append(**fields):
+    transaction.on_commit(lambda: ChangeLog.objects.create(**fields))
+
+
+def record_save(obj, created, visible_before):
+    """Log a save: published (newly visible), updated (still visible) or removed (no longer visible)."""
+    spec = spec_for_model(type(obj))
+    visible = spec.is_searchable(obj)
+    if visible:
+        action = 'updated' if visible_before and not created else 'published'
+    elif visible_before and not created:
+        action = 'removed'
+    else:
+        return
+    _append(kind=spec.kind, object_id=obj.pk, action=action,
+            title=str(getattr(obj, spec.title))[:255], url=spec.url(obj) if visible else '')
+
+
+def record_delete(obj):
+    spec = spec_for_model(type(obj))
+    if spec.is_searchable(obj):
+        _append(kind=spec.kind, object_id=obj.pk, action='removed', title=str(getattr(obj, spec.title))[:255])
+
+
+def parse_cursor(value):
+    """The cursor from ?since= or a Last-Event-ID header, or None."""
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+def latest_cursor():
+    return ChangeLog.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+async def alatest_cursor():
+    return await ChangeLog.objects.order_by('-id').values_list('id', flat=True).afirst() or 0
+
+
+def changes_since(cursor, limit=UPDATES_LIMIT):
+    """Up to limit + 1 rows after the cursor (the extra row only signals has_more)."""
+    return ChangeLog.objects.filter(id__gt=cursor).order_by('id').values(*CHANGE_FIELDS)[:limit + 1]
+
+
+def updates_payload(rows, limit=UPDATES_LIMIT):
+    """
+    {'cursor', 'changes', 'has_more'} for rows from changes_since(). Several
+    changes to one item collapse into its latest, in log order.
+    """
+    rows = list(rows)
+    batch = rows[:limit]
+    latest = {}
+    for row in batch:
+        latest.pop((row['kind'], row['object_id']), None)
+        latest[(row['kind'], row['object_id'])] = {
+            'kind': row['kind'],
+            'id': row['object_id'],
+            'action': row['action'],
+            'title': row['title'],
+            'url': row['url'],
+            'at': row['created_at'].isoformat(),
+        }
+    return {'cursor': batch[-1]['id'], 'changes': list(latest.values()), 'has_more': len(rows) > limit}
+
+
+def event(payload, name='updates'):
+    """One server-sent event; its id lets EventSource resume from the cursor after a reconnect."""
+    return f"id: {payload['cursor']}\nevent: {name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
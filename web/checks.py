@@ -0,0 +1,17 @@
+# web/checks.py
+
+from django.core.checks import Warning, register
+from .cache_backends import can_lock
+
+
+@register()
+def check_shared_cache_locks(app_configs, **kwargs):
+    """The single-flight and throttle locks are only exclusive when the shared cache's add() is atomic."""
+    if can_lock():
+        return []
+    return [Warning(
+        "The shared cache has no atomic add(), so concurrent cache misses are not coalesced "
+        "and the contact throttle only excludes workers on the same host.",
+        hint="Use Redis (REDIS_URL) or web.cache_backends.LockingFileBasedCache for the shared cache.",
+        id='web.W001',
+    )]
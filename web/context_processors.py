@@ -1,13 +1,12 @@
 # web/context_processors.py
 
-from .models import SchoolInfo
-from notice.models import Notice
+from . import layout
 
 def school_info_processor(request):
-    school_info = SchoolInfo.objects.first()
-    latest_notices = Notice.objects.filter(is_active=True).order_by('-created_at')[:3]
-    
+    # The navbar and footer are passed as callables, so only templates that
+    # show them (base.html) fetch them from the cache.
     return {
-        'school_info': school_info,
-        'latest_notices': latest_notices
-    }
\ No newline at end of file
+        'school_info': layout.school_info(),
+        'site_navbar': layout.navbar_html,
+        'site_footer': layout.footer_html,
+    }
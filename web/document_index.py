@@ -0,0 +1,163 @@
+# web/document_index.py
+
+"""
+DocumentIndex: one row per file of the seven document models (notices,
+general notices, results, admissions, books, syllabus, routines), with the
+class, department and notice type ids, file size and MIME type copied in.
+A feed or count across all of them is one indexed query on one table:
+
+    latest_documents(class_id=3)[:20]
+    document_counts()                   # {'result': 12, 'book': 40, ...}
+
+/api/documents/ serves both (web.views.api_documents).
+
+Rows use the same kind and object_id as search.SearchDocument. Signals
+(web.signals) keep the table current; rebuild_document_index re-creates it
+after bulk updates that bypass them.
+"""
+
+import mimetypes
+
+from django.apps import apps
+from django.db import transaction
+from django.urls import reverse
+from django.db.models import Count
+from .models import DocumentIndex
+from .versions import bump_model_version
+
+
+class DocumentSource:
+    """How rows of one model become DocumentIndex rows."""
+
+    def __init__(self, kind, model, download_url_name, category=None):
+        self.kind = kind
+        self.model_label = model
+        self.download_url_name = download_url_name
+        self.category = category                # field copied into DocumentIndex.category
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+
+DOCUMENT_SOURCES = [
+    DocumentSource('notice', 'notice.Notice', 'download_notice'),
+    DocumentSource('web_notice', 'web.Notice', 'download_notice_file', category='type'),
+    DocumentSource('result', 'web.Result', 'download_result'),
+    DocumentSource('admission', 'web.Admission', 'download_admission'),
+    DocumentSource('book', 'web.Book', 'download_book'),
+    DocumentSource('syllabus', 'web.Syllabus', 'download_syllabus'),
+    DocumentSource('routine', 'web.Routine', 'download_routine', category='category'),
+]
+
+SOURCES_BY_LABEL = {source.model_label: source for source in DOCUMENT_SOURCES}
+SOURCES_BY_KIND = {source.kind: source for source in DOCUMENT_SOURCES}
+DOCUMENT_VALUES = ('kind', 'object_id', 'title', 'category', 'class_name_id', 'department_id', 'notice_type_id',
+                   'size', 'mime_type', 'updated_at')
+
+
+def source_for_model(model):
+    return SOURCES_BY_LABEL.get(model._meta.label)
+
+
+def file_size(field_file, known=None):
+    """Size of the stored file; `known` is (name, size) from the existing row, reused when the file is unchanged."""
+    if known and known[0] == field_file.name:
+        return known[1]
+    try:
+        return field_file.size
+    except OSError:
+        return 0
+
+
+def document_fields(source, obj, known=None):
+    """DocumentIndex field values for obj, or None when it has no file."""
+    if not obj.file:
+        return None
+    return {
+        'title': obj.title[:255],
+        'category': getattr(obj, source.category) if source.category else '',
+        'class_name_id': getattr(obj, 'class_name_id', None),
+        'department_id': getattr(obj, 'department_id', None),
+        'notice_type_id': getattr(obj, 'notice_type_id', None),
+        'file': obj.file.name,
+        'size': file_size(obj.file, known),
+        'mime_type': mimetypes.guess_type(obj.file.name)[0] or 'application/octet-stream',
+        'is_active': obj.is_active,
+        'created_at': obj.created_at,
+        'updated_at': obj.updated_at,
+    }
+
+
+def index_document(obj):
+    """Create, update or remove the DocumentIndex row for one object."""
+    source = source_for_model(type(obj))
+    if source is None:
+        return
+    rows = DocumentIndex.objects.filter(kind=source.kind, object_id=obj.pk)
+    fields = document_fields(source, obj, rows.values_list('file', 'size').first())
+    if fields is None:
+        rows.delete()
+        return
+    DocumentIndex.objects.update_or_create(kind=source.kind, object_id=obj.pk, defaults=fields)
+
+
+def remove_document(model, pk):
+    source = source_for_model(model)
+    if source is not None:
+        DocumentIndex.objects.filter(kind=source.kind, object_id=pk).delete()
+
+
+@transaction.atomic
+def rebuild():
+    """Re-create every DocumentIndex row. Returns the number of rows."""
+    known = {(kind, object_id): (name, size) for kind, object_id, name, size
+             in DocumentIndex.objects.values_list('kind', 'object_id', 'file', 'size')}
+    DocumentIndex.objects.all().delete()
+    rows = []
+    for source in DOCUMENT_SOURCES:
+        for obj in source.model._default_manager.iterator():
+            fields = document_fields(source, obj, known.get((source.kind, obj.pk)))
+            if fields is not None:
+                rows.append(DocumentIndex(kind=source.kind, object_id=obj.pk, **fields))
+    DocumentIndex.objects.bulk_create(rows, batch_size=1000)
+    # bulk_create sends no post_save, so invalidate cached feeds here.
+    transaction.on_commit(lambda: bump_model_version(DocumentIndex))
+    return len(rows)
+
+
+def latest_documents(kind=None, class_id=None, department_id=None, notice_type_id=None):
+    """Active documents, newest first, optionally narrowed to one kind, class, department or notice type."""
+    queryset = DocumentIndex.objects.filter(is_active=True)
+    for field, value in (('kind', kind), ('class_name_id', class_id),
+                         ('department_id', department_id), ('notice_type_id', notice_type_id)):
+        if value is not None:
+            queryset = queryset.filter(**{field: value})
+    return queryset.order_by('-updated_at')
+
+
+def document_counts():
+    """{kind: number of active documents}."""
+    return dict(
+        DocumentIndex.objects.filter(is_active=True).order_by().values_list('kind').annotate(count=Count('id'))
+    )
+
+
+def document_row(values, snapshot):
+    """JSON-ready dict for a latest_documents() row read with values(*DOCUMENT_VALUES)."""
+    cls = snapshot.class_by_id.get(values['class_name_id'])
+    department = snapshot.department_by_id.get(values['department_id'])
+    notice_type = snapshot.notice_type_by_id.get(values['notice_type_id'])
+    return {
+        'kind': values['kind'],
+        'id': values['object_id'],
+        'title': values['title'],
+        'category': values['category'],
+        'class_name': cls.name if cls else '',
+        'department': department.name if department else '',
+        'notice_type': notice_type.name if notice_type else '',
+        'size': values['size'],
+        'mime_type': values['mime_type'],
+        'updated_at': values['updated_at'].strftime('%d %b %Y'),
+        'download_url': reverse(SOURCES_BY_KIND[values['kind']].download_url_name, kwargs={'pk': values['object_id']}),
+    }
@@ -0,0 +1,99 @@
+# web/images.py
+
+import base64
+from io import BytesIO
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+# Longest edge of the blur-up placeholder. Small enough to inline in JSON
+# (a few hundred bytes), large enough to keep the dominant colours.
+PLACEHOLDER_SIZE = 8
+
+# Models whose images get width/height/placeholder stored on save,
+# mapped to the name of their image field.
+IMAGE_METADATA_FIELDS = {
+    'Gallery': 'image',
+    'Slider': 'image',
+    'FacultyMember': 'photo',
+    'EventAndNews': 'primary_image',
+    'EventAndNewsImage': 'image',
+}
+
+# EXIF orientations that swap the displayed width and height.
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def read_image_metadata(field_file):
+    """
+    Returns (width, height, placeholder) for an image field file, or None
+    if the file is missing or is not a readable image.
+    """
+    committed = getattr(field_file, '_committed', True)
+    try:
+        if committed:
+            field_file.open('rb')
+        field_file.seek(0)
+        with Image.open(field_file) as img:
+            width, height = img.size
+            if img.getexif().get(0x0112) in ROTATED_ORIENTATIONS:
+                width, height = height, width
+            img.draft('RGB', (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+            thumb = ImageOps.exif_transpose(img).convert('RGB')
+            thumb.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+            buffer = BytesIO()
+            thumb.save(buffer, format='PNG', optimize=True)
+    except (FileNotFoundError, UnidentifiedImageError, OSError, ValueError):
+        return None
+    finally:
+        # Rewind uploads so the storage backend saves the whole file,
+        # and release files we opened from storage ourselves.
+        try:
+            if committed:
+                field_file.close()
+            else:
+                field_file.seek(0)
+        except (OSError, ValueError):
+            pass
+
+    placeholder = 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+    return width, height, placeholder
+
+
+def apply_image_metadata(instance, field_name):
+    """
+    Sets <field>_width, <field>_height and <field>_placeholder on the instance
+    from its image. Returns True if anything changed.
+    """
+    field_file = getattr(instance, field_name)
+    metadata = read_image_metadata(field_file) if field_file else None
+    width, height, placeholder = metadata or (None, None, '')
+
+    changed = False
+    for suffix, value in (('width', width), ('height', height), ('placeholder', placeholder)):
+        attname = f'{field_name}_{suffix}'
+        if getattr(instance, attname) != value:
+            setattr(instance, attname, value)
+            changed = True
+    return changed
+
+
+def needs_image_metadata(instance, field_name):
+    """A freshly uploaded image, a cleared one, or one saved before metadata existed."""
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return getattr(instance, f'{field_name}_width') is not None
+    if not getattr(field_file, '_committed', True):
+        return True
+    return getattr(instance, f'{field_name}_width') is None
+
+
+def image_metadata(instance, field_name):
+    """Serialisable metadata for JSON endpoints, so clients can reserve space before loading."""
+    if not getattr(instance, field_name):
+        return {'width': None, 'height': None, 'placeholder': ''}
+    return {
+        'width': getattr(instance, f'{field_name}_width'),
+        'height': getattr(instance, f'{field_name}_height'),
+        'placeholder': getattr(instance, f'{field_name}_placeholder'),
+    }
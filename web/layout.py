@@ -0,0 +1,52 @@
+# web/layout.py
+
+"""
+The navbar and footer of base.html, rendered once per content version and
+spliced into every page (see web.context_processors). A full page then only
+costs the render of its own content block.
+"""
+
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.safestring import mark_safe
+from notice.models import Notice
+from .models import ImportantLink, SchoolInfo
+from .singleflight import get_or_compute
+from .versions import get_versions
+
+
+LAYOUT_TTL = 3600
+
+
+def school_info():
+    return get_or_compute(
+        'layout:school_info', lambda: SchoolInfo.objects.first(), LAYOUT_TTL,
+        version=get_versions('web.SchoolInfo'),
+    )
+
+
+def _render_navbar():
+    return render_to_string('website/include/navbar.html', {
+        'school_info': SchoolInfo.objects.first(),
+        'latest_notices': Notice.objects.filter(is_active=True).order_by('-created_at')[:3],
+        'notice_stream_url': reverse('notice_stream'),
+    })
+
+
+def _render_footer():
+    return render_to_string('website/include/footer.html', {
+        'school_info': SchoolInfo.objects.first(),
+        'footer_links': ImportantLink.objects.filter(is_active=True).order_by('order')[:5],
+    })
+
+
+def navbar_html():
+    return mark_safe(get_or_compute(
+        'layout:navbar', _render_navbar, LAYOUT_TTL, version=get_versions('web.SchoolInfo', 'notice.Notice'),
+    ))
+
+
+def footer_html():
+    return mark_safe(get_or_compute(
+        'layout:footer', _render_footer, LAYOUT_TTL, version=get_versions('web.SchoolInfo', 'web.ImportantLink'),
+    ))
@@ -0,0 +1,174 @@
+# web/listings.py
+
+"""
+Filtered document listings (routines, books, syllabus, results, admissions,
+notices), declared once per model:
+
+    routines_listing = Listing('routines', Routine, 'download_routine', params={'type': 'category'},
+                               defaults={'type': 'class'})
+    filter_routines = routines_listing.view()
+
+Every listing understands ?class_id= or ?dept_slug=, its own `params`
+and ?page=. A listing returns every matching row unless it has a page size
+(its own, or settings.LISTING_PAGE_SIZE) or the request asks for a ?page=,
+which is then REQUESTED_PAGE_SIZE rows long. Rows are read with values(), and class, department and notice
+type names come from the taxonomy snapshot (web.taxonomy), so a page is one
+query without joins. Books and syllabus keep absolute file and download
+URLs (absolute_urls=True), as their JSON always had. JSON views get an ETag (web.conditional) and are
+cached per URL until the model or the taxonomy changes (web.singleflight).
+"""
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.urls import reverse
+from .conditional import conditional_listing
+from .singleflight import single_flight
+from .taxonomy import SLUG_MAPS, TAXONOMY_MODELS, ataxonomy, filter_by_slug, taxonomy
+
+
+DEFAULT_PAGE_SIZE = None                # every row
+REQUESTED_PAGE_SIZE = 100
+LISTING_TTL = 60
+VALUES = ('id', 'title', 'class_name_id', 'department_id', 'updated_at', 'file')
+
+
+class Listing:
+    def __init__(self, name, model, download_url_name, filters=None, exclude=None, params=None, defaults=None,
+                 fields=(), order_by='-updated_at', extra=None, page_size=None, ttl=LISTING_TTL,
+                 absolute_urls=False):
+        self.name = name                                # key of the list in the JSON payload
+        self.model = model
+        self.download_url_name = download_url_name
+        self.filters = {'is_active': True, **(filters or {})}
+        self.exclude = exclude or {}
+        self.params = params or {}                      # query parameter -> field (or taxonomy FK)
+        self.defaults = defaults or {}                  # query parameter -> value when absent
+        self.values = VALUES + tuple(fields)
+        self.order_by = order_by
+        self.extra = extra                              # (row, values, snapshot) -> None, adds keys
+        self.page_size = page_size
+        self.ttl = ttl
+        self.absolute_urls = absolute_urls              # file_url/download_url include scheme and host
+        self.depends_on = (model._meta.label,) + TAXONOMY_MODELS
+
+    def get_page_size(self, request):
+        """Rows per page, or None for all of them."""
+        size = self.page_size or getattr(settings, 'LISTING_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+        if size is None and 'page' in request.GET:
+            return REQUESTED_PAGE_SIZE
+        return size
+
+    def queryset(self, request):
+        """The filtered queryset, unpaginated (also what the ETag aggregates)."""
+        queryset = self.model.objects.filter(**self.filters)
+        if self.exclude:
+            queryset = queryset.exclude(**self.exclude)
+
+        for param, field in self.params.items():
+            value = request.GET.get(param, self.defaults.get(param))
+            if not value:
+                continue
+            if field in SLUG_MAPS:
+                queryset = filter_by_slug(queryset, field, value)
+            else:
+                queryset = queryset.filter(**{field: value})
+
+        class_id = request.GET.get('class_id')
+        dept_slug = request.GET.get('dept_slug')
+        if class_id and class_id.isdigit():
+            queryset = queryset.filter(class_name_id=int(class_id))
+        elif dept_slug:
+            queryset = filter_by_slug(queryset, 'department', dept_slug)
+        return queryset.order_by(self.order_by)
+
+    def page_number(self, request):
+        page = request.GET.get('page', '')
+        return int(page) if page.isdigit() and int(page) > 0 else 1
+
+    def _page_values(self, request):
+        # One row past the page tells whether there is a next page without a COUNT.
+        rows = self.queryset(request).values(*self.values)
+        size = self.get_page_size(request)
+        if size is None:
+            return rows
+        start = (self.page_number(request) - 1) * size
+        return rows[start:start + size + 1]
+
+    def _page(self, request, rows, snapshot):
+        size = self.get_page_size(request)
+        if size is None:
+            return {'rows': [self.row(request, values, snapshot) for values in rows], 'page': 1, 'has_next': False}
+        return {
+            'rows': [self.row(request, values, snapshot) for values in rows[:size]],
+            'page': self.page_number(request),
+            'has_next': len(rows) > size,
+        }
+
+    def page(self, request):
+        """{'rows': [...], 'page': n, 'has_next': bool} for the request's filters and ?page=."""
+        return self._page(request, list(self._page_values(request)), taxonomy())
+
+    async def apage(self, request):
+        """Async page()."""
+        rows = [values async for values in self._page_values(request)]
+        return self._page(request, rows, await ataxonomy())
+
+    def row(self, request, values, snapshot):
+        file_field = self.model._meta.get_field('file')
+        file_url = file_field.storage.url(values['file']) if values['file'] else ''
+        download_url = reverse(self.download_url_name, kwargs={'pk': values['id']})
+        if self.absolute_urls:
+            file_url = request.build_absolute_uri(file_url) if file_url else ''
+            download_url = request.build_absolute_uri(download_url)
+        cls = snapshot.class_by_id.get(values['class_name_id'])
+        department = snapshot.department_by_id.get(values['department_id'])
+        row = {
+            'id': values['id'],
+            'title': values['title'],
+            'class_name': cls.name if cls else '',
+            'department': department.name if department else '',
+            'updated_at': values['updated_at'].strftime('%d %b %Y'),
+            'file_url': file_url,
+            'download_url': download_url,
+        }
+        if self.extra:
+            self.extra(row, values, snapshot)
+        return row
+
+    def payload(self, page):
+        return {self.name: page['rows'], 'page': page['page'], 'has_next': page['has_next']}
+
+    def _decorate(self, view_func):
+        view_func.__name__ = f'filter_{self.name}'
+        view_func.__module__ = self.model.__module__
+        view_func = conditional_listing(self.queryset, versions=TAXONOMY_MODELS)(view_func)
+        return single_flight(ttl=self.ttl, depends_on=self.depends_on)(view_func)
+
+    def view(self):
+        """The JSON filter endpoint."""
+        def filter_view(request):
+            return JsonResponse(self.payload(self.page(request)))
+        return self._decorate(filter_view)
+
+    def async_view(self):
+        """The JSON filter endpoint, for ASGI."""
+        async def filter_view(request):
+            return JsonResponse(self.payload(await self.apage(request)))
+        return self._decorate(filter_view)
+
+
+def listing_context(request, listing):
+    """Template context for a listing fragment: its rows and the links to the neighbouring pages."""
+    page = listing.page(request)
+
+    def query(number):
+        params = request.GET.copy()
+        params['page'] = number
+        return params.urlencode()
+
+    return {
+        'items': page['rows'],
+        'offset': (page['page'] - 1) * (listing.get_page_size(request) or 0),
+        'previous_query': query(page['page'] - 1) if page['page'] > 1 else '',
+        'next_query': query(page['page'] + 1) if page['has_next'] else '',
+    }
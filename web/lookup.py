@@ -0,0 +1,106 @@
+# web/lookup.py
+
+import re
+
+from django.db import transaction
+from search.text import normalize
+from .models import Student, StudentLookup
+
+
+KEY_LENGTH = 100
+# Sorts after every other character, so [prefix, prefix + MAX_CHAR) is the prefix range.
+MAX_CHAR = '\U0010ffff'
+SEPARATORS_RE = re.compile(r'[\s.,;:()\-_/]+')
+
+
+def normalize_name(text):
+    return ' '.join(SEPARATORS_RE.sub(' ', normalize(text)).split())[:KEY_LENGTH]
+
+
+def normalize_number(text):
+    """Roll and registration numbers: ASCII digits, no spaces or leading zeros."""
+    number = SEPARATORS_RE.sub('', normalize(text))
+    return (number.lstrip('0') or number)[:KEY_LENGTH]
+
+
+def student_keys(student):
+    """
+    (kind, key) pairs for one student. Every word of the name starts a key
+    ("md abdul karim", "abdul karim", "karim"), so typing any part of the
+    name from the start of a word is a plain prefix match.
+    """
+    words = normalize_name(student.name).split()
+    keys = {('name', ' '.join(words[index:])) for index in range(len(words))}
+    for kind, value in (('roll', student.roll_number), ('registration', student.registration_number)):
+        number = normalize_number(value or '')
+        if number:
+            keys.add((kind, number))
+    return keys
+
+
+def _lookup_rows(student):
+    return [
+        StudentLookup(student_id=student.pk, class_name_id=student.class_name_id, kind=kind, key=key)
+        for kind, key in student_keys(student)
+    ]
+
+
+@transaction.atomic
+def index_student(student):
+    StudentLookup.objects.filter(student_id=student.pk).delete()
+    StudentLookup.objects.bulk_create(_lookup_rows(student))
+
+
+@transaction.atomic
+def rebuild():
+    """Re-create every lookup key. Returns the number of keys."""
+    StudentLookup.objects.all().delete()
+    rows = [row for student in Student.objects.iterator() for row in _lookup_rows(student)]
+    StudentLookup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _prefix(queryset, key):
+    return queryset.filter(key__gte=key, key__lt=key + MAX_CHAR)
+
+
+def matching_keys(query):
+    """
+    Lookup rows whose key starts with `query`: digits search roll and
+    registration numbers, anything else searches names. An index range
+    scan, never a table scan.
+    """
+    number = normalize_number(query)
+    if number.isdigit():
+        return _prefix(StudentLookup.objects.filter(kind__in=('roll', 'registration')), number)
+    name = normalize_name(query)
+    if not name:
+        return StudentLookup.objects.none()
+    return _prefix(StudentLookup.objects.filter(kind='name'), name)
+
+
+def autocomplete(query, class_id=None, limit=10):
+    """Up to `limit` students matching `query` (see matching_keys), in key order."""
+    keys = matching_keys(query)
+    if class_id:
+        keys = keys.filter(class_name_id=class_id)
+    keys = keys.select_related('student__class_name', 'student__department').order_by('key')
+
+    students = {}
+    # One student can match on several keys; over-fetch a little and dedupe.
+    for row in keys[:limit * 3]:
+        students.setdefault(row.student_id, row.student)
+        if len(students) == limit:
+            break
+    return list(students.values())
+
+
+def find_by_roll(class_id, roll_number):
+    """The student with this roll number in a class, or None."""
+    row = (
+        StudentLookup.objects
+        .filter(class_name_id=class_id, kind='roll', key=normalize_number(roll_number))
+        .select_related('student__class_name', 'student__department')
+        .first()
+    )
+    return row.student if row else None
@@ -0,0 +1,28 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from web.images import IMAGE_METADATA_FIELDS, apply_image_metadata
+
+
+class Command(BaseCommand):
+    help = "Compute stored width/height/placeholder for images uploaded before the metadata fields existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Recompute metadata for every image, not only missing ones.")
+
+    def handle(self, *args, **options):
+        for model_name, field_name in IMAGE_METADATA_FIELDS.items():
+            model = apps.get_model('web', model_name)
+            queryset = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            if not options['force']:
+                queryset = queryset.filter(**{f'{field_name}_width__isnull': True})
+
+            updated = 0
+            for instance in queryset.iterator():
+                if apply_image_metadata(instance, field_name):
+                    # update() keeps updated_at/auto_now untouched and skips signals.
+                    model.objects.filter(pk=instance.pk).update(**{
+                        f'{field_name}_{suffix}': getattr(instance, f'{field_name}_{suffix}')
+                        for suffix in ('width', 'height', 'placeholder')
+                    })
+                    updated += 1
+            self.stdout.write(f"{model_name}: updated {updated} image(s)")
@@ -0,0 +1,120 @@
+import asyncio
+import resource
+import statistics
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+from notice.models import Notice
+from web.pubsub import feed
+
+
+class Command(BaseCommand):
+    help = (
+        "Hold --clients connections open on the notice event stream (in-process, through the ASGI "
+        "application, so no server needs to be running), publish a notice by re-activating it, and "
+        "report how long each client took to receive it. Run with DJANGO_ASYNC_VIEWS=1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1000, help="Open connections (default: 1000).")
+        parser.add_argument('--rounds', type=int, default=3, help="Notices to publish (default: 3).")
+        parser.add_argument('--notice', type=int, help="notice.Notice to re-activate (default: the newest).")
+        parser.add_argument('--timeout', type=float, default=30, help="Seconds to wait for the streams to open and for each broadcast (default: 30).")
+        parser.add_argument(
+            '--with-load-shedding', action='store_true',
+            help="Keep LoadSheddingMiddleware, which may refuse some of the connections opened at once.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.ASYNC_VIEWS:
+            raise CommandError("The event streams only exist under ASGI; run with DJANGO_ASYNC_VIEWS=1.")
+        notice = Notice.objects.get(pk=options['notice']) if options['notice'] else Notice.objects.order_by('-pk').first()
+        if notice is None:
+            raise CommandError("No notice to publish; create one or pass --notice.")
+
+        middleware = settings.MIDDLEWARE
+        if not options['with_load_shedding']:
+            middleware = [name for name in middleware if not name.endswith('.LoadSheddingMiddleware')]
+        was_active = notice.is_active
+        try:
+            with override_settings(MIDDLEWARE=middleware, EVENT_STREAM_MAX_CONNECTIONS=options['clients'] + 1):
+                asyncio.run(self.run(notice, options))
+        finally:
+            Notice.objects.filter(pk=notice.pk).update(is_active=was_active)
+
+    async def run(self, notice, options):
+        from django.core.asgi import get_asgi_application
+
+        application = get_asgi_application()
+        path = reverse('notice_stream')
+        received = []                   # per client: the times it got a "notices" event
+        disconnected = asyncio.Event()
+
+        async def client(index):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+                'headers': [(b'host', b'127.0.0.1'), (b'accept', b'text/event-stream')],
+                'client': ('127.0.0.1', 10000 + index), 'server': ('127.0.0.1', 80),
+            }
+            times = []
+            received.append(times)
+            requested = []
+
+            async def receive():
+                if not requested:
+                    requested.append(True)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.body' and b'event: notices' in message.get('body', b''):
+                    times.append(time.perf_counter())
+
+            await application(scope, receive, send)
+
+        memory_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        opened = time.perf_counter()
+        clients = [asyncio.ensure_future(client(index)) for index in range(options['clients'])]
+        while feed.subscribers < options['clients']:
+            if time.perf_counter() - opened > options['timeout']:
+                raise CommandError(f"Only {feed.subscribers}/{options['clients']} streams opened.")
+            await asyncio.sleep(0.05)
+        self.stdout.write(
+            f"{options['clients']} streams open after {time.perf_counter() - opened:.2f}s, "
+            f"peak RSS +{(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory_before) / 1024:.1f} MB"
+        )
+
+        for number in range(1, options['rounds'] + 1):
+            await sync_to_async(self.set_active)(notice, False)
+            published = await sync_to_async(self.set_active)(notice, True)
+            deadline = published + options['timeout']
+            while sum(len(times) >= number for times in received) < len(received) and time.perf_counter() < deadline:
+                await asyncio.sleep(0.01)
+            self.report(number, [times[number - 1] - published for times in received if len(times) >= number])
+
+        disconnected.set()
+        await asyncio.gather(*clients, return_exceptions=True)
+
+    def set_active(self, notice, is_active):
+        """Save through the ORM so the signals log the change; returns when the save started."""
+        started = time.perf_counter()
+        notice.is_active = is_active
+        notice.save()
+        return started
+
+    def report(self, number, latencies):
+        latencies = sorted(latencies)
+        if not latencies:
+            self.stdout.write(f"round {number}: no client received the notice")
+            return
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f"round {number}: {len(latencies)} clients, p50 {statistics.median(latencies) * 1000:.1f}ms, "
+            f"p95 {p95 * 1000:.1f}ms, max {latencies[-1] * 1000:.1f}ms"
+        )
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+from web.models import Book
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent file downloads under WSGI (a fixed pool of worker threads) and ASGI "
+        "(the async views on one event loop). Slow clients are simulated in-process by reading "
+        "each response at --rate KB/s, so no server needs to be running. ASGI threads are the "
+        "per-request sync contexts and file reads; none of them waits on a slow client."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=('both', 'wsgi', 'asgi'), default='both')
+        parser.add_argument('--path', help="URL to download (default: the first book with a file).")
+        parser.add_argument('--clients', type=int, default=50, help="Concurrent downloads (default: 50).")
+        parser.add_argument('--threads', type=int, default=8, help="WSGI worker threads (default: 8).")
+        parser.add_argument('--rate', type=int, default=512, help="Read speed of each client in KB/s (default: 512).")
+        parser.add_argument(
+            '--with-load-shedding', action='store_true',
+            help="Keep LoadSheddingMiddleware, which caps concurrent downloads per process.",
+        )
+
+    def handle(self, *args, **options):
+        path = options['path'] or self.default_path()
+        if options['mode'] == 'both':
+            for mode in ('wsgi', 'asgi'):
+                self.run_in_subprocess(mode, path, options)
+            return
+
+        if settings.ASYNC_VIEWS != (options['mode'] == 'asgi'):
+            raise CommandError(f"Run --mode {options['mode']} with DJANGO_ASYNC_VIEWS={int(options['mode'] == 'asgi')}.")
+        middleware = settings.MIDDLEWARE
+        if not options['with_load_shedding']:
+            middleware = [name for name in middleware if not name.endswith('.LoadSheddingMiddleware')]
+
+        rate = options['rate'] * 1024
+        with override_settings(MIDDLEWARE=middleware), PeakThreads() as threads:
+            started = time.perf_counter()
+            if options['mode'] == 'wsgi':
+                results = self.run_wsgi(path, options['clients'], options['threads'], rate)
+            else:
+                results = asyncio.run(self.run_asgi(path, options['clients'], rate))
+            elapsed = time.perf_counter() - started
+        self.report(options['mode'], results, elapsed, threads.peak)
+
+    def default_path(self):
+        book = Book.objects.exclude(file='').order_by('pk').first()
+        if book is None or not os.path.exists(book.file.path):
+            raise CommandError("No book with a file on disk; upload one or pass --path.")
+        return reverse('download_book', kwargs={'pk': book.pk})
+
+    def run_in_subprocess(self, mode, path, options):
+        command = [
+            sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'benchmark_downloads',
+            '--mode', mode, '--path', path, '--clients', str(options['clients']),
+            '--threads', str(options['threads']), '--rate', str(options['rate']),
+        ]
+        if options['with_load_shedding']:
+            command.append('--with-load-shedding')
+        env = dict(os.environ, DJANGO_ASYNC_VIEWS='1' if mode == 'asgi' else '0')
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(completed.stderr.strip())
+        self.stdout.write(completed.stdout, ending='')
+
+    def run_wsgi(self, path, clients, threads, rate):
+        from django.core.wsgi import get_wsgi_application
+
+        application = get_wsgi_application()
+
+        def download():
+            environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path}
+            setup_testing_defaults(environ)
+            started = time.perf_counter()
+            statuses = []
+            body = application(environ, lambda status, headers, exc_info=None: statuses.append(status))
+            size = 0
+            try:
+                for chunk in body:
+                    size += len(chunk)
+                    # The client reads at `rate`; the worker thread waits for it.
+                    time.sleep(max(0, started + size / rate - time.perf_counter()))
+            finally:
+                body.close()
+            return time.perf_counter() - started, int(statuses[0].split()[0]), size
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return list(pool.map(lambda _: download(), range(clients)))
+
+    async def run_asgi(self, path, clients, rate):
+        from django.core.asgi import get_asgi_application
+
+        application = get_asgi_application()
+
+        async def download(index):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+                'headers': [(b'host', b'127.0.0.1')], 'client': ('127.0.0.1', 10000 + index), 'server': ('127.0.0.1', 80),
+            }
+            started = time.perf_counter()
+            state = {'status': None, 'size': 0}
+            disconnected = asyncio.Event()
+            requested = []
+
+            async def receive():
+                if not requested:
+                    requested.append(True)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    state['status'] = message['status']
+                elif message['type'] == 'http.response.body':
+                    state['size'] += len(message.get('body', b''))
+                    await asyncio.sleep(max(0, started + state['size'] / rate - time.perf_counter()))
+
+            await application(scope, receive, send)
+            return time.perf_counter() - started, state['status'], state['size']
+
+        return await asyncio.gather(*(download(index) for index in range(clients)))
+
+    def report(self, mode, results, elapsed, peak_threads):
+        latencies = sorted(latency for latency, status, _ in results if status == 200)
+        failed = len(results) - len(latencies)
+        transferred = sum(size for _, status, size in results if status == 200)
+        if latencies:
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            timing = f"p50 {statistics.median(latencies):.2f}s, p95 {p95:.2f}s"
+        else:
+            timing = "no successful downloads"
+        self.stdout.write(
+            f"{mode}: {len(latencies)}/{len(results)} downloads in {elapsed:.2f}s "
+            f"({transferred / elapsed / 1024 / 1024:.1f} MB/s), {timing}, "
+            f"{failed} failed, peak {peak_threads} threads"
+        )
+
+
+class PeakThreads:
+    """Samples threading.active_count() while the benchmark runs."""
+
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self.done = threading.Event()
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
+        return self
+
+    def sample(self):
+        while not self.done.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __exit__(self, *exc_info):
+        self.done.set()
+        self.sampler.join()
+        # The sampler itself does not count.
+        self.peak -= 1
@@ -0,0 +1,52 @@
+import os
+import shutil
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from web.models import MediaBlob
+from web.storage import file_field_names, is_blob_name
+
+
+class Command(BaseCommand):
+    help = "Delete content-addressed media blobs that are no longer referenced by any file field."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recount', action='store_true', help="Recompute reference counts from every file field before collecting.")
+        parser.add_argument('--grace-hours', type=int, default=24, help="Keep unreferenced blobs touched within this many hours (default: 24).")
+        parser.add_argument('--dry-run', action='store_true', help="Report what would be deleted without deleting anything.")
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self.recount(options['dry_run'])
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        garbage = MediaBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff)
+
+        freed = 0
+        for blob in garbage:
+            freed += blob.size
+            self.stdout.write(f"{'Would delete' if options['dry_run'] else 'Deleting'} {blob.name}")
+            if not options['dry_run']:
+                shutil.rmtree(os.path.dirname(default_storage.path(blob.name)), ignore_errors=True)
+                blob.delete()
+        self.stdout.write(self.style.SUCCESS(f"Unreferenced blobs: {freed / 1024 / 1024:.1f} MB"))
+
+    def recount(self, dry_run):
+        references = Counter()
+        for model in apps.get_models():
+            fields = file_field_names(model)
+            if not fields:
+                continue
+            for row in model._default_manager.values_list(*fields):
+                references.update(name for name in row if is_blob_name(name))
+
+        for blob in MediaBlob.objects.all():
+            count = references.get(blob.name, 0)
+            if count != blob.ref_count:
+                self.stdout.write(f"{blob.name}: {blob.ref_count} -> {count} reference(s)")
+                if not dry_run:
+                    MediaBlob.objects.filter(pk=blob.pk).update(ref_count=count, updated_at=timezone.now())
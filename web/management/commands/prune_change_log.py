@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from web.models import ChangeLog
+
+
+class Command(BaseCommand):
+    help = "Delete /api/updates/ change log entries older than --days (default 30)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = ChangeLog.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(f"Deleted {deleted} change log entr{'y' if deleted == 1 else 'ies'}")
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from web.document_index import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the cross-type document index, e.g. after bulk updates that bypass signals."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Indexed {rebuild()} document(s)")
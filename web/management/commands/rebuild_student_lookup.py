@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from web.lookup import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the student typeahead/roll lookup keys, e.g. after bulk updates that bypass signals."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Indexed {rebuild()} lookup key(s)")
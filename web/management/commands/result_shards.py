@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from web import result_shards
+from web.models import Result
+
+
+class Command(BaseCommand):
+    help = (
+        "Manage the pre-rendered per-student result files under MEDIA_ROOT/result-shards: "
+        "publish a new generation, verify the published one against the database, or roll back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['publish', 'verify', 'rollback', 'list'])
+        parser.add_argument('results', nargs='*', type=int, help="Result ids (default: every active result with student results).")
+        parser.add_argument('--keep', type=int, default=result_shards.KEEP_GENERATIONS, help="Generations to keep when publishing.")
+
+    def handle(self, *args, **options):
+        results = Result.objects.all()
+        if options['results']:
+            results = results.filter(pk__in=options['results'])
+            missing = set(options['results']) - set(results.values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f"Unknown result id(s): {', '.join(map(str, sorted(missing)))}")
+        else:
+            results = results.filter(is_active=True, student_results__isnull=False).distinct()
+
+        failed = False
+        for result in results:
+            try:
+                if options['action'] == 'publish':
+                    generation, count = result_shards.publish(result, keep=options['keep'])
+                    self.stdout.write(f"{result.pk} {result}: published {count} file(s) as {generation}")
+                elif options['action'] == 'verify':
+                    problems = result_shards.verify(result)
+                    for problem in problems:
+                        self.stdout.write(self.style.ERROR(f"{result.pk} {result}: {problem}"))
+                    if not problems:
+                        self.stdout.write(f"{result.pk} {result}: OK ({result_shards.current_generation(result.pk)})")
+                    failed = failed or bool(problems)
+                elif options['action'] == 'rollback':
+                    generation = result_shards.rollback(result)
+                    self.stdout.write(f"{result.pk} {result}: now serving {generation or 'nothing (unpublished)'}")
+                else:
+                    current = result_shards.current_generation(result.pk)
+                    names = [f"{name}{' *' if name == current else ''}" for name in result_shards.generations(result.pk)]
+                    self.stdout.write(f"{result.pk} {result}: {', '.join(names) or 'not published'}")
+            except result_shards.ShardError as e:
+                self.stdout.write(self.style.WARNING(str(e)))
+                failed = True
+        if failed and options['action'] == 'verify':
+            raise CommandError("Verification failed.")
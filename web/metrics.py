@@ -0,0 +1,63 @@
+# web/metrics.py
+
+import threading
+from collections import defaultdict
+
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_descriptions = {}
+_collectors = []
+
+
+def describe(name, kind, help_text):
+    """Register HELP/TYPE for a metric ('counter' or 'gauge')."""
+    _descriptions[name] = (kind, help_text)
+
+
+def inc(name, amount=1, **labels):
+    """Add to a process-local counter."""
+    with _lock:
+        _counters[(name, tuple(sorted(labels.items())))] += amount
+
+
+def register_collector(func):
+    """
+    Register a function returning (name, labels, value) samples, called at
+    scrape time. Use it for gauges that read live state.
+    """
+    _collectors.append(func)
+    return func
+
+
+def samples():
+    with _lock:
+        counters = [(name, dict(labels), value) for (name, labels), value in _counters.items()]
+    gauges = [sample for collector in _collectors for sample in collector()]
+    return counters + gauges
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in sorted(labels.items())
+    )
+    return '{' + pairs + '}'
+
+
+def render():
+    """All samples of this process in the Prometheus text exposition format."""
+    by_name = defaultdict(list)
+    for name, labels, value in samples():
+        by_name[name].append((labels, value))
+    lines = []
+    for name in sorted(by_name):
+        if name in _descriptions:
+            kind, help_text = _descriptions[name]
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+        for labels, value in by_name[name]:
+            lines.append(f'{name}{_format_labels(labels)} {value:g}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,361 @@
+# web/middleware.py
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, JsonResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_max_age, has_vary_header, patch_cache_control, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import http_date, parse_http_date_safe
+from . import metrics
+
+try:
+    import brotli
+except ImportError:  # Without Brotli, responses are gzip-only.
+    brotli = None
+
+
+# Names written by ManifestStaticFilesStorage, e.g. style.0123456789ab.css
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+ENCODING_RE = {
+    'br': re.compile(r'\bbr\b'),
+    'gzip': re.compile(r'\bgzip\b'),
+}
+COMPRESSIBLE_TYPE_RE = re.compile(r'^(text/|application/(json|javascript|xml|xhtml\+xml)|image/svg\+xml)')
+
+
+class StaticFilesMiddleware(MiddlewareMixin):
+    """
+    Serves collected files from STATIC_ROOT before the rest of the stack runs.
+
+    Fingerprinted names never change content, so they are sent with a
+    one-year immutable Cache-Control and browsers never revalidate them.
+    Unhashed names get a short max-age plus Last-Modified. When collectstatic
+    wrote .br/.gz siblings (CompressedManifestStaticFilesStorage), the best one
+    the client accepts is sent as-is, with no compression per request.
+    """
+
+    encodings = (('br', '.br'), ('gzip', '.gz'))
+    immutable_cache_control = 'public, max-age=31536000, immutable'
+    default_cache_control = 'public, max-age=3600'
+
+    def process_request(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(settings.STATIC_URL):
+            return None
+        name = request.path[len(settings.STATIC_URL):]
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except (SuspiciousFileOperation, ValueError):
+            return None
+        if not name or not os.path.isfile(path):
+            return None
+
+        stat = os.stat(path)
+        hashed = bool(HASHED_NAME_RE.search(name))
+        if not hashed:
+            since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+            if since is not None and int(stat.st_mtime) <= since:
+                response = HttpResponseNotModified()
+                response['Cache-Control'] = self.default_cache_control
+                return response
+
+        serve_path, encoding, has_variants = path, None, False
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        for candidate, suffix in self.encodings:
+            if os.path.isfile(path + suffix):
+                has_variants = True
+                if encoding is None and ENCODING_RE[candidate].search(accept_encoding):
+                    serve_path, encoding = path + suffix, candidate
+
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        response = FileResponse(open(serve_path, 'rb'), content_type=content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if has_variants:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Cache-Control'] = self.immutable_cache_control if hashed else self.default_cache_control
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses text responses (HTML pages, JSON from the filter endpoints)
+    with Brotli or gzip, whichever the client prefers and we support.
+
+    Tiny bodies, streaming/file responses and already-encoded responses are
+    left alone, and so are responses that carry a CSRF token or depend on
+    the session (BREACH): the admin, and anything that sets the CSRF cookie
+    or varies on Cookie, which is how Django marks both.
+
+    Responses that are the same for every visitor (public, max-age or an
+    ETag, see is_shared()) have their compressed bodies cached by a digest
+    of the uncompressed content, so an unchanged page or JSON payload is
+    compressed once. Other responses are compressed on each request rather
+    than filling the cache with one-off entries.
+    """
+
+    min_length = 256
+    cache_timeout = 300
+    brotli_quality = 5
+    gzip_level = 6
+    exclude_prefixes = ('/admin/',)
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or response.status_code in (204, 206, 304)
+            or len(response.content) < self.min_length
+            or not COMPRESSIBLE_TYPE_RE.match(response.get('Content-Type', ''))
+            or request.path.startswith(self.exclude_prefixes)
+            or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            or has_vary_header(response, 'Cookie')
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accept_encoding = request.headers.get('Accept-Encoding', '')
+        if brotli is not None and ENCODING_RE['br'].search(accept_encoding):
+            encoding = 'br'
+        elif ENCODING_RE['gzip'].search(accept_encoding):
+            encoding = 'gzip'
+        else:
+            return response
+
+        compressed = self.compress(response.content, encoding, cache_result=self.is_shared(response))
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # The encoded bytes differ from the original, so a strong ETag no longer holds.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def is_shared(self, response):
+        """Whether the response is marked as the same for every visitor, so its compressed body is worth caching."""
+        cache_control = response.get('Cache-Control', '').lower()
+        if 'private' in cache_control or 'no-store' in cache_control:
+            return False
+        return 'public' in cache_control or bool(get_max_age(response)) or response.has_header('ETag')
+
+    def compress(self, content, encoding, cache_result=True):
+        key = f'compressed:{encoding}:{hashlib.sha1(content).hexdigest()}'
+        compressed = cache.get(key) if cache_result else None
+        if compressed is None:
+            if encoding == 'br':
+                compressed = brotli.compress(content, quality=self.brotli_quality)
+            else:
+                compressed = gzip.compress(content, compresslevel=self.gzip_level, mtime=0)
+            if cache_result:
+                cache.set(key, compressed, self.cache_timeout)
+        return compressed
+
+
+class RouteClass:
+    """A group of URLs that share a priority and concurrency limits."""
+
+    def __init__(self, name, pattern, share=1.0, max_concurrent=None, max_wait=0, retry_after=5):
+        self.name = name
+        self.pattern = re.compile(pattern)
+        self.share = share                    # fraction of total capacity this class may fill
+        self.max_concurrent = max_concurrent  # own cap, regardless of free capacity
+        self.max_wait = max_wait              # seconds to queue for a slot before shedding
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Counts requests in flight per route class. A request gets a slot while
+    total in-flight is under capacity * share of its class and its class is
+    under its own cap, and no higher-priority request is queued; otherwise
+    it waits up to max_wait and is then refused.
+    """
+
+    # How often aacquire() re-checks for a free slot.
+    poll_interval = 0.02
+
+    def __init__(self, capacity, route_classes):
+        self.capacity = capacity
+        self.route_classes = route_classes
+        self.condition = threading.Condition()
+        self.total = 0
+        self.in_flight = {route.name: 0 for route in route_classes}
+        self.waiting = {route.name: 0 for route in route_classes}
+
+    def classify(self, path):
+        for route in self.route_classes:
+            if route.pattern.match(path):
+                return route
+        return self.route_classes[-1]
+
+    def _can_enter(self, route):
+        if self.total >= self.capacity * route.share:
+            return False
+        if route.max_concurrent is not None and self.in_flight[route.name] >= route.max_concurrent:
+            return False
+        higher = self.route_classes[:self.route_classes.index(route)]
+        return not any(self.waiting[other.name] for other in higher)
+
+    def acquire(self, route):
+        with self.condition:
+            if not self._can_enter(route):
+                if route.max_wait <= 0 or self.waiting[route.name] >= self.capacity:
+                    return False
+                self.waiting[route.name] += 1
+                try:
+                    if not self.condition.wait_for(lambda: self._can_enter(route), timeout=route.max_wait):
+                        return False
+                finally:
+                    self.waiting[route.name] -= 1
+            self._enter(route)
+            return True
+
+    async def aacquire(self, route):
+        """acquire() for the event loop: polls instead of blocking the thread."""
+        with self.condition:
+            if self._can_enter(route):
+                self._enter(route)
+                return True
+            if route.max_wait <= 0 or self.waiting[route.name] >= self.capacity:
+                return False
+            self.waiting[route.name] += 1
+        deadline = time.monotonic() + route.max_wait
+        try:
+            while True:
+                await asyncio.sleep(self.poll_interval)
+                with self.condition:
+                    entered = self._can_enter(route)
+                    if entered or time.monotonic() >= deadline:
+                        self.waiting[route.name] -= 1
+                        if entered:
+                            self._enter(route)
+                        return entered
+        except asyncio.CancelledError:
+            with self.condition:
+                self.waiting[route.name] -= 1
+            raise
+
+    def _enter(self, route):
+        self.total += 1
+        self.in_flight[route.name] += 1
+
+    def release(self, route):
+        with self.condition:
+            self.total -= 1
+            self.in_flight[route.name] -= 1
+            self.condition.notify_all()
+
+
+class LoadSheddingMiddleware(MiddlewareMixin):
+    """
+    In-process concurrency limit with per-route priority, for admission
+    season. Admin and small JSON requests go first, PDF downloads have a
+    low concurrency cap, and anything that cannot get a slot within its
+    queue time gets an immediate 503 with Retry-After instead of tying up
+    a worker until it times out.
+
+    The slot is held until the response is closed, so file downloads count
+    for as long as they are streaming. Limits are per process: capacity
+    should roughly match the worker's thread count. Under ASGI, requests
+    queue on the event loop (see __acall__) rather than in a thread.
+    """
+
+    capacity = 16
+    route_classes = [
+        RouteClass('admin', r'^/(admin|metrics)/', share=1.0, max_wait=10),
+        RouteClass('api', r'^/(filter|api/|search/|results/lookup/|students/lookup/|footer/)', share=0.9, max_wait=2, retry_after=2),
+        RouteClass('download', r'^/(download|view-[\w-]+-pdf/|media/)', share=0.5, max_concurrent=4, max_wait=1, retry_after=30),
+        RouteClass('page', r'', share=0.75, max_wait=1),
+    ]
+    limiter = None
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        cls = type(self)
+        if cls.limiter is None:
+            cls.limiter = ConcurrencyLimiter(self.capacity, self.route_classes)
+            metrics.register_collector(cls.limiter_samples)
+
+    @classmethod
+    def limiter_samples(cls):
+        limiter = cls.limiter
+        with limiter.condition:
+            samples = [('loadshed_capacity', {}, limiter.capacity)]
+            for route in limiter.route_classes:
+                samples.append(('loadshed_in_flight', {'route_class': route.name}, limiter.in_flight[route.name]))
+                samples.append(('loadshed_waiting', {'route_class': route.name}, limiter.waiting[route.name]))
+        return samples
+
+    def process_request(self, request):
+        route = self.limiter.classify(request.path_info)
+        started = time.monotonic()
+        return self.admit(request, route, self.limiter.acquire(route), started)
+
+    async def __acall__(self, request):
+        # MiddlewareMixin would run process_request in the one thread shared by
+        # all sync code, where a blocking acquire() would stall every request.
+        route = self.limiter.classify(request.path_info)
+        started = time.monotonic()
+        response = self.admit(request, route, await self.limiter.aacquire(route), started)
+        if response is None:
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def admit(self, request, route, admitted, started):
+        metrics.inc('loadshed_wait_seconds_total', time.monotonic() - started, route_class=route.name)
+        if not admitted:
+            metrics.inc('loadshed_rejected_total', route_class=route.name)
+            return self.shed(route)
+        metrics.inc('loadshed_admitted_total', route_class=route.name)
+        request._load_shedding_route = route
+
+    def process_response(self, request, response):
+        route = getattr(request, '_load_shedding_route', None)
+        if route is not None:
+            del request._load_shedding_route
+            released = []
+
+            def release():
+                if not released:
+                    released.append(True)
+                    self.limiter.release(route)
+            if response.get('Content-Type', '').startswith('text/event-stream'):
+                # Event streams stay open for minutes and are idle nearly all
+                # the time; they only hold a slot while the view runs.
+                release()
+            else:
+                response._resource_closers.append(release)
+        return response
+
+    def shed(self, route):
+        message = 'সার্ভার এখন ব্যস্ত, কিছুক্ষণ পরে আবার চেষ্টা করুন।'
+        if route.name == 'api':
+            response = JsonResponse({'error': message}, status=503)
+        else:
+            response = HttpResponse(message, status=503, content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = str(route.retry_after)
+        patch_cache_control(response, no_store=True)
+        return response
+
+
+metrics.describe('loadshed_capacity', 'gauge', 'Requests this process serves concurrently.')
+metrics.describe('loadshed_in_flight', 'gauge', 'Requests holding a slot, per route class.')
+metrics.describe('loadshed_waiting', 'gauge', 'Requests queued for a slot, per route class.')
+metrics.describe('loadshed_admitted_total', 'counter', 'Requests that got a slot.')
+metrics.describe('loadshed_rejected_total', 'counter', 'Requests refused with 503.')
+metrics.describe('loadshed_wait_seconds_total', 'counter', 'Time spent queueing for a slot.')
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventandnews',
+            name='primary_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eventandnews',
+            name='primary_image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blur-up preview (data URI), filled in on save.'),
+        ),
+        migrations.AddField(
+            model_name='eventandnews',
+            name='primary_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eventandnewsimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='eventandnewsimage',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blur-up preview (data URI), filled in on save.'),
+        ),
+        migrations.AddField(
+            model_name='eventandnewsimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='facultymember',
+            name='photo_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='facultymember',
+            name='photo_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blur-up preview (data URI), filled in on save.'),
+        ),
+        migrations.AddField(
+            model_name='facultymember',
+            name='photo_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blur-up preview (data URI), filled in on save.'),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='slider',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='slider',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blur-up preview (data URI), filled in on save.'),
+        ),
+        migrations.AddField(
+            model_name='slider',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_lookup_keys(apps, schema_editor):
+    from web.lookup import student_keys
+
+    Student = apps.get_model('web', 'Student')
+    StudentLookup = apps.get_model('web', 'StudentLookup')
+    StudentLookup.objects.bulk_create(
+        [
+            StudentLookup(student_id=student.pk, class_name_id=student.class_name_id, kind=kind, key=key)
+            for student in Student.objects.iterator()
+            for kind, key in student_keys(student)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0003_mediablob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentLookup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('name', 'Name'), ('roll', 'Roll'), ('registration', 'Registration')], max_length=12)),
+                ('key', models.CharField(max_length=100)),
+                ('class_name', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='web.class')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lookup_keys', to='web.student')),
+            ],
+            options={
+                'verbose_name': 'Student Lookup Key',
+                'verbose_name_plural': 'Student Lookup Keys',
+                'indexes': [models.Index(fields=['kind', 'key'], name='web_student_kind_6fb978_idx'), models.Index(fields=['class_name', 'kind', 'key'], name='web_student_class_n_198d79_idx')],
+            },
+        ),
+        migrations.RunPython(build_lookup_keys, migrations.RunPython.noop),
+    ]
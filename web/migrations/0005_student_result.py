@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0004_student_lookup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('roll_number', models.CharField(help_text='Stored normalised: ASCII digits, no leading zeros.', max_length=20, verbose_name='রোল নম্বর')),
+                ('student_name', models.CharField(blank=True, max_length=100, verbose_name='শিক্ষার্থীর নাম')),
+                ('registration_number', models.CharField(blank=True, max_length=20, verbose_name='রেজিস্ট্রেশন নম্বর')),
+                ('marks', models.JSONField(blank=True, default=dict, help_text='{"বাংলা": 78, "English": "A+", ...}', verbose_name='বিষয়ভিত্তিক নম্বর')),
+                ('total', models.CharField(blank=True, max_length=20, verbose_name='মোট নম্বর')),
+                ('gpa', models.CharField(blank=True, max_length=10, verbose_name='জিপিএ')),
+                ('grade', models.CharField(blank=True, max_length=10, verbose_name='গ্রেড')),
+                ('remarks', models.CharField(blank=True, max_length=50, verbose_name='মন্তব্য')),
+                ('class_name', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='web.class', verbose_name='শ্রেণি')),
+                ('result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_results', to='web.result', verbose_name='পরীক্ষা')),
+            ],
+            options={
+                'verbose_name': 'শিক্ষার্থীর ফলাফল',
+                'verbose_name_plural': 'শিক্ষার্থীদের ফলাফল',
+                'constraints': [models.UniqueConstraint(fields=('result', 'class_name', 'roll_number'), name='unique_student_result_roll')],
+            },
+        ),
+    ]
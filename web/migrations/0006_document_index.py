@@ -0,0 +1,89 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:42
+
+import mimetypes
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# (kind, model, field copied into category) as of this migration; kept
+# here rather than imported from web.document_index so later changes to
+# that module cannot alter what this migration does.
+DOCUMENT_SOURCES = [
+    ('notice', 'notice.Notice', None),
+    ('web_notice', 'web.Notice', 'type'),
+    ('result', 'web.Result', None),
+    ('admission', 'web.Admission', None),
+    ('book', 'web.Book', None),
+    ('syllabus', 'web.Syllabus', None),
+    ('routine', 'web.Routine', 'category'),
+]
+
+
+def file_size(field_file):
+    try:
+        return field_file.size
+    except OSError:
+        return 0
+
+
+def build_document_index(apps, schema_editor):
+    DocumentIndex = apps.get_model('web', 'DocumentIndex')
+    rows = []
+    for kind, model_label, category in DOCUMENT_SOURCES:
+        for obj in apps.get_model(model_label).objects.iterator():
+            if not obj.file:
+                continue
+            rows.append(DocumentIndex(
+                kind=kind,
+                object_id=obj.pk,
+                title=obj.title[:255],
+                category=getattr(obj, category) if category else '',
+                class_name_id=getattr(obj, 'class_name_id', None),
+                department_id=getattr(obj, 'department_id', None),
+                notice_type_id=getattr(obj, 'notice_type_id', None),
+                file=obj.file.name,
+                size=file_size(obj.file),
+                mime_type=mimetypes.guess_type(obj.file.name)[0] or 'application/octet-stream',
+                is_active=obj.is_active,
+                created_at=obj.created_at,
+                updated_at=obj.updated_at,
+            ))
+    DocumentIndex.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notice', '0001_initial'),
+        ('web', '0005_student_result'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('notice', 'Notice'), ('web_notice', 'General Notice'), ('result', 'Result'), ('admission', 'Admission'), ('book', 'Book'), ('syllabus', 'Syllabus'), ('routine', 'Routine')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('category', models.CharField(blank=True, help_text='Routine category or general notice type', max_length=20)),
+                ('file', models.CharField(help_text='Storage name of the file', max_length=255)),
+                ('size', models.BigIntegerField(default=0)),
+                ('mime_type', models.CharField(max_length=100)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('class_name', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='web.class')),
+                ('department', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='web.department')),
+                ('notice_type', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='notice.noticetype')),
+            ],
+            options={
+                'verbose_name': 'Document Index Entry',
+                'verbose_name_plural': 'Document Index',
+                'indexes': [models.Index(condition=models.Q(('is_active', True)), fields=['-updated_at'], name='document_active_idx'), models.Index(condition=models.Q(('is_active', True)), fields=['kind', '-updated_at'], name='document_kind_idx'), models.Index(condition=models.Q(('is_active', True)), fields=['class_name', '-updated_at'], name='document_class_idx'), models.Index(condition=models.Q(('is_active', True)), fields=['department', '-updated_at'], name='document_department_idx'), models.Index(condition=models.Q(('is_active', True)), fields=['notice_type', '-updated_at'], name='document_notice_type_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_document_index')],
+            },
+        ),
+        migrations.RunPython(build_document_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-19 19:09
+
+from django.db import migrations, models
+
+
+def drop_duplicate_rolls(apps, schema_editor):
+    # Keep the most recently updated row of each (result, roll) that has no class.
+    StudentResult = apps.get_model('web', 'StudentResult')
+    seen = set()
+    duplicates = []
+    rows = StudentResult.objects.filter(class_name__isnull=True).order_by('-updated_at', '-pk')
+    for pk, result_id, roll_number in rows.values_list('pk', 'result_id', 'roll_number'):
+        if (result_id, roll_number) in seen:
+            duplicates.append(pk)
+        seen.add((result_id, roll_number))
+    StudentResult.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0007_change_log'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_rolls, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='studentresult',
+            constraint=models.UniqueConstraint(condition=models.Q(('class_name__isnull', True)), fields=('result', 'roll_number'), name='unique_student_result_roll_without_class'),
+        ),
+    ]
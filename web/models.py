@@ -138,6 +138,9 @@ class FacultyMember(TimeStampModel):
     email = models.EmailField(blank=True, verbose_name='Email')
     phone = models.CharField(max_length=20, blank=True, verbose_name='Phone')
     photo = models.ImageField(upload_to='faculty_photos/', blank=True, verbose_name='Photo')
+    photo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    photo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    photo_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blur-up preview (data URI), filled in on save.")
     is_active = models.BooleanField(default=True, verbose_name='Active')
     order = models.IntegerField(default=0, verbose_name='Order')
 
@@ -216,6 +219,9 @@ class Notice(TimeStampModel):
 
 class Slider(models.Model):
     image = models.ImageField(upload_to='sliders/')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blur-up preview (data URI), filled in on save.")
     title = models.CharField(max_length=200, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
@@ -367,6 +373,40 @@ class Result(TimeStampModel):
         return self.title
 
 
+class StudentResult(TimeStampModel):
+    """One student's marks in one exam (Result), imported from a marks sheet"""
+    result = models.ForeignKey(Result, on_delete=models.CASCADE, related_name='student_results', verbose_name='পরীক্ষা')
+    class_name = models.ForeignKey(Class, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='শ্রেণি')
+    roll_number = models.CharField(max_length=20, verbose_name='রোল নম্বর', help_text="Stored normalised: ASCII digits, no leading zeros.")
+    student_name = models.CharField(max_length=100, blank=True, verbose_name='শিক্ষার্থীর নাম')
+    registration_number = models.CharField(max_length=20, blank=True, verbose_name='রেজিস্ট্রেশন নম্বর')
+    marks = models.JSONField(default=dict, blank=True, verbose_name='বিষয়ভিত্তিক নম্বর', help_text='{"বাংলা": 78, "English": "A+", ...}')
+    total = models.CharField(max_length=20, blank=True, verbose_name='মোট নম্বর')
+    gpa = models.CharField(max_length=10, blank=True, verbose_name='জিপিএ')
+    grade = models.CharField(max_length=10, blank=True, verbose_name='গ্রেড')
+    remarks = models.CharField(max_length=50, blank=True, verbose_name='মন্তব্য')
+
+    class Meta:
+        verbose_name = 'শিক্ষার্থীর ফলাফল'
+        verbose_name_plural = 'শিক্ষার্থীদের ফলাফল'
+        constraints = [
+            models.UniqueConstraint(fields=['result', 'class_name', 'roll_number'], name='unique_student_result_roll'),
+            # NULLs never compare equal, so rows without a class need their own constraint.
+            models.UniqueConstraint(
+                fields=['result', 'roll_number'], condition=models.Q(class_name__isnull=True),
+                name='unique_student_result_roll_without_class',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        from .lookup import normalize_number
+        self.roll_number = normalize_number(self.roll_number)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.result} - {self.roll_number}"
+
+
 class Admission(TimeStampModel):
     title = models.CharField(max_length=255, verbose_name='ভর্তির শিরোনাম')
     file = models.FileField(
@@ -397,6 +437,9 @@ class Gallery(TimeStampModel):
 
     title = models.CharField(max_length=100)
     image = models.ImageField(upload_to='gallery/')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blur-up preview (data URI), filled in on save.")
     category = models.CharField(max_length=20, choices=CATEGORIES)
     description = models.TextField(blank=True)
     is_slider = models.BooleanField(default=False)
@@ -779,6 +822,9 @@ class EventAndNews(models.Model):
 
     title = models.CharField(max_length=200, verbose_name='শিরোনাম')
     primary_image = models.ImageField(upload_to='event_news_primary/', blank=True, null=True, verbose_name='প্রধান ছবি')
+    primary_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    primary_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    primary_image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blur-up preview (data URI), filled in on save.")
     description = models.TextField(verbose_name='বিবরণ')
     created_at = models.DateTimeField(auto_now_add=True)
     status = models.BooleanField(default=True, verbose_name='সক্রিয়')
@@ -806,6 +852,9 @@ class EventAndNewsImage(models.Model):
     """Gallery images for EventAndNews"""
     event_news = models.ForeignKey(EventAndNews, on_delete=models.CASCADE, related_name='gallery_images', verbose_name='ইভেন্ট ও সংবাদ')
     image = models.ImageField(upload_to='event_news_gallery/', verbose_name='ছবি')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blur-up preview (data URI), filled in on save.")
     title = models.CharField(max_length=200, blank=True, verbose_name='ছবির শিরোনাম')
     description = models.TextField(blank=True, verbose_name='ছবির বিবরণ')
     order = models.IntegerField(default=0, verbose_name='ক্রম')
@@ -832,4 +881,114 @@ class EventAndNewsImage(models.Model):
 #         verbose_name_plural = 'গুরুত্বপূর্ণ লিঙ্কসমূহ'
 
 #     def __str__(self):
-#         return self.title
\ No newline at end of file
+#         return self.title
+
+class MediaBlob(models.Model):
+    """One stored file per unique upload content (see web.storage.ContentAddressedStorage)"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True, help_text="Storage name under MEDIA_ROOT")
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0, help_text="Number of file fields pointing at this blob")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Media Blob'
+        verbose_name_plural = 'Media Blobs'
+        indexes = [models.Index(fields=['ref_count', 'updated_at'])]
+
+    def __str__(self):
+        return self.name
+
+
+class StudentLookup(models.Model):
+    """Normalised prefix keys for student typeahead and roll lookups (see web.lookup)"""
+    KIND_CHOICES = (
+        ('name', 'Name'),
+        ('roll', 'Roll'),
+        ('registration', 'Registration'),
+    )
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='lookup_keys')
+    class_name = models.ForeignKey(Class, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES)
+    key = models.CharField(max_length=100)
+
+    class Meta:
+        verbose_name = 'Student Lookup Key'
+        verbose_name_plural = 'Student Lookup Keys'
+        indexes = [
+            models.Index(fields=['kind', 'key']),
+            models.Index(fields=['class_name', 'kind', 'key']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.key}"
+
+
+class DocumentIndex(models.Model):
+    """One row per file across the document models, kept in step by signals (see web.document_index)"""
+    KIND_CHOICES = (
+        ('notice', 'Notice'),
+        ('web_notice', 'General Notice'),
+        ('result', 'Result'),
+        ('admission', 'Admission'),
+        ('book', 'Book'),
+        ('syllabus', 'Syllabus'),
+        ('routine', 'Routine'),
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    category = models.CharField(max_length=20, blank=True, help_text="Routine category or general notice type")
+    # The composite indexes below start with these columns, so no separate FK indexes.
+    class_name = models.ForeignKey(Class, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', db_index=False)
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', db_index=False)
+    notice_type = models.ForeignKey('notice.NoticeType', on_delete=models.SET_NULL, null=True, blank=True, related_name='+', db_index=False)
+    file = models.CharField(max_length=255, help_text="Storage name of the file")
+    size = models.BigIntegerField(default=0)
+    mime_type = models.CharField(max_length=100)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Document Index Entry'
+        verbose_name_plural = 'Document Index'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_document_index'),
+        ]
+        # Partial indexes: feeds and counts only read active rows, and SQLite
+        # uses an index on is_active for Django's bare "WHERE is_active" only
+        # through a matching index condition.
+        indexes = [
+            models.Index(fields=['-updated_at'], condition=models.Q(is_active=True), name='document_active_idx'),
+            models.Index(fields=['kind', '-updated_at'], condition=models.Q(is_active=True), name='document_kind_idx'),
+            models.Index(fields=['class_name', '-updated_at'], condition=models.Q(is_active=True), name='document_class_idx'),
+            models.Index(fields=['department', '-updated_at'], condition=models.Q(is_active=True), name='document_department_idx'),
+            models.Index(fields=['notice_type', '-updated_at'], condition=models.Q(is_active=True), name='document_notice_type_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+
+class ChangeLog(models.Model):
+    """Append-only log of changes to public content; the id is the /api/updates/ cursor (see web.changelog)"""
+    ACTION_CHOICES = (
+        ('published', 'Published'),
+        ('updated', 'Updated'),
+        ('removed', 'Removed'),
+    )
+    kind = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    title = models.CharField(max_length=255, blank=True)
+    url = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = 'Change Log Entry'
+        verbose_name_plural = 'Change Log'
+
+    def __str__(self):
+        return f"{self.action} {self.kind}: {self.title}"
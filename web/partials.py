@@ -0,0 +1,51 @@
+# web/partials.py
+
+import hashlib
+from functools import wraps
+
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.safestring import mark_safe
+from .singleflight import get_or_compute
+from .versions import get_versions
+
+
+FRAGMENT_TTL = 300
+
+
+class Fragment:
+    """
+    The region of a filter page that changes with the filter (the list and
+    its counts). Its HTML depends only on the query string, so it is cached
+    per query string and replaced when a model in `depends_on` changes (see
+    web.versions).
+
+    The page includes html() in its first render, and its filter buttons
+    fetch the same URL with htmx; partial() answers those requests with the
+    fragment alone.
+    """
+
+    def __init__(self, name, render, depends_on, ttl=FRAGMENT_TTL):
+        self.name = name
+        self.render = render  # request -> HTML string
+        self.depends_on = depends_on
+        self.ttl = ttl
+
+    def html(self, request):
+        query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+        return mark_safe(get_or_compute(
+            f'fragment:{self.name}:{query}', lambda: self.render(request), self.ttl,
+            version=get_versions(*self.depends_on),
+        ))
+
+    def partial(self, view_func):
+        """View decorator: requests sent by htmx get only the fragment."""
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.headers.get('HX-Request') == 'true' and 'HX-History-Restore-Request' not in request.headers:
+                response = HttpResponse(self.html(request))
+            else:
+                response = view_func(request, *args, **kwargs)
+            patch_vary_headers(response, ('HX-Request',))
+            return response
+        return wrapper
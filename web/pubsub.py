@@ -0,0 +1,158 @@
+# web/pubsub.py
+
+"""
+In-process fan-out of change log rows (web.changelog) to the event streams
+in web/async_views.py.
+
+Each process runs one poller task on its event loop, and only while some
+client is connected. It reads new ChangeLog rows every
+EVENT_STREAM_POLL_INTERVAL seconds, or right away when this process has
+just written one (notify(), called from web.signals), so the database sees
+one query per process per interval however many clients are listening.
+
+Subscribers are not sent anything individually. A batch is published by
+setting the current asyncio.Event and replacing it, which wakes every
+waiting stream at once. Each stream then reads the rows after its own
+cursor from a shared ring buffer; one that has fallen behind the buffer
+reads them from the database instead. An idle connection therefore costs
+a suspended coroutine and nothing per broadcast beyond its wake-up, and
+streams at the same cursor share one encoded event (encoded()).
+"""
+
+import asyncio
+import logging
+from collections import deque
+
+from django.conf import settings
+from .changelog import UPDATES_LIMIT, alatest_cursor, changes_since
+
+
+BUFFER_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeFeed:
+    def __init__(self, buffer_size=BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.loop = None
+        self.subscribers = 0
+
+    def _bind(self):
+        # Everything below belongs to one event loop (one per process under
+        # uvicorn; tests and load tests may run several in turn).
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            self.loop = loop
+            self.rows = deque()         # ChangeLog rows in id order
+            self.floor = None           # the buffer holds every row with floor < id <= cursor
+            self.cursor = None
+            self.changed = asyncio.Event()
+            self.wake = asyncio.Event()
+            self.starting = None
+            self.task = None
+            self.cache = {}
+
+    @property
+    def interval(self):
+        return getattr(settings, 'EVENT_STREAM_POLL_INTERVAL', 1)
+
+    async def _start(self):
+        self._bind()
+        if self.cursor is None:
+            # Streams opened together share the one query for the start cursor.
+            if self.starting is None:
+                self.starting = self.loop.create_task(alatest_cursor())
+            cursor = await self.starting
+            if self.cursor is None:
+                self.cursor = self.floor = cursor
+        if self.task is None or self.task.done():
+            self.task = self.loop.create_task(self._run())
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self.wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("Error polling the change log")
+
+    async def poll(self):
+        """Read rows after the cursor into the buffer and wake the streams if there were any."""
+        found = False
+        while True:
+            rows = [row async for row in changes_since(self.cursor)]
+            for row in rows[:UPDATES_LIMIT]:
+                self.rows.append(row)
+                self.cursor = row['id']
+                found = True
+            while len(self.rows) > self.buffer_size:
+                self.floor = self.rows.popleft()['id']
+            if len(rows) <= UPDATES_LIMIT:
+                break
+        if found:
+            self.cache.clear()
+            changed, self.changed = self.changed, asyncio.Event()
+            changed.set()
+
+    def notify(self):
+        """Poll now instead of at the next interval; safe to call from any thread."""
+        loop = self.loop
+        if loop is not None and not loop.is_closed() and self.subscribers:
+            try:
+                loop.call_soon_threadsafe(self.wake.set)
+            except RuntimeError:  # the loop closed in between
+                pass
+
+    def rows_after(self, cursor):
+        """Buffered rows after cursor (at most UPDATES_LIMIT), or None if the buffer no longer reaches back that far."""
+        if cursor < self.floor:
+            return None
+        rows = []
+        for row in reversed(self.rows):
+            if row['id'] <= cursor:
+                break
+            rows.append(row)
+        rows.reverse()
+        return rows[:UPDATES_LIMIT]
+
+    async def listen(self, cursor, keepalive):
+        """
+        Async generator of (cursor, rows) batches after `cursor`, where the
+        cursor is the one the batch starts after. Yields (cursor, []) after
+        `keepalive` seconds without changes. A cursor of None starts from
+        the latest row.
+        """
+        self.subscribers += 1
+        try:
+            await self._start()
+            if cursor is None:
+                cursor = self.cursor
+            while True:
+                if cursor < self.cursor:
+                    rows = self.rows_after(cursor)
+                    if rows is None:
+                        rows = [row async for row in changes_since(cursor)][:UPDATES_LIMIT]
+                    if rows:
+                        yield cursor, rows
+                        cursor = rows[-1]['id']
+                        continue
+                try:
+                    await asyncio.wait_for(self.changed.wait(), keepalive)
+                except asyncio.TimeoutError:
+                    yield cursor, []
+        finally:
+            self.subscribers -= 1
+
+    def encoded(self, key, encode):
+        """encode() once per key until the next batch, for streams that send the same event."""
+        if key not in self.cache:
+            self.cache[key] = encode()
+        return self.cache[key]
+
+
+feed = ChangeFeed()
@@ -0,0 +1,128 @@
+# web/responses.py
+
+"""
+Async file streaming for the ASGI download views (see web/async_views.py).
+
+Files are read one chunk at a time, and the next chunk is only read after
+the server has sent the previous one. Under uvicorn, send() waits while the
+client's socket buffer is full, so a slow reader slows the file reads down
+too and each download holds at most one chunk in memory. The chunk size is
+settings.FILE_STREAM_CHUNK_SIZE (64 KiB by default).
+"""
+
+import asyncio
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+try:
+    import aiofiles
+except ImportError:  # Without aiofiles, each read runs in the default thread pool.
+    aiofiles = None
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class ThreadedFile:
+    """The part of the aiofiles file interface used here, for a plain file."""
+
+    def __init__(self, file):
+        self.file = file
+
+    async def seek(self, offset):
+        return await asyncio.to_thread(self.file.seek, offset)
+
+    async def read(self, size):
+        return await asyncio.to_thread(self.file.read, size)
+
+    async def close(self):
+        self.file.close()
+
+
+async def open_file(path):
+    if aiofiles is not None:
+        return await aiofiles.open(path, 'rb')
+    return ThreadedFile(await asyncio.to_thread(open, path, 'rb'))
+
+
+async def read_range(path, start, length, chunk_size):
+    """Yields `length` bytes of the file from offset `start`."""
+    file = await open_file(path)
+    try:
+        await file.seek(start)
+        while length > 0:
+            chunk = await file.read(min(chunk_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        await file.close()
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single "bytes=" range, end inclusive, or None when the
+    header is absent or not one we serve (multiple ranges), in which case the
+    whole file is sent. start >= size means the range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # "bytes=-500" is the last 500 bytes.
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    return start, end
+
+
+async def stream_file(request, path, filename=None, as_attachment=False, content_type=None):
+    """
+    A StreamingHttpResponse with an async iterator over the file at `path`.
+
+    Answers a single byte range with 206 Partial Content (PDF viewers and
+    download managers resume this way), unless If-Range names an older
+    version of the file; an unsatisfiable range gets 416. Raises
+    FileNotFoundError if the file is missing.
+    """
+    stat = await asyncio.to_thread(os.stat, path)
+    size = stat.st_size
+    last_modified = http_date(stat.st_mtime)
+
+    byte_range = None
+    if request.method in ('GET', 'HEAD') and 'Range' in request.headers:
+        if_range = request.headers.get('If-Range')
+        if if_range is None or parse_http_date_safe(if_range) == int(stat.st_mtime):
+            byte_range = parse_range(request.headers['Range'], size)
+    if byte_range is not None and byte_range[0] >= size:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    start, end = byte_range or (0, size - 1)
+    chunk_size = getattr(settings, 'FILE_STREAM_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    content_type = content_type or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    response = StreamingHttpResponse(
+        read_range(path, start, end - start + 1, chunk_size),
+        status=206 if byte_range else 200,
+        content_type=content_type,
+    )
+    response['Content-Length'] = str(end - start + 1)
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = last_modified
+    response['Content-Disposition'] = content_disposition_header(
+        as_attachment, filename or os.path.basename(path)
+    )
+    return response
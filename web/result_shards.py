@@ -0,0 +1,212 @@
+# web/result_shards.py
+
+"""
+Pre-rendered per-student result files for result-publication day.
+
+Publishing a Result writes one small JSON file per StudentResult under
+
+    MEDIA_ROOT/result-shards/<result id>/<generation>/<ab>/<key>.json
+
+where key = sha256("<class id>:<roll number>"), and points the
+`current` symlink of that result at the new generation. The web server
+can then answer roll-number lookups from disk, e.g. with nginx:
+
+    location /media/result-shards/ { expires 5m; try_files $uri =404; }
+
+Older generations are kept for rollback; `current` is swapped atomically.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+from .lookup import normalize_number
+from .models import Result
+from .versions import bump_model_version
+
+
+SHARD_DIR = 'result-shards'
+CURRENT = 'current'
+MANIFEST = 'manifest.json'
+KEEP_GENERATIONS = 3
+
+
+class ShardError(Exception):
+    pass
+
+
+def shard_key(class_id, roll_number):
+    return hashlib.sha256(f"{class_id or ''}:{normalize_number(roll_number)}".encode()).hexdigest()
+
+
+def result_dir(result_id):
+    return Path(settings.MEDIA_ROOT) / SHARD_DIR / str(result_id)
+
+
+def shard_url(result_id):
+    """URL prefix of the published shards, or None if the result is not published."""
+    if not (result_dir(result_id) / CURRENT).is_dir():
+        return None
+    return f"{settings.MEDIA_URL}{SHARD_DIR}/{result_id}/{CURRENT}/"
+
+
+def student_result_data(student_result):
+    """The JSON payload for one student's result (also used by the lookup view)."""
+    return {
+        'exam': student_result.result.title,
+        'class_name': student_result.class_name.name if student_result.class_name else '',
+        'roll': student_result.roll_number,
+        'name': student_result.student_name,
+        'registration': student_result.registration_number,
+        'marks': student_result.marks,
+        'total': student_result.total,
+        'gpa': student_result.gpa,
+        'grade': student_result.grade,
+        'remarks': student_result.remarks,
+    }
+
+
+def render_shard(student_result):
+    return json.dumps({
+        'found': True,
+        'result': student_result_data(student_result),
+        'html': render_to_string('component/results/student_result.html', {'student_result': student_result}),
+    }, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def generations(result_id):
+    """Published generation names, oldest first."""
+    root = result_dir(result_id)
+    if not root.is_dir():
+        return []
+    return sorted(path.name for path in root.iterdir() if path.is_dir() and not path.is_symlink())
+
+
+def current_generation(result_id):
+    link = result_dir(result_id) / CURRENT
+    return os.readlink(link) if link.is_symlink() else None
+
+
+def _point_current(result_id, generation):
+    root = result_dir(result_id)
+    temporary = root / f'.{CURRENT}-{generation}'
+    if temporary.is_symlink():
+        temporary.unlink()
+    os.symlink(generation, temporary, target_is_directory=True)
+    os.replace(temporary, root / CURRENT)
+    _mark_changed(result_id)
+
+
+def _mark_changed(result_id):
+    # filter_results exposes shard_url: change its ETag and cached copy.
+    Result.objects.filter(pk=result_id).update(updated_at=timezone.now())
+    bump_model_version(Result)
+
+
+def publish(result, keep=KEEP_GENERATIONS):
+    """
+    Write every student's shard into a new generation, switch `current` to
+    it and prune all but the newest `keep` generations. Returns (generation, count).
+    """
+    if not result.is_active:
+        raise ShardError(f"'{result}' is not active.")
+    root = result_dir(result.pk)
+    generation = timezone.now().strftime('%Y%m%d%H%M%S%f')
+    staging = root / f'.staging-{generation}'
+    files = {}
+    student_results = result.student_results.select_related('result', 'class_name')
+    for student_result in student_results.iterator():
+        key = shard_key(student_result.class_name_id, student_result.roll_number)
+        content = render_shard(student_result)
+        path = staging / key[:2] / f'{key}.json'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        files[key] = hashlib.sha256(content).hexdigest()
+    if not files:
+        raise ShardError(f"'{result}' has no student results to publish.")
+
+    manifest = {'result': result.pk, 'generation': generation, 'created_at': timezone.now().isoformat(), 'files': files}
+    (staging / MANIFEST).write_text(json.dumps(manifest))
+    os.rename(staging, root / generation)
+    _point_current(result.pk, generation)
+
+    for old in generations(result.pk)[:-keep]:
+        if old != generation:
+            shutil.rmtree(root / old)
+    return generation, len(files)
+
+
+def verify(result):
+    """
+    Problems with the published shards of a result, as a list of strings:
+    missing or corrupted files, and students whose rows changed or were
+    added/removed since publishing. An empty list means all is well.
+    """
+    generation = current_generation(result.pk)
+    if generation is None:
+        return ['not published']
+    directory = result_dir(result.pk) / generation
+    try:
+        manifest = json.loads((directory / MANIFEST).read_text())
+    except (OSError, ValueError) as e:
+        return [f'{generation}: unreadable manifest ({e})']
+
+    problems = []
+    for key, digest in manifest['files'].items():
+        path = directory / key[:2] / f'{key}.json'
+        if not path.is_file():
+            problems.append(f'{generation}: missing {path.name}')
+        elif hashlib.sha256(path.read_bytes()).hexdigest() != digest:
+            problems.append(f'{generation}: corrupted {path.name}')
+
+    expected = {}
+    for student_result in result.student_results.select_related('result', 'class_name').iterator():
+        key = shard_key(student_result.class_name_id, student_result.roll_number)
+        expected[key] = hashlib.sha256(render_shard(student_result)).hexdigest()
+    for key in expected.keys() - manifest['files'].keys():
+        problems.append(f'{generation}: not published {key}')
+    for key in manifest['files'].keys() - expected.keys():
+        problems.append(f'{generation}: no longer in the database {key}')
+    for key in expected.keys() & manifest['files'].keys():
+        if expected[key] != manifest['files'][key]:
+            problems.append(f'{generation}: out of date {key}')
+    return problems
+
+
+def unpublish(result_id):
+    """
+    Stop serving a result's shards by removing its `current` link. The
+    generations are kept, so publishing again or rolling back still works.
+    Returns whether anything was being served.
+    """
+    link = result_dir(result_id) / CURRENT
+    if not link.is_symlink():
+        return False
+    link.unlink()
+    _mark_changed(result_id)
+    return True
+
+
+def rollback(result):
+    """
+    Point `current` back at the previous generation, or unpublish if there
+    is none. The rolled-back generation is deleted. Returns the generation
+    now being served, or None.
+    """
+    root = result_dir(result.pk)
+    generation = current_generation(result.pk)
+    if generation is None:
+        raise ShardError(f"'{result}' is not published.")
+    older = [name for name in generations(result.pk) if name < generation]
+    if older:
+        _point_current(result.pk, older[-1])
+    else:
+        (root / CURRENT).unlink()
+        _mark_changed(result.pk)
+    shutil.rmtree(root / generation, ignore_errors=True)
+    return older[-1] if older else None
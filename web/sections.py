@@ -0,0 +1,43 @@
+# web/sections.py
+
+import logging
+
+from .singleflight import get_or_compute
+from .versions import get_versions
+
+
+SECTION_TTL = 3600
+
+logger = logging.getLogger(__name__)
+
+
+class Section:
+    """
+    One independently cached part of a page's context. load() returns plain
+    data (lists, dicts, model instances with their relations loaded) that is
+    cached until a model in `depends_on` changes (see web.versions).
+
+    If loading fails, get() logs the error and returns `default`, so only
+    this section falls back and the rest of the page renders normally.
+    """
+
+    def __init__(self, name, load, depends_on, default=None, ttl=SECTION_TTL):
+        self.name = name
+        self.load = load
+        self.depends_on = depends_on
+        self.default = default
+        self.ttl = ttl
+
+    def get(self):
+        try:
+            return get_or_compute(
+                f'section:{self.name}', self.load, self.ttl, version=get_versions(*self.depends_on),
+            )
+        except Exception:
+            logger.exception("Error loading section %s", self.name)
+            return self.default
+
+
+def load_sections(sections):
+    """{section name: data} for a list of sections."""
+    return {section.name: section.get() for section in sections}
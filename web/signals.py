@@ -1,3 +1,168 @@
+# web/signals.py
+
+import shutil
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from search.registry import spec_for_model
+from .changelog import record_delete, record_save, was_visible
+from .document_index import index_document, remove_document, source_for_model
+from .images import IMAGE_METADATA_FIELDS, apply_image_metadata, needs_image_metadata
+from .lookup import index_student
+from .models import ChangeLog, Result, Student
+from .pubsub import feed
+from .result_shards import current_generation, result_dir, unpublish
+from .versions import CONTENT_APPS, bump_model_version
+from .storage import file_field_names, is_blob_name
+
+
+@receiver(pre_save)
+def store_image_metadata(sender, instance, raw=False, **kwargs):
+    """
+    Store width, height and a blur-up placeholder once when an image is saved,
+    so templates and JSON endpoints never have to open the file at render time.
+    """
+    if raw or sender._meta.app_label != 'web':
+        return
+    field_name = IMAGE_METADATA_FIELDS.get(sender.__name__)
+    if field_name and needs_image_metadata(instance, field_name):
+        apply_image_metadata(instance, field_name)
+
+
+def _retain_blobs(names):
+    if hasattr(default_storage, 'retain'):
+        for name in names:
+            transaction.on_commit(lambda name=name: default_storage.retain(name))
+
+
+def _release_blobs(names):
+    if hasattr(default_storage, 'release'):
+        for name in names:
+            transaction.on_commit(lambda name=name: default_storage.release(name))
+
+
+@receiver(pre_save)
+def release_replaced_files(sender, instance, raw=False, **kwargs):
+    """Drop the blob reference of a file that is being replaced or cleared."""
+    if raw or instance._state.adding or sender._meta.app_label not in CONTENT_APPS:
+        return
+    fields = file_field_names(sender)
+    if not fields:
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).values_list(*fields).first()
+    if previous:
+        instance._stored_files = dict(zip(fields, previous))
+        _release_blobs(
+            old for field, old in zip(fields, previous)
+            if is_blob_name(old) and old != getattr(instance, field).name
+        )
+
+
+@receiver(post_save)
+def retain_saved_files(sender, instance, raw=False, **kwargs):
+    """Count the blob reference of a file this save stored, once the row is committed."""
+    if raw or sender._meta.app_label not in CONTENT_APPS:
+        return
+    stored = getattr(instance, '_stored_files', {})
+    _retain_blobs(
+        getattr(instance, field).name for field in file_field_names(sender)
+        if is_blob_name(getattr(instance, field).name) and getattr(instance, field).name != stored.get(field)
+    )
+
+
+@receiver(post_delete)
+def release_deleted_files(sender, instance, **kwargs):
+    """Drop the blob references held by a deleted row."""
+    if sender._meta.app_label not in CONTENT_APPS:
+        return
+    _release_blobs(
+        getattr(instance, field).name for field in file_field_names(sender)
+        if is_blob_name(getattr(instance, field).name)
+    )
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_content_version(sender, **kwargs):
+    """Invalidate cached pages/fragments that depend on this model (see web.versions)."""
+    if sender._meta.app_label in CONTENT_APPS:
+        bump_model_version(sender)
+
+
+@receiver(m2m_changed)
+def bump_m2m_version(sender, instance, action, model, **kwargs):
+    """Adding or removing related rows changes both sides of the relation."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    for changed in (type(instance), model):
+        if changed._meta.app_label in CONTENT_APPS:
+            bump_model_version(changed)
+
+
+@receiver(post_save, sender=Student)
+def update_student_lookup(sender, instance, raw=False, **kwargs):
+    """Keep the typeahead/roll lookup keys in step with the student row."""
+    if not raw:
+        index_student(instance)
+
+
+@receiver(post_save)
+def update_document_index(sender, instance, raw=False, **kwargs):
+    """Keep the cross-type DocumentIndex row in step with the document."""
+    if not raw and source_for_model(sender) is not None:
+        index_document(instance)
+
+
+@receiver(post_delete)
+def delete_document_index(sender, instance, **kwargs):
+    if source_for_model(sender) is not None:
+        remove_document(sender, instance.pk)
+
+
+@receiver(pre_save)
+def remember_visibility(sender, instance, raw=False, **kwargs):
+    """Whether the stored row is public, so post_save can tell a publish from an edit."""
+    spec = None if raw else spec_for_model(sender)
+    if spec is not None and not instance._state.adding:
+        instance._was_visible = was_visible(spec, instance)
+
+
+@receiver(post_save)
+def log_content_change(sender, instance, created, raw=False, **kwargs):
+    """Append to the /api/updates/ change log (see web.changelog)."""
+    if not raw and spec_for_model(sender) is not None:
+        record_save(instance, created, getattr(instance, '_was_visible', False))
+
+
+@receiver(post_delete)
+def log_content_delete(sender, instance, **kwargs):
+    if spec_for_model(sender) is not None:
+        record_delete(instance)
+
+
+@receiver(post_save, sender=ChangeLog)
+def wake_change_feed(sender, instance, created, **kwargs):
+    """Event streams in this process pick the change up now rather than at their next poll."""
+    if created:
+        feed.notify()
+
+
+@receiver(post_save, sender=Result)
+def unpublish_inactive_result(sender, instance, raw=False, **kwargs):
+    """A deactivated result must stop being served as static files, like lookup_result stops serving it."""
+    if not raw and not instance.is_active and current_generation(instance.pk) is not None:
+        transaction.on_commit(lambda: unpublish(instance.pk))
+
+
+@receiver(post_delete, sender=Result)
+def remove_result_shards(sender, instance, **kwargs):
+    """Published per-student files must not outlive their result."""
+    path = result_dir(instance.pk)
+    transaction.on_commit(lambda: shutil.rmtree(path, ignore_errors=True))
+
+
 # Temporarily disabled signals since we're handling foreign key updates directly in admin
 # from django.db.models.signals import pre_delete
 # from django.dispatch import receiver
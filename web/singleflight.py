@@ -0,0 +1,185 @@
+# web/singleflight.py
+
+import asyncio
+import hashlib
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from .cache_backends import can_lock
+from .versions import aget_versions, get_versions
+
+
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 3
+POLL_INTERVAL = 0.05
+CONDITIONAL_HEADERS = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE')
+
+
+def get_or_compute(key, compute, ttl=60, stale_ttl=300, version=None, should_cache=None):
+    """
+    Cached value for key, recomputed by at most one worker at a time.
+
+    A fresh entry (younger than ttl, same version) is returned as is. When
+    it is missing or stale, the worker that gets the cache lock recomputes;
+    the others get the stale value if there is one (kept for stale_ttl after
+    going stale), or wait up to WAIT_TIMEOUT for the new one before giving
+    up and computing it themselves. All of this needs a lock that only one
+    worker can take; with a shared cache that has none (see can_lock() and
+    the web.W001 check) every miss computes.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry[1] > time.time() and entry[2] == version:
+        return entry[0]
+
+    if not can_lock():
+        value = compute()
+        if should_cache is None or should_cache(value):
+            cache.set(key, (value, time.time() + ttl, version), ttl + stale_ttl)
+        return value
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = compute()
+            if should_cache is None or should_cache(value):
+                cache.set(key, (value, time.time() + ttl, version), ttl + stale_ttl)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        return entry[0]
+    deadline = time.time() + WAIT_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry[2] == version:
+            return entry[0]
+    return compute()
+
+
+async def aget_or_compute(key, compute, ttl=60, stale_ttl=300, version=None, should_cache=None):
+    """Async get_or_compute(); compute is a coroutine function."""
+    entry = await cache.aget(key)
+    if entry is not None and entry[1] > time.time() and entry[2] == version:
+        return entry[0]
+
+    if not can_lock():
+        value = await compute()
+        if should_cache is None or should_cache(value):
+            await cache.aset(key, (value, time.time() + ttl, version), ttl + stale_ttl)
+        return value
+
+    lock_key = f'{key}:lock'
+    if await cache.aadd(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = await compute()
+            if should_cache is None or should_cache(value):
+                await cache.aset(key, (value, time.time() + ttl, version), ttl + stale_ttl)
+            return value
+        finally:
+            await cache.adelete(lock_key)
+
+    if entry is not None:
+        return entry[0]
+    deadline = time.time() + WAIT_TIMEOUT
+    while time.time() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        entry = await cache.aget(key)
+        if entry is not None and entry[2] == version:
+            return entry[0]
+    return await compute()
+
+
+@contextmanager
+def _without_conditional_headers(request):
+    conditional = {header: request.META.pop(header) for header in CONDITIONAL_HEADERS if header in request.META}
+    try:
+        yield
+    finally:
+        request.META.update(conditional)
+
+
+def _cache_key(view_func, request):
+    # Keyed on the host too: some responses hold absolute URLs.
+    path = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'singleflight:{view_func.__module__}.{view_func.__name__}:{path}'
+
+
+def _rendered(response):
+    if hasattr(response, 'render') and not response.is_rendered:
+        response.render()
+    return response
+
+
+def _should_cache(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    )
+
+
+def _answer(request, response):
+    if response.status_code != 200:
+        return response
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+        response=response,
+    )
+
+
+def single_flight(ttl=60, stale_ttl=300, depends_on=('web', 'notice')):
+    """
+    View decorator: caches GET responses per URL and coalesces concurrent
+    misses with get_or_compute. The cache entry is replaced as soon as the
+    version of any content group in `depends_on` changes (see web.versions).
+
+    Put it outermost: the view runs without If-None-Match/If-Modified-Since
+    and those are answered here against the shared response, so a cache hit
+    can still be a 304. Async views are cached with aget_or_compute.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view_func(request, *args, **kwargs)
+
+                async def compute():
+                    with _without_conditional_headers(request):
+                        response = await view_func(request, *args, **kwargs)
+                    return _rendered(response)
+
+                response = await aget_or_compute(
+                    _cache_key(view_func, request), compute, ttl, stale_ttl,
+                    await aget_versions(*depends_on), lambda response: _should_cache(request, response),
+                )
+                return _answer(request, response)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            def compute():
+                with _without_conditional_headers(request):
+                    response = view_func(request, *args, **kwargs)
+                return _rendered(response)
+
+            response = get_or_compute(
+                _cache_key(view_func, request), compute, ttl, stale_ttl,
+                get_versions(*depends_on), lambda response: _should_cache(request, response),
+            )
+            return _answer(request, response)
+        return wrapper
+    return decorator
@@ -0,0 +1,157 @@
+# web/storage.py
+
+import gzip
+import hashlib
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; .gz variants are still written.
+    brotli = None
+
+
+BLOB_PREFIX = 'blobs'
+
+
+def file_field_names(model):
+    """Names of the FileField/ImageField columns on a model."""
+    return [f.name for f in model._meta.concrete_fields if isinstance(f, models.FileField)]
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(BLOB_PREFIX + '/')
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each unique upload exactly once, under a path derived from its
+    SHA-256: blobs/ab/cd/<hash>/<original name>. Uploading the same bytes
+    again (under any upload_to) returns the existing name instead of writing
+    a new copy, and MediaBlob keeps a reference count per hash. References
+    are counted when the row holding the file is committed (web.signals),
+    so a save that fails or rolls back leaves the count alone.
+
+    Blob URLs never change content, so the web server can serve them with
+    "Cache-Control: public, max-age=31536000, immutable", e.g. in nginx:
+
+        location /media/blobs/ { expires max; add_header Cache-Control "public, immutable"; }
+
+    Files saved before this storage was enabled keep their old names and are
+    read and deleted like with FileSystemStorage.
+    """
+
+    # Matches FileField's default max_length; the original name is shortened to fit.
+    max_name_length = 100
+    # 128 bits of the hash in the path is plenty to keep directories unique;
+    # the full digest is what MediaBlob deduplicates on.
+    path_digest_length = 32
+
+    def _save(self, name, content):
+        from .models import MediaBlob
+
+        digest, size = self._digest(content)
+        blob = MediaBlob.objects.filter(sha256=digest).first()
+        if blob is None or not super().exists(blob.name):
+            stored_name = super()._save(self._blob_name(digest, name), content)
+            try:
+                with transaction.atomic():
+                    blob, _ = MediaBlob.objects.update_or_create(
+                        sha256=digest, defaults={'name': stored_name, 'size': size}
+                    )
+            except IntegrityError:
+                # Another worker stored the same content at the same time.
+                blob = MediaBlob.objects.get(sha256=digest)
+        return blob.name
+
+    def delete(self, name):
+        # Blobs may be shared, so only drop the reference; collect_media_blobs
+        # removes files whose count has reached zero.
+        if is_blob_name(name):
+            self.release(name)
+        else:
+            super().delete(name)
+
+    def retain(self, name):
+        """Add one reference to a stored blob."""
+        from .models import MediaBlob
+
+        if is_blob_name(name):
+            MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+
+    def release(self, name):
+        """Drop one reference to a stored blob."""
+        from .models import MediaBlob
+
+        if is_blob_name(name):
+            MediaBlob.objects.filter(name=name, ref_count__gt=0).update(
+                ref_count=F('ref_count') - 1, updated_at=timezone.now()
+            )
+
+    def _digest(self, content):
+        sha = hashlib.sha256()
+        size = 0
+        for chunk in content.chunks():
+            sha.update(chunk)
+            size += len(chunk)
+        return sha.hexdigest(), size
+
+    def _blob_name(self, digest, name):
+        directory = '/'.join((BLOB_PREFIX, digest[:2], digest[2:4], digest[:self.path_digest_length]))
+        stem, ext = os.path.splitext(os.path.basename(name))
+        room = self.max_name_length - len(directory) - len(ext) - 1
+        return f'{directory}/{stem[:max(room, 1)]}{ext}'
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Fingerprints static files (style.abc123def456.css) like
+    ManifestStaticFilesStorage and, at collectstatic time, writes .gz and
+    .br siblings for text assets so they can be served precompressed
+    (see web.middleware.StaticFilesMiddleware).
+    """
+
+    # Fall back to the unhashed name for files missing from the manifest
+    # (e.g. before the first collectstatic) instead of raising at render time.
+    manifest_strict = False
+    compress_extensions = ('.css', '.js', '.mjs', '.svg', '.json', '.txt', '.xml', '.html', '.map', '.ico')
+    min_compress_size = 256
+
+    def stored_name(self, name):
+        # A template referencing a file that was never shipped (e.g. a
+        # placeholder image) should get a 404 for that file, not a 500 for the page.
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(paths) | set(self.hashed_files.values()):
+            if name.endswith(self.compress_extensions):
+                self.precompress(name)
+
+    def precompress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < self.min_compress_size:
+            return
+
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            # Keep a variant only if it saves a meaningful number of bytes.
+            if len(compressed) < len(data) * 0.95:
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
@@ -0,0 +1,125 @@
+# web/taxonomy.py
+
+"""
+Classes, departments, routine types and notice types, kept in memory by
+every process. These tables change a few times a year but are read by
+nearly every listing page and filter.
+
+taxonomy() returns an immutable snapshot. Each call checks the models'
+version counters (one cache round trip, see web.versions) and reloads the
+snapshot when any of them has been bumped, so every worker sees an admin
+edit on its next request.
+"""
+
+import asyncio
+import threading
+from types import MappingProxyType
+
+from asgiref.sync import sync_to_async
+from notice.models import NoticeType
+from .models import Class, Department, RoutineType
+from .versions import aget_versions, get_versions
+
+
+TAXONOMY_MODELS = ('web.Class', 'web.Department', 'web.RoutineType', 'notice.NoticeType')
+SLUG_MAPS = {
+    'department': 'department_id_by_slug',
+    'routine_type': 'routine_type_id_by_slug',
+    'notice_type': 'notice_type_id_by_slug',
+}
+
+
+class Taxonomy:
+    """A read-only snapshot; the model instances in it must not be modified."""
+
+    def __init__(self, classes, departments, routine_types, notice_types):
+        self.classes = tuple(classes)
+        self.departments = tuple(departments)
+        self.routine_types = tuple(routine_types)
+        self.notice_types = tuple(notice_types)
+        self.class_by_id = MappingProxyType({cls.pk: cls for cls in self.classes})
+        self.department_by_id = MappingProxyType({department.pk: department for department in self.departments})
+        self.department_id_by_slug = MappingProxyType({department.slug: department.pk for department in self.departments})
+        self.routine_type_id_by_slug = MappingProxyType({routine_type.slug: routine_type.pk for routine_type in self.routine_types})
+        self.notice_type_by_id = MappingProxyType({notice_type.pk: notice_type for notice_type in self.notice_types})
+        self.notice_type_id_by_slug = MappingProxyType({notice_type.slug: notice_type.pk for notice_type in self.notice_types})
+        self.public_class_ids = frozenset(cls.pk for cls in self.classes if cls.show_students_publicly)
+
+    def get_class(self, class_id):
+        """The Class for an id from a query string ('3' or 3), or None."""
+        try:
+            return self.class_by_id.get(int(class_id))
+        except (TypeError, ValueError):
+            return None
+
+    def get_department(self, slug):
+        """The Department with this slug, or None."""
+        return self.department_by_id.get(self.department_id_by_slug.get(slug))
+
+
+def load_taxonomy():
+    return Taxonomy(
+        Class.objects.order_by('numeric_value'),
+        Department.objects.order_by('pk'),
+        RoutineType.objects.order_by('pk'),
+        NoticeType.objects.order_by('pk'),
+    )
+
+
+_lock = threading.Lock()
+_snapshot = None
+_version = None
+
+
+def _current(version):
+    global _snapshot, _version
+    if _snapshot is None or _version != version:
+        with _lock:
+            if _snapshot is None or _version != version:
+                # The version is read before loading, so a bump during the
+                # load makes the next call reload again.
+                _snapshot = load_taxonomy()
+                _version = version
+    return _snapshot
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def taxonomy():
+    """
+    The current snapshot. Inside an event loop, where it cannot query, it
+    returns None instead of reloading; async code should use ataxonomy().
+    """
+    version = get_versions(*TAXONOMY_MODELS)
+    if _in_event_loop() and (_snapshot is None or _version != version):
+        return None
+    return _current(version)
+
+
+async def ataxonomy():
+    """Async taxonomy(); only a reload touches the database."""
+    version = await aget_versions(*TAXONOMY_MODELS)
+    if _snapshot is not None and _version == version:
+        return _snapshot
+    return await sync_to_async(_current)(version)
+
+
+def filter_by_slug(queryset, field, slug):
+    """
+    queryset filtered on `field`__slug=slug ('department', 'routine_type' or
+    'notice_type'), with the slug resolved to an id from the snapshot instead
+    of joining the taxonomy table.
+    """
+    snapshot = taxonomy()
+    if snapshot is None:
+        return queryset.filter(**{f'{field}__slug': slug})
+    pk = getattr(snapshot, SLUG_MAPS[field]).get(slug)
+    if pk is None:
+        return queryset.none()
+    return queryset.filter(**{f'{field}_id': pk})
@@ -0,0 +1,60 @@
+# web/templatetags/versioned_cache.py
+
+from django import template
+from django.apps import apps
+from web.singleflight import get_or_compute
+from web.versions import CONTENT_APPS, get_versions
+
+register = template.Library()
+
+
+FRAGMENT_TTL = 3600
+
+
+def _model_label(name):
+    """'Gallery' (looked up in the content apps) or 'notice.Notice' -> model label."""
+    try:
+        if '.' in name:
+            return apps.get_model(name)._meta.label
+        for app_label in CONTENT_APPS:
+            try:
+                return apps.get_model(app_label, name)._meta.label
+            except LookupError:
+                continue
+    except (LookupError, ValueError):
+        pass
+    raise template.TemplateSyntaxError(f"cache_versioned: unknown model '{name}'.")
+
+
+class VersionedCacheNode(template.Node):
+    def __init__(self, nodelist, fragment_name, labels):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.labels = labels
+
+    def render(self, context):
+        name = self.fragment_name.resolve(context)
+        return get_or_compute(
+            f'template:{name}', lambda: self.nodelist.render(context), FRAGMENT_TTL,
+            version=get_versions(*self.labels),
+        )
+
+
+@register.tag
+def cache_versioned(parser, token):
+    """
+    Caches the enclosed block until a row of one of the named models is
+    saved or deleted (see web.versions):
+
+        {% load versioned_cache %}
+        {% cache_versioned 'gallery' Gallery Video %} ... {% endcache_versioned %}
+
+    Only for blocks that look the same for every request: the name alone is
+    the cache key.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a fragment name and at least one model.")
+    nodelist = parser.parse(('endcache_versioned',))
+    parser.delete_first_token()
+    return VersionedCacheNode(nodelist, parser.compile_filter(bits[1]), [_model_label(name) for name in bits[2:]])
@@ -0,0 +1,53 @@
+# web/tests/base.py
+
+import shutil
+import tempfile
+
+from django.core.cache import cache, caches
+from django.test import TestCase, TransactionTestCase, override_settings
+from web.models import Class, Department, Result, StudentResult
+
+
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-shared'},
+}
+
+
+class SiteTestMixin:
+    """Runs against a throwaway MEDIA_ROOT and an empty in-memory cache per test."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        test_settings = override_settings(MEDIA_ROOT=self.media_root, CACHES=TEST_CACHES)
+        test_settings.enable()
+        self.addCleanup(test_settings.disable)
+        cache.clear()
+        caches['shared'].clear()
+
+    def make_class(self, numeric_value=10, name='দশম শ্রেণি', **fields):
+        return Class.objects.create(name=name, name_en=f'Class {numeric_value}', numeric_value=numeric_value, **fields)
+
+    def make_department(self, name_en='Science', **fields):
+        return Department.objects.create(name=name_en, name_en=name_en, icon='fa-flask', **fields)
+
+
+class SiteTestCase(SiteTestMixin, TestCase):
+    pass
+
+
+class ResultTestCase(SiteTestCase):
+    """One active result with one student, roll 7 of class 10."""
+
+    def setUp(self):
+        super().setUp()
+        self.ten = self.make_class(10)
+        self.result = Result.objects.create(title='Annual Exam', file='results/annual.pdf', class_name=self.ten)
+        self.student_result = StudentResult.objects.create(
+            result=self.result, class_name=self.ten, roll_number='007', student_name='Karim', gpa='5.00',
+        )
+
+
+class SiteTransactionTestCase(SiteTestMixin, TransactionTestCase):
+    """For code that depends on real commits (on_commit callbacks, autocommit failures)."""
@@ -0,0 +1,83 @@
+# web/tests/test_async_views.py
+
+import json
+import os
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from web import async_views, views
+from web.models import Book, Student
+
+from .base import SiteTestCase
+
+
+class AsyncViewTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ten = self.make_class(10, male_student=20, female_student=15)
+        self.nine = self.make_class(9, name='নবম শ্রেণি', show_students_publicly=False)
+        self.science = self.make_department('Science', male_student=8, female_student=4)
+        for name, cls in (('Karim', self.ten), ('Rahim', self.nine)):
+            Student.objects.create(
+                name=name, roll_number='1', registration_number='1', class_name=cls, department=self.science,
+                guardian_name='Guardian', guardian_phone='01711', address='Dhaka',
+            )
+        self.factory = RequestFactory()
+
+    async def test_filter_students_matches_the_sync_view(self):
+        for params in ({'class_id': self.ten.pk}, {'class_id': self.nine.pk}, {'dept_slug': self.science.slug}, {}):
+            request = self.factory.get('/filter/', params)
+            with self.subTest(params=params):
+                response = await async_views.filter_students(request)
+                expected = await sync_to_async(views.filter_students)(request)
+                self.assertEqual(response.content, expected.content)
+
+    async def test_filter_students_lists_only_public_classes(self):
+        response = await async_views.filter_students(self.factory.get('/filter/', {'dept_slug': self.science.slug}))
+
+        html = json.loads(response.content)['student_list_html']
+        self.assertIn('Karim', html)
+        self.assertNotIn('Rahim', html)
+
+    async def test_listing_matches_the_sync_view(self):
+        await Book.objects.acreate(title='Physics', file='books/physics.pdf', class_name=self.ten)
+        request = self.factory.get('/filter-books/', {'class_id': self.ten.pk})
+
+        response = await async_views.filter_books(request)
+        # Both views share a cache entry; compute the sync one afresh.
+        await cache.aclear()
+        expected = await sync_to_async(views.filter_books)(request)
+
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+
+    async def test_a_download_streams_the_file(self):
+        os.makedirs(os.path.join(self.media_root, 'books'))
+        with open(os.path.join(self.media_root, 'books', 'physics.pdf'), 'wb') as f:
+            f.write(b'%PDF-1.4 physics')
+        book = await Book.objects.acreate(title='Physics', file='books/physics.pdf')
+
+        response = await async_views.download_book(self.factory.get('/'), book.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'%PDF-1.4 physics')
+
+    async def test_a_missing_file_is_a_404(self):
+        book = await Book.objects.acreate(title='Physics', file='books/missing.pdf')
+
+        response = await async_views.download_book(self.factory.get('/'), book.pk)
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_download_errors_are_logged(self):
+        book = await Book.objects.acreate(title='Physics', file='books/physics.pdf')
+
+        with mock.patch.object(async_views, 'stream_file', side_effect=PermissionError('denied')):
+            with self.assertLogs('web.async_views', 'ERROR') as logs:
+                response = await async_views.download_book(self.factory.get('/'), book.pk)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('Error downloading books/physics.pdf', logs.output[0])
@@ -0,0 +1,108 @@
+# web/tests/test_cache.py
+
+import time
+import uuid
+from unittest import mock
+
+from django.core.cache import caches
+
+from web.cache_backends import GENERATION_KEY, TwoTierCache
+from web.versions import bump_version, get_versions
+
+from .base import SiteTestCase
+
+
+class TwoTierCacheTests(SiteTestCase):
+    def make_cache(self, **options):
+        """A TwoTierCache with its own L1, as another worker process would have."""
+        options = {'L2': 'shared', 'GENERATION_CHECK_INTERVAL': 0, **options}
+        return TwoTierCache(f'test-{uuid.uuid4().hex}', {'OPTIONS': options})
+
+    def test_prefixed_keys_are_answered_from_l1(self):
+        first = self.make_cache()
+        first.set('fragment:a', 'value')
+
+        caches['shared'].delete('fragment:a')
+
+        self.assertEqual(first.get('fragment:a'), 'value')
+        self.assertIsNone(self.make_cache().get('fragment:a'))
+
+    def test_other_keys_always_go_to_l2(self):
+        first = self.make_cache()
+        first.set('throttle:a', 'value')
+
+        caches['shared'].delete('throttle:a')
+
+        self.assertIsNone(first.get('throttle:a'))
+
+    def test_invalidate_drops_every_l1(self):
+        first, second = self.make_cache(), self.make_cache()
+        first.set('fragment:a', 'old')
+        self.assertEqual(second.get('fragment:a'), 'old')
+
+        caches['shared'].set('fragment:a', 'new')
+        first.invalidate()
+
+        self.assertEqual(second.get('fragment:a'), 'new')
+
+    def test_clear_empties_both_tiers(self):
+        first, second = self.make_cache(), self.make_cache()
+        first.set('fragment:a', 'value')
+        second.get('fragment:a')
+
+        first.clear()
+
+        self.assertIsNone(second.get('fragment:a'))
+        self.assertIsNotNone(caches['shared'].get(GENERATION_KEY))
+
+    def test_an_l1_copy_does_not_outlive_the_l2_entry(self):
+        first, second = self.make_cache(L1_TIMEOUT=300), self.make_cache(L1_TIMEOUT=300)
+        first.set('fragment:a', 'value', 60)
+
+        with mock.patch('web.cache_backends.time.time', return_value=time.time() + 50):
+            self.assertEqual(second.get('fragment:a'), 'value')
+
+        with mock.patch('web.cache_backends.time.monotonic', return_value=time.monotonic() + 11):
+            self.assertIsNone(second.store.get(second.make_and_validate_key('fragment:a')))
+
+    def test_values_written_straight_to_l2_are_read(self):
+        caches['shared'].set('fragment:a', 'value')
+
+        self.assertEqual(self.make_cache().get('fragment:a'), 'value')
+
+    def test_add_only_stores_once(self):
+        first = self.make_cache()
+
+        self.assertTrue(first.add('fragment:a', 'first'))
+        self.assertFalse(self.make_cache().add('fragment:a', 'second'))
+        self.assertEqual(self.make_cache().get('fragment:a'), 'first')
+
+
+class VersionTests(SiteTestCase):
+    def test_a_bump_changes_only_that_version(self):
+        before = get_versions('web.Book', 'web.Result')
+
+        bump_version('web.Book')
+
+        after = get_versions('web.Book', 'web.Result')
+        self.assertNotEqual(after[0], before[0])
+        self.assertEqual(after[1], before[1])
+
+    def test_bumps_within_one_clock_tick_still_differ(self):
+        with mock.patch('web.versions.time.time_ns', return_value=1):
+            bump_version('web.Book')
+            first = get_versions('web.Book')
+            bump_version('web.Book')
+            second = get_versions('web.Book')
+
+        self.assertNotEqual(first, second)
+
+    def test_saving_a_row_bumps_its_model_and_app(self):
+        before = get_versions('web', 'web.Class', 'web.Book')
+
+        self.make_class(10)
+
+        after = get_versions('web', 'web.Class', 'web.Book')
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+        self.assertEqual(after[2], before[2])
@@ -0,0 +1,83 @@
+# web/tests/test_compression.py
+
+import gzip
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.utils.cache import patch_vary_headers
+
+from web import middleware
+from web.middleware import CompressionMiddleware
+
+from .base import SiteTestCase
+
+
+HTML = '<p>নোটিশ বোর্ড</p>\n' * 100
+
+
+class CompressionMiddlewareTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+
+    def respond(self, response, path='/', encoding='gzip'):
+        request = self.factory.get(path, headers={'accept-encoding': encoding})
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        response = self.respond(HttpResponse(HTML))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content).decode(), HTML)
+
+    def test_brotli_is_preferred_when_available(self):
+        if middleware.brotli is None:
+            self.skipTest('brotli is not installed')
+
+        response = self.respond(HttpResponse(HTML), encoding='gzip, br')
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(middleware.brotli.decompress(response.content).decode(), HTML)
+
+    def test_a_strong_etag_becomes_weak(self):
+        original = HttpResponse(HTML)
+        original['ETag'] = '"abc"'
+
+        self.assertEqual(self.respond(original)['ETag'], 'W/"abc"')
+
+    def test_responses_left_alone(self):
+        csrf_request = self.factory.get('/', headers={'accept-encoding': 'gzip'})
+        csrf_request.META['CSRF_COOKIE_NEEDS_UPDATE'] = True
+        session = HttpResponse(HTML)
+        patch_vary_headers(session, ('Cookie',))
+
+        cases = {
+            'small': (self.factory.get('/', headers={'accept-encoding': 'gzip'}), HttpResponse('tiny')),
+            'image': (self.factory.get('/', headers={'accept-encoding': 'gzip'}), HttpResponse(HTML, content_type='image/png')),
+            'streaming': (self.factory.get('/', headers={'accept-encoding': 'gzip'}), StreamingHttpResponse([HTML])),
+            'admin': (self.factory.get('/admin/', headers={'accept-encoding': 'gzip'}), HttpResponse(HTML)),
+            'csrf token': (csrf_request, HttpResponse(HTML)),
+            'session': (self.factory.get('/', headers={'accept-encoding': 'gzip'}), session),
+            'no encoding': (self.factory.get('/'), HttpResponse(HTML)),
+        }
+        for name, (request, response) in cases.items():
+            with self.subTest(name):
+                response = CompressionMiddleware(lambda request: response)(request)
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_only_shared_responses_are_cached(self):
+        shared = HttpResponse(HTML)
+        shared['Cache-Control'] = 'public, max-age=60'
+        private = HttpResponse(HTML + 'private')
+        private['Cache-Control'] = 'private'
+
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.respond(shared)
+            self.respond(private)
+
+        self.assertEqual(cache_set.call_count, 1)
+        self.assertTrue(cache_set.call_args.args[0].startswith('compressed:gzip:'))
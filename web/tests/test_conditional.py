@@ -0,0 +1,64 @@
+# web/tests/test_conditional.py
+
+from django.test import RequestFactory
+from django.urls import reverse
+
+from web import async_views
+from web.models import Book
+
+from .base import SiteTestCase
+
+
+class ConditionalListingTests(SiteTestCase):
+    url = reverse('filter_books')
+
+    def setUp(self):
+        super().setUp()
+        self.ten = self.make_class(10)
+        self.book = Book.objects.create(title='Physics', file='books/physics.pdf', class_name=self.ten)
+
+    def etag(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        return response['ETag']
+
+    def test_a_matching_etag_is_a_304(self):
+        etag = self.etag()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_the_etag_follows_the_rows(self):
+        etag = self.etag()
+
+        Book.objects.create(title='Chemistry', file='books/chemistry.pdf')
+        added = self.etag()
+        self.book.is_active = False
+        self.book.save()
+        hidden = self.etag()
+
+        self.assertEqual(len({etag, added, hidden}), 3)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_the_etag_follows_taxonomy_names(self):
+        etag = self.etag()
+
+        self.ten.name = 'দশম'
+        self.ten.save()
+
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_the_etag_depends_on_the_filters(self):
+        self.assertNotEqual(self.etag(), self.etag(class_id=self.ten.pk + 1))
+
+    async def test_async_views_answer_304_too(self):
+        request = RequestFactory().get(self.url)
+        etag = (await async_views.filter_books(request))['ETag']
+
+        response = await async_views.filter_books(RequestFactory().get(self.url, HTTP_IF_NONE_MATCH=etag))
+
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,138 @@
+# web/tests/test_contact.py
+
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from web import throttle, views
+from web.models import ContactMessage
+from web.throttle import client_ip, first_seen, take_token
+from web.write_buffer import WriteBuffer
+
+from .base import SiteTestCase
+
+
+class TokenBucketTests(SiteTestCase):
+    def test_a_burst_then_one_per_refill(self):
+        with mock.patch('web.throttle.time.time', return_value=1000.0) as now:
+            self.assertEqual(take_token('client', 2, 60), (True, 0))
+            self.assertEqual(take_token('client', 2, 60), (True, 0))
+            allowed, retry_after = take_token('client', 2, 60)
+            self.assertFalse(allowed)
+            self.assertEqual(retry_after, 61)
+
+            now.return_value = 1060.0
+            self.assertEqual(take_token('client', 2, 60), (True, 0))
+            self.assertFalse(take_token('client', 2, 60)[0])
+
+    def test_buckets_are_per_key(self):
+        self.assertTrue(take_token('first', 1, 60)[0])
+
+        self.assertTrue(take_token('second', 1, 60)[0])
+        self.assertFalse(take_token('first', 1, 60)[0])
+
+    def test_a_bucket_held_by_another_worker_refuses(self):
+        cache.add('throttle:client:lock', 1)
+
+        with mock.patch.object(throttle, 'LOCK_RETRY_DELAY', 0):
+            self.assertEqual(take_token('client', 5, 60), (False, 60))
+
+    def test_without_an_atomic_cache_the_host_lock_is_used(self):
+        cache.add('throttle:client:lock', 1)
+
+        with mock.patch.object(throttle, 'can_lock', return_value=False):
+            self.assertEqual(take_token('client', 1, 60), (True, 0))
+            self.assertFalse(take_token('client', 1, 60)[0])
+
+
+class FirstSeenTests(SiteTestCase):
+    def test_repeats_are_recognised_regardless_of_case_and_spacing(self):
+        self.assertTrue(first_seen('01711', 'Admission', 'When does it open?'))
+
+        self.assertFalse(first_seen('01711', 'admission ', 'When  does it\nopen?'))
+        self.assertTrue(first_seen('01711', 'Admission', 'Another question'))
+
+    def test_without_an_atomic_cache(self):
+        with mock.patch.object(throttle, 'can_lock', return_value=False):
+            self.assertTrue(first_seen('01711', 'Admission', 'When does it open?'))
+            self.assertFalse(first_seen('01711', 'Admission', 'When does it open?'))
+
+
+class ClientIpTests(SiteTestCase):
+    def request(self, **meta):
+        return mock.Mock(META={'REMOTE_ADDR': '10.0.0.1', **meta})
+
+    def test_remote_addr_without_a_configured_header(self):
+        self.assertEqual(client_ip(self.request(HTTP_X_FORWARDED_FOR='1.2.3.4')), '10.0.0.1')
+
+    @override_settings(CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_the_entry_added_by_our_proxy(self):
+        self.assertEqual(client_ip(self.request(HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4')), '1.2.3.4')
+        self.assertEqual(client_ip(self.request()), '')
+
+
+class ContactMessageTests(SiteTestCase):
+    url = reverse('submit_contact_message')
+
+    def post(self, **fields):
+        data = {'name': 'Rahim', 'phone': '01711-000000', 'title': 'Admission', 'message': 'When does it open?', **fields}
+        return self.client.post(self.url, json.dumps(data), content_type='application/json')
+
+    def test_a_message_is_accepted_and_written(self):
+        response = self.post()
+
+        self.assertEqual(response.status_code, 202)
+        views.contact_message_buffer.flush()
+        self.assertEqual(ContactMessage.objects.get().title, 'Admission')
+
+    def test_a_duplicate_is_reported_and_stored_once(self):
+        self.post()
+
+        response = self.post(phone='01711 000000')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['duplicate'])
+        views.contact_message_buffer.flush()
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_invalid_messages_are_refused(self):
+        self.assertEqual(self.post(name='').status_code, 400)
+        self.assertEqual(self.post(title='x' * 201).status_code, 400)
+        self.assertEqual(self.client.post(self.url, 'not json', content_type='application/json').status_code, 400)
+
+    def test_too_many_messages_from_one_phone(self):
+        with mock.patch.object(views, 'CONTACT_PHONE_BUCKET', (1, 600)):
+            self.assertEqual(self.post(message='first').status_code, 202)
+            response = self.post(message='second')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(response['Retry-After'], ('600', '601'))
+        views.contact_message_buffer.flush()
+
+
+class WriteBufferTests(SiteTestCase):
+    def message(self, **fields):
+        return ContactMessage(**{'name': 'Rahim', 'phone': '01711', 'title': 'Hello', 'message': 'Hi', **fields})
+
+    def test_writes_when_the_batch_is_full(self):
+        buffer = WriteBuffer(ContactMessage, batch_size=2, flush_interval=60)
+
+        buffer.add(self.message())
+        self.assertEqual(ContactMessage.objects.count(), 0)
+        buffer.add(self.message())
+
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_a_bad_row_is_logged_and_dropped(self):
+        buffer = WriteBuffer(ContactMessage, batch_size=10, flush_interval=60)
+        buffer.add(self.message(title='kept'))
+        buffer.add(self.message(title=None))
+
+        with self.assertLogs('web.write_buffer') as logs:
+            self.assertEqual(buffer.flush(), 1)
+
+        self.assertEqual(list(ContactMessage.objects.values_list('title', flat=True)), ['kept'])
+        self.assertIn('Dropped buffered ContactMessage row', logs.output[-1])
@@ -0,0 +1,116 @@
+# web/tests/test_document_index.py
+
+from django.urls import reverse
+
+from notice.models import Notice as TypedNotice, NoticeType
+from web.document_index import document_counts, latest_documents, rebuild
+from web.models import Book, DocumentIndex, Routine
+
+from .base import SiteTestCase
+
+
+class DocumentIndexTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ten = self.make_class(10)
+        self.science = self.make_department('Science')
+
+    def entry(self, obj, kind):
+        return DocumentIndex.objects.filter(kind=kind, object_id=obj.pk).first()
+
+    def test_saves_keep_the_row_in_step(self):
+        book = Book.objects.create(title='Physics', file='books/physics.pdf', class_name=self.ten)
+
+        entry = self.entry(book, 'book')
+        self.assertEqual((entry.title, entry.class_name_id, entry.mime_type), ('Physics', self.ten.pk, 'application/pdf'))
+
+        book.title = 'Physics 1st Paper'
+        book.is_active = False
+        book.save()
+        entry.refresh_from_db()
+        self.assertEqual((entry.title, entry.is_active), ('Physics 1st Paper', False))
+
+        book.delete()
+        self.assertIsNone(self.entry(book, 'book'))
+
+    def test_a_row_without_a_file_is_not_indexed(self):
+        book = Book.objects.create(title='Physics', file='books/physics.pdf')
+
+        book.file = ''
+        book.save()
+
+        self.assertIsNone(self.entry(book, 'book'))
+
+    def test_feed_and_counts_span_every_kind(self):
+        Book.objects.create(title='Physics', file='books/physics.pdf', department=self.science)
+        Routine.objects.create(title='Class routine', category='class', file='routines/class.pdf')
+        Routine.objects.create(title='Old routine', category='class', file='routines/old.pdf', is_active=False)
+
+        self.assertEqual(document_counts(), {'book': 1, 'routine': 1})
+        self.assertEqual(list(latest_documents().values_list('title', flat=True)), ['Class routine', 'Physics'])
+        self.assertEqual(list(latest_documents(department_id=self.science.pk).values_list('kind', flat=True)), ['book'])
+
+    def test_rebuild_recreates_missing_rows(self):
+        Book.objects.create(title='Physics', file='books/physics.pdf')
+        DocumentIndex.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(rebuild(), 1)
+
+        self.assertEqual(document_counts(), {'book': 1})
+
+
+class DocumentsApiTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ten = self.make_class(10)
+        self.science = self.make_department('Science')
+        self.url = reverse('api_documents')
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()['documents']]
+
+    def test_lists_documents_of_every_kind(self):
+        book = Book.objects.create(title='Physics', file='books/physics.pdf', class_name=self.ten)
+        notice_type = NoticeType.objects.create(name='Exam', slug='exam')
+        TypedNotice.objects.create(title='Exam notice', notice_type=notice_type, file='notices/exam.pdf')
+
+        payload = self.client.get(self.url).json()
+
+        self.assertEqual(payload['counts'], {'book': 1, 'notice': 1})
+        self.assertEqual([row['kind'] for row in payload['documents']], ['notice', 'book'])
+        row = payload['documents'][1]
+        self.assertEqual(row['class_name'], self.ten.name)
+        self.assertEqual(row['download_url'], reverse('download_book', kwargs={'pk': book.pk}))
+        self.assertEqual(self.titles(type_slug='exam'), ['Exam notice'])
+
+    def test_filters(self):
+        Book.objects.create(title='Physics', file='books/physics.pdf', class_name=self.ten)
+        Book.objects.create(title='Chemistry', file='books/chemistry.pdf', department=self.science)
+        Routine.objects.create(title='Class routine', category='class', file='routines/class.pdf')
+
+        self.assertEqual(self.titles(kind='routine'), ['Class routine'])
+        self.assertEqual(self.titles(class_id=self.ten.pk), ['Physics'])
+        self.assertEqual(self.titles(dept_slug=self.science.slug), ['Chemistry'])
+        self.assertEqual(self.titles(dept_slug='no-such-department'), [])
+        self.assertEqual(self.titles(kind='no-such-kind'), [])
+
+    def test_pages(self):
+        for number in range(25):
+            Book.objects.create(title=f'book {number}', file=f'books/{number}.pdf')
+
+        first = self.client.get(self.url).json()
+        second = self.client.get(self.url, {'page': 2}).json()
+
+        self.assertEqual((len(first['documents']), first['has_next']), (20, True))
+        self.assertEqual((len(second['documents']), second['has_next']), (5, False))
+
+    def test_a_new_document_shows_up_in_the_cached_feed(self):
+        Book.objects.create(title='Physics', file='books/physics.pdf')
+        self.assertEqual(self.titles(), ['Physics'])
+
+        Book.objects.create(title='Chemistry', file='books/chemistry.pdf')
+
+        self.assertEqual(self.titles(), ['Chemistry', 'Physics'])
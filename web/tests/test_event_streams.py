@@ -0,0 +1,122 @@
+# web/tests/test_event_streams.py
+
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from web import async_views
+from web.async_views import _notice_event
+from web.models import ChangeLog
+from web.pubsub import ChangeFeed
+
+from .base import SiteTestCase
+
+
+def change(id, kind='notice', action='published', object_id=1, title='Exam notice'):
+    return {'id': id, 'kind': kind, 'object_id': object_id, 'action': action, 'title': title,
+            'url': f'/download-notice/{object_id}/', 'created_at': timezone.now()}
+
+
+def event_data(text):
+    return json.loads(next(line for line in text.splitlines() if line.startswith('data: '))[len('data: '):])
+
+
+class NoticeEventTests(SiteTestCase):
+    def test_published_notices_are_sent(self):
+        text = _notice_event(0, [change(1), change(2, kind='web_notice', object_id=2)])
+
+        self.assertIn('event: notices', text)
+        self.assertIn('id: 2', text)
+        self.assertEqual([notice['id'] for notice in event_data(text)['notices']], [1, 2])
+
+    def test_other_changes_only_move_the_cursor(self):
+        rows = [change(1, kind='book'), change(2, action='updated'), change(3, object_id=2), change(4, object_id=2, action='removed')]
+
+        self.assertEqual(_notice_event(0, rows), 'id: 4\n\n')
+
+    def test_an_edit_after_publishing_sends_the_new_title(self):
+        text = _notice_event(0, [change(1), change(2, action='updated', title='Exam notice (revised)')])
+
+        self.assertEqual([notice['title'] for notice in event_data(text)['notices']], ['Exam notice (revised)'])
+
+
+@override_settings(EVENT_STREAM_POLL_INTERVAL=0.05)
+class ChangeFeedTests(SiteTestCase):
+    def log(self, title):
+        return ChangeLog.objects.create(kind='notice', object_id=1, action='published', title=title)
+
+    async def test_listeners_get_rows_after_their_cursor(self):
+        first = await sync_to_async(self.log)('first')
+        second = await sync_to_async(self.log)('second')
+        feed = ChangeFeed()
+
+        batches = feed.listen(first.id - 1, keepalive=1)
+        try:
+            cursor, rows = await asyncio.wait_for(anext(batches), 1)
+        finally:
+            await batches.aclose()
+
+        self.assertEqual(cursor, first.id - 1)
+        self.assertEqual([row['id'] for row in rows], [first.id, second.id])
+        self.assertEqual(feed.subscribers, 0)
+
+    async def test_new_rows_are_pushed(self):
+        feed = ChangeFeed()
+        batches = feed.listen(None, keepalive=1)
+        try:
+            waiting = asyncio.ensure_future(anext(batches))
+            await asyncio.sleep(0.01)
+            row = await sync_to_async(self.log)('new')
+            cursor, rows = await asyncio.wait_for(waiting, 1)
+        finally:
+            await batches.aclose()
+
+        self.assertEqual([r['id'] for r in rows], [row.id])
+        self.assertEqual(cursor, row.id - 1)
+
+    async def test_a_quiet_feed_sends_keepalives(self):
+        feed = ChangeFeed()
+        batches = feed.listen(None, keepalive=0.05)
+        try:
+            cursor, rows = await asyncio.wait_for(anext(batches), 1)
+        finally:
+            await batches.aclose()
+
+        self.assertEqual(rows, [])
+
+    async def test_a_listener_behind_the_buffer_reads_from_the_database(self):
+        rows = [await sync_to_async(self.log)(str(number)) for number in range(3)]
+        feed = ChangeFeed(buffer_size=1)
+        await feed._start()
+        feed.cursor = feed.floor = rows[-1].id
+
+        self.assertIsNone(feed.rows_after(rows[0].id - 1))
+
+
+class EventStreamViewTests(SiteTestCase):
+    def test_wsgi_tells_event_source_to_stop(self):
+        self.assertEqual(self.client.get(reverse('api_updates_stream')).status_code, 204)
+        self.assertEqual(self.client.get(reverse('notice_stream')).status_code, 204)
+
+    async def test_the_stream_starts_with_a_retry_interval(self):
+        response = await async_views.notice_stream(RequestFactory().get('/api/notices/stream/'))
+        chunks = aiter(response.streaming_content)
+        try:
+            first = await anext(chunks)
+        finally:
+            await chunks.aclose()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertTrue((first.decode() if isinstance(first, bytes) else first).startswith('retry: '))
+
+    @override_settings(EVENT_STREAM_MAX_CONNECTIONS=0)
+    async def test_too_many_streams_get_a_503(self):
+        response = await async_views.api_updates_stream(RequestFactory().get('/api/updates/stream/'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '30')
@@ -0,0 +1,62 @@
+# web/tests/test_images.py
+
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+
+from web.images import image_metadata, read_image_metadata
+from web.models import Gallery
+
+from .base import SiteTestCase
+
+
+def image_file(name='photo.jpg', size=(120, 80), orientation=None):
+    buffer = BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new('RGB', size, (200, 40, 40)).save(buffer, format='JPEG', exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImageMetadataTests(SiteTestCase):
+    def test_stored_on_upload(self):
+        gallery = Gallery.objects.create(title='Sports day', category='school', image=image_file())
+
+        gallery.refresh_from_db()
+        self.assertEqual((gallery.image_width, gallery.image_height), (120, 80))
+        self.assertTrue(gallery.image_placeholder.startswith('data:image/png;base64,'))
+        self.assertLess(len(gallery.image_placeholder), 1000)
+
+    def test_rotated_photos_report_their_displayed_size(self):
+        gallery = Gallery.objects.create(title='Portrait', category='school', image=image_file(orientation=6))
+
+        self.assertEqual((gallery.image_width, gallery.image_height), (80, 120))
+
+    def test_replacing_the_image_updates_it(self):
+        gallery = Gallery.objects.create(title='Sports day', category='school', image=image_file())
+
+        gallery.image = image_file('wide.jpg', size=(300, 100))
+        gallery.save()
+
+        self.assertEqual((gallery.image_width, gallery.image_height), (300, 100))
+
+    def test_an_unreadable_file_has_no_metadata(self):
+        gallery = Gallery(image=SimpleUploadedFile('broken.jpg', b'not an image', content_type='image/jpeg'))
+
+        self.assertIsNone(read_image_metadata(gallery.image))
+        # The upload is rewound so it is still saved whole.
+        self.assertEqual(gallery.image.read(), b'not an image')
+
+    def test_served_with_the_gallery_json(self):
+        Gallery.objects.create(title='Sports day', category='school', image=image_file())
+
+        image = self.client.get(reverse('filter_gallery_images')).json()['images'][0]
+
+        self.assertEqual((image['width'], image['height']), (120, 80))
+        self.assertTrue(image['placeholder'])
+
+    def test_no_image_no_metadata(self):
+        self.assertEqual(image_metadata(Gallery(), 'image'), {'width': None, 'height': None, 'placeholder': ''})
@@ -0,0 +1,47 @@
+# web/tests/test_layout.py
+
+from unittest import mock
+
+from django.urls import reverse
+
+from web import layout
+from web.models import ImportantLink, Notice
+
+from .base import SiteTestCase
+
+
+class LayoutTests(SiteTestCase):
+    def test_the_footer_is_rendered_once_per_version(self):
+        ImportantLink.objects.create(title='Education Board', url='https://example.com/board')
+
+        with mock.patch.object(layout, '_render_footer', wraps=layout._render_footer) as render:
+            first = layout.footer_html()
+            self.assertEqual(layout.footer_html(), first)
+            self.assertEqual(render.call_count, 1)
+
+            ImportantLink.objects.create(title='Ministry', url='https://example.com/ministry')
+            second = layout.footer_html()
+
+        self.assertEqual(render.call_count, 2)
+        self.assertIn('Education Board', first)
+        self.assertIn('Ministry', second)
+
+    def test_unrelated_changes_keep_the_cached_navbar(self):
+        with mock.patch.object(layout, '_render_navbar', wraps=layout._render_navbar) as render:
+            layout.navbar_html()
+            Notice.objects.create(title='Old notice', type='notice', date='2024-01-01', file='notices/old.pdf')
+            layout.navbar_html()
+
+        self.assertEqual(render.call_count, 1)
+
+    def test_pages_and_the_footer_view_share_the_render(self):
+        ImportantLink.objects.create(title='Education Board', url='https://example.com/board')
+
+        with mock.patch.object(layout, '_render_footer', wraps=layout._render_footer) as render:
+            page = self.client.get(reverse('home'))
+            footer = self.client.get(reverse('footer'))
+
+        self.assertEqual(render.call_count, 1)
+        self.assertContains(page, 'Education Board')
+        self.assertIn(footer.content.decode(), page.content.decode())
+        self.assertIn('public', footer['Cache-Control'])
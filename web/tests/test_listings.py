@@ -0,0 +1,124 @@
+# web/tests/test_listings.py
+
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from notice.models import Notice, NoticeType
+from notice.views import notices_listing
+from web.models import Book, Routine
+from web.views import books_listing, routines_listing
+
+from .base import SiteTestCase
+
+
+class ListingTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ten = self.make_class(10)
+        self.nine = self.make_class(9, name='নবম শ্রেণি')
+        self.science = self.make_department('Science')
+        self.factory = RequestFactory()
+
+    def make_book(self, title, **fields):
+        return Book.objects.create(title=title, file=f'books/{title}.pdf', **fields)
+
+    def titles(self, response, key='books'):
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()[key]]
+
+    def test_only_active_rows_are_listed(self):
+        self.make_book('active')
+        self.make_book('hidden', is_active=False)
+
+        self.assertEqual(self.titles(self.client.get(reverse('filter_books'))), ['active'])
+
+    def test_filters_by_class_and_department(self):
+        self.make_book('ten', class_name=self.ten)
+        self.make_book('nine', class_name=self.nine)
+        self.make_book('science', department=self.science)
+        url = reverse('filter_books')
+
+        self.assertEqual(self.titles(self.client.get(url, {'class_id': self.ten.pk})), ['ten'])
+        self.assertEqual(self.titles(self.client.get(url, {'dept_slug': self.science.slug})), ['science'])
+        self.assertEqual(self.titles(self.client.get(url, {'dept_slug': 'no-such-department'})), [])
+
+    def test_rows_carry_taxonomy_names(self):
+        self.make_book('ten', class_name=self.ten, department=self.science)
+
+        row = self.client.get(reverse('filter_books')).json()['books'][0]
+
+        self.assertEqual(row['class_name'], self.ten.name)
+        self.assertEqual(row['department'], self.science.name)
+        self.assertEqual(row['download_url'], 'http://testserver' + reverse('download_book', kwargs={'pk': row['id']}))
+        self.assertEqual(row['file_url'], 'http://testserver/media/books/ten.pdf')
+
+    def test_only_book_and_syllabus_urls_are_absolute(self):
+        routine = Routine.objects.create(title='class routine', category='class', file='routines/a.pdf')
+
+        row = self.client.get(reverse('filter_routines')).json()['routines'][0]
+
+        self.assertEqual(row['download_url'], reverse('download_routine', kwargs={'pk': routine.pk}))
+
+    def test_notice_colours_are_stable(self):
+        notice_type = NoticeType.objects.create(name='General', slug='general')
+        for number in range(3):
+            Notice.objects.create(title=f'notice {number}', notice_type=notice_type, file=f'notices/{number}.pdf')
+        request = self.factory.get('/')
+
+        first = [row['background_color'] for row in notices_listing.page(request)['rows']]
+        again = [row['background_color'] for row in notices_listing.page(request)['rows']]
+
+        self.assertEqual(first, again)
+        self.assertEqual(len(set(first)), 3)
+
+    def test_listing_params_and_defaults(self):
+        Routine.objects.create(title='class routine', category='class', file='routines/a.pdf')
+        Routine.objects.create(title='exam routine', category='exam', file='routines/b.pdf')
+        url = reverse('filter_routines')
+
+        self.assertEqual(self.titles(self.client.get(url), 'routines'), ['class routine'])
+        self.assertEqual(self.titles(self.client.get(url, {'type': 'exam'}), 'routines'), ['exam routine'])
+
+    def test_a_new_row_shows_up_in_the_cached_listing(self):
+        url = reverse('filter_books')
+        self.make_book('first')
+        self.assertEqual(self.titles(self.client.get(url)), ['first'])
+
+        self.make_book('second')
+
+        self.assertEqual(sorted(self.titles(self.client.get(url))), ['first', 'second'])
+
+    def test_unpaginated_by_default(self):
+        for number in range(150):
+            self.make_book(f'book {number}')
+
+        page = books_listing.page(self.factory.get('/'))
+
+        self.assertEqual(len(page['rows']), 150)
+        self.assertFalse(page['has_next'])
+
+    def test_pages_when_asked(self):
+        for number in range(150):
+            self.make_book(f'book {number}')
+
+        first = books_listing.page(self.factory.get('/', {'page': 1}))
+        second = books_listing.page(self.factory.get('/', {'page': 2}))
+
+        self.assertEqual((len(first['rows']), first['has_next']), (100, True))
+        self.assertEqual((len(second['rows']), second['page'], second['has_next']), (50, 2, False))
+        self.assertFalse({row['id'] for row in first['rows']} & {row['id'] for row in second['rows']})
+
+    @override_settings(LISTING_PAGE_SIZE=2)
+    def test_configured_page_size(self):
+        for number in range(3):
+            self.make_book(f'book {number}')
+
+        first = books_listing.page(self.factory.get('/'))
+        last = books_listing.page(self.factory.get('/', {'page': 2}))
+
+        self.assertEqual((len(first['rows']), first['has_next']), (2, True))
+        self.assertEqual((len(last['rows']), last['has_next']), (1, False))
+
+    def test_page_size_follows_the_request(self):
+        self.assertEqual(routines_listing.get_page_size(self.factory.get('/')), None)
+        self.assertEqual(routines_listing.get_page_size(self.factory.get('/', {'page': 3})), 100)
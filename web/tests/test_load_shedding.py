@@ -0,0 +1,141 @@
+# web/tests/test_load_shedding.py
+
+import asyncio
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from web.middleware import ConcurrencyLimiter, LoadSheddingMiddleware, RouteClass
+
+from .base import SiteTestCase
+
+
+def route_classes():
+    return [
+        RouteClass('admin', r'^/admin/', share=1.0),
+        RouteClass('download', r'^/download', share=1.0, max_concurrent=1, retry_after=30),
+        RouteClass('page', r'', share=0.5),
+    ]
+
+
+class ConcurrencyLimiterTests(SimpleTestCase):
+    def setUp(self):
+        self.limiter = ConcurrencyLimiter(4, route_classes())
+        self.admin, self.download, self.page = self.limiter.route_classes
+
+    def test_routes_are_classified_in_order(self):
+        self.assertIs(self.limiter.classify('/admin/web/'), self.admin)
+        self.assertIs(self.limiter.classify('/download-book/1/'), self.download)
+        self.assertIs(self.limiter.classify('/books/'), self.page)
+
+    def test_a_class_fills_only_its_share(self):
+        self.assertTrue(self.limiter.acquire(self.page))
+        self.assertTrue(self.limiter.acquire(self.page))
+        self.assertFalse(self.limiter.acquire(self.page))
+
+        self.assertTrue(self.limiter.acquire(self.admin))
+
+    def test_a_class_has_its_own_cap(self):
+        self.assertTrue(self.limiter.acquire(self.download))
+        self.assertFalse(self.limiter.acquire(self.download))
+
+        self.limiter.release(self.download)
+        self.assertTrue(self.limiter.acquire(self.download))
+
+    def test_lower_priority_waits_behind_queued_requests(self):
+        self.limiter.waiting['admin'] = 1
+
+        self.assertFalse(self.limiter.acquire(self.page))
+
+    def test_a_queued_request_gets_a_released_slot(self):
+        page = RouteClass('page', r'', share=0.25, max_wait=1)
+        limiter = ConcurrencyLimiter(4, [page])
+        limiter.acquire(page)
+
+        async def wait_then_release():
+            waiter = asyncio.ensure_future(limiter.aacquire(page))
+            await asyncio.sleep(limiter.poll_interval * 2)
+            limiter.release(page)
+            return await waiter
+
+        self.assertTrue(asyncio.run(wait_then_release()))
+        self.assertEqual(limiter.total, 1)
+
+
+class LoadSheddingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        middleware_class = type('TestLoadShedding', (LoadSheddingMiddleware,), {
+            'capacity': 4, 'route_classes': route_classes(), 'limiter': None,
+        })
+        self.middleware = middleware_class(lambda request: HttpResponse('file'))
+        self.limiter = middleware_class.limiter
+        self.factory = RequestFactory()
+
+    def test_a_request_past_the_limit_gets_a_503(self):
+        first = self.middleware(self.factory.get('/download-book/1/'))
+
+        refused = self.middleware(self.factory.get('/download-book/2/'))
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(refused.status_code, 503)
+        self.assertEqual(refused['Retry-After'], '30')
+        self.assertIn('no-store', refused['Cache-Control'])
+
+    def test_the_slot_is_held_until_the_response_is_closed(self):
+        response = self.middleware(self.factory.get('/download-book/1/'))
+        self.assertEqual(self.limiter.in_flight['download'], 1)
+
+        response.close()
+
+        self.assertEqual(self.limiter.in_flight['download'], 0)
+        self.assertEqual(self.middleware(self.factory.get('/download-book/2/')).status_code, 200)
+
+    def test_closing_twice_releases_once(self):
+        self.middleware(self.factory.get('/admin/'))
+        response = self.middleware(self.factory.get('/download-book/1/'))
+
+        response.close()
+        response.close()
+
+        self.assertEqual(self.limiter.total, 1)
+
+    def test_event_streams_release_at_once(self):
+        middleware = type(self.middleware)(
+            lambda request: HttpResponse('', content_type='text/event-stream')
+        )
+
+        middleware(self.factory.get('/download/stream/'))
+
+        self.assertEqual(self.limiter.total, 0)
+
+
+class MetricsAccessTests(SiteTestCase):
+    url = reverse('metrics')
+
+    def test_only_staff_by_default(self):
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='127.0.0.1').status_code, 404)
+
+        staff = User.objects.create_user('staff', password='secret', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'loadshed_capacity', response.content)
+
+    @override_settings(METRICS_ALLOWED_IPS=('127.0.0.1',))
+    def test_allowed_addresses(self):
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='127.0.0.1').status_code, 200)
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.0.0.9').status_code, 404)
+
+    @override_settings(METRICS_ALLOWED_IPS=('127.0.0.1',), CLIENT_IP_HEADER=None)
+    def test_a_proxied_request_is_not_trusted_without_the_client_ip_header(self):
+        response = self.client.get(self.url, REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.7')
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_ALLOWED_IPS=('10.0.0.5',), CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_a_proxied_request_with_the_client_ip_header(self):
+        response = self.client.get(self.url, REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='10.0.0.5')
+
+        self.assertEqual(response.status_code, 200)
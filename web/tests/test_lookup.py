@@ -0,0 +1,91 @@
+# web/tests/test_lookup.py
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from web.lookup import autocomplete, find_by_roll, normalize_number, rebuild, student_keys
+from web.models import Student, StudentLookup
+
+from .base import SiteTestCase
+
+
+class StudentLookupTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ten = self.make_class(10)
+        self.nine = self.make_class(9, name='নবম শ্রেণি', show_students_publicly=False)
+
+    def make_student(self, name, roll, class_name=None, registration=''):
+        return Student.objects.create(
+            name=name, roll_number=roll, registration_number=registration, class_name=class_name or self.ten,
+            guardian_name='Guardian', guardian_phone='01711', address='Dhaka',
+        )
+
+    def names(self, query, **kwargs):
+        return [student.name for student in autocomplete(query, **kwargs)]
+
+    def test_numbers_are_normalised(self):
+        self.assertEqual(normalize_number('০০৭'), '7')
+        self.assertEqual(normalize_number(' 2024-15 '), '202415')
+        self.assertEqual(normalize_number('000'), '000')
+
+    def test_every_word_of_the_name_starts_a_key(self):
+        student = self.make_student('Md. Abdul Karim', '007', registration='1234')
+
+        self.assertEqual(student_keys(student), {
+            ('name', 'md abdul karim'), ('name', 'abdul karim'), ('name', 'karim'),
+            ('roll', '7'), ('registration', '1234'),
+        })
+
+    def test_typeahead_matches_any_word_or_number_prefix(self):
+        self.make_student('Md. Abdul Karim', '7', registration='2024001')
+        self.make_student('Rahima Khatun', '12', class_name=self.nine)
+
+        self.assertEqual(self.names('kar'), ['Md. Abdul Karim'])
+        self.assertEqual(self.names('RAHIMA kh'), ['Rahima Khatun'])
+        self.assertEqual(self.names('2024'), ['Md. Abdul Karim'])
+        self.assertEqual(self.names('1', class_id=self.nine.pk), ['Rahima Khatun'])
+        self.assertEqual(self.names('zzz'), [])
+        self.assertEqual(self.names(' - '), [])
+
+    def test_keys_follow_edits(self):
+        student = self.make_student('Karim', '7')
+
+        student.name = 'Rahim'
+        student.save()
+
+        self.assertEqual(self.names('kar'), [])
+        self.assertEqual(self.names('rah'), ['Rahim'])
+
+    def test_find_by_roll(self):
+        student = self.make_student('Karim', '007')
+
+        self.assertEqual(find_by_roll(self.ten.pk, '৭'), student)
+        self.assertIsNone(find_by_roll(self.nine.pk, '7'))
+
+    def test_rebuild_recreates_missing_keys(self):
+        self.make_student('Karim', '7')
+        StudentLookup.objects.all().delete()
+
+        self.assertEqual(rebuild(), 2)
+        self.assertEqual(self.names('kar'), ['Karim'])
+
+    def test_public_roll_lookup(self):
+        self.make_student('Karim', '7')
+        self.make_student('Rahim', '8', class_name=self.nine)
+        url = reverse('lookup_student')
+
+        response = self.client.get(url, {'class_id': self.ten.pk, 'roll': '07'})
+        self.assertEqual(response.json()['student']['name'], 'Karim')
+        self.assertEqual(self.client.get(url, {'class_id': self.nine.pk, 'roll': '8'}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'class_id': self.ten.pk}).status_code, 400)
+
+    def test_admin_typeahead(self):
+        self.make_student('Karim', '7')
+        url = reverse('admin:web_student_typeahead')
+
+        self.assertNotEqual(self.client.get(url, {'q': 'kar'}).status_code, 200)
+
+        self.client.force_login(User.objects.create_superuser('admin', password='secret'))
+        response = self.client.get(url, {'q': 'kar'})
+        self.assertEqual([row['name'] for row in response.json()['results']], ['Karim'])
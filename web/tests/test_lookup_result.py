@@ -0,0 +1,60 @@
+# web/tests/test_lookup_result.py
+
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from web.models import Result, StudentResult
+from .base import ResultTestCase
+
+
+class LookupResultTests(ResultTestCase):
+    def lookup(self, **params):
+        return self.client.get(reverse('lookup_result'), params)
+
+    def test_found(self):
+        response = self.lookup(result_id=self.result.pk, roll='7', class_id=self.ten.pk)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['found'])
+        self.assertEqual((data['result']['name'], data['result']['gpa']), ('Karim', '5.00'))
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=300', response['Cache-Control'])
+
+    def test_roll_is_normalised(self):
+        response = self.lookup(result_id=self.result.pk, roll='০০৭')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_found_is_not_cached(self):
+        response = self.lookup(result_id=self.result.pk, roll='8')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'found': False})
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
+
+    def test_missing_parameters(self):
+        response = self.lookup(roll='7')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_inactive_result_is_not_served(self):
+        Result.objects.filter(pk=self.result.pk).update(is_active=False)
+
+        self.assertEqual(self.lookup(result_id=self.result.pk, roll='7').status_code, 404)
+
+    def test_html_format(self):
+        found = self.lookup(result_id=self.result.pk, roll='7', format='html')
+        missing = self.lookup(result_id=self.result.pk, roll='8', format='html')
+
+        self.assertEqual(found.status_code, 200)
+        self.assertContains(found, 'Karim')
+        self.assertEqual(missing.status_code, 404)
+
+    def test_rolls_are_unique_per_result_without_a_class(self):
+        StudentResult.objects.create(result=self.result, roll_number='12', student_name='First')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            StudentResult.objects.create(result=self.result, roll_number='12', student_name='Second')
+        StudentResult.objects.create(result=self.result, class_name=self.ten, roll_number='12')
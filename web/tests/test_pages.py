@@ -0,0 +1,72 @@
+# web/tests/test_pages.py
+
+from django.urls import reverse
+from web.models import Book, Result, Student
+from web.taxonomy import taxonomy
+from .base import SiteTestCase
+
+
+class TaxonomyTests(SiteTestCase):
+    def test_snapshot_follows_edits(self):
+        ten = self.make_class(10)
+        first = taxonomy()
+        self.assertIs(taxonomy(), first)
+
+        nine = self.make_class(9, name='নবম শ্রেণি', show_students_publicly=False)
+        snapshot = taxonomy()
+
+        self.assertIsNot(snapshot, first)
+        self.assertEqual([cls.pk for cls in snapshot.classes], [nine.pk, ten.pk])
+        self.assertEqual(snapshot.public_class_ids, {ten.pk})
+        self.assertEqual(snapshot.get_class(str(ten.pk)), ten)
+        self.assertIsNone(snapshot.get_class('x'))
+
+    def test_departments_by_slug(self):
+        science = self.make_department('Science')
+
+        self.assertEqual(taxonomy().get_department(science.slug), science)
+        self.assertIsNone(taxonomy().get_department('arts'))
+
+
+class PageTests(SiteTestCase):
+    """Every page without URL arguments renders, with and without content."""
+
+    PAGES = (
+        'home', 'about', 'administration', 'students', 'filter_students', 'books', 'filter_books',
+        'syllabus', 'filter_syllabus', 'routine', 'filter_routines', 'result_list', 'filter_results',
+        'admission_list', 'filter_admissions', 'gallery_list', 'filter_gallery_images',
+        'filter_gallery_videos', 'filter_facilities', 'contact', 'recent_events', 'recent_events_view',
+        'samprotik_khobor', 'api_principal_message', 'api_updates', 'footer', 'notice_list', 'filter_notices',
+    )
+
+    def assertPagesRender(self):
+        for name in self.PAGES:
+            with self.subTest(page=name):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+    def test_empty_site(self):
+        self.assertPagesRender()
+
+    def test_site_with_content(self):
+        ten = self.make_class(10)
+        science = self.make_department('Science')
+        Student.objects.create(
+            name='Abdul Karim', roll_number='1', registration_number='1001', class_name=ten, department=science,
+            guardian_name='Guardian', guardian_phone='01700000000', address='Dhaka',
+        )
+        Book.objects.create(title='বাংলা', file='books/bangla.pdf', class_name=ten)
+        Result.objects.create(title='Annual Exam', file='results/annual.pdf', class_name=ten)
+
+        self.assertPagesRender()
+
+    def test_students_page_shows_the_first_class(self):
+        ten = self.make_class(10)
+        Student.objects.create(
+            name='Abdul Karim', roll_number='1', registration_number='1001', class_name=ten,
+            guardian_name='Guardian', guardian_phone='01700000000', address='Dhaka',
+        )
+
+        response = self.client.get(reverse('students'))
+
+        self.assertEqual(response.context['initial_class_id'], ten.pk)
+        self.assertEqual([student['name'] for student in response.context['initial_students']], ['Abdul Karim'])
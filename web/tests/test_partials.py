@@ -0,0 +1,67 @@
+# web/tests/test_partials.py
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from web.models import Book
+from web.partials import Fragment
+
+from .base import SiteTestCase
+
+
+class FragmentTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.renders = []
+        self.fragment = Fragment('test', self.render, depends_on=('web.Book',))
+
+    def render(self, request):
+        self.renders.append(request.GET.urlencode())
+        return f'<ul>{request.GET.get("class_id", "all")}</ul>'
+
+    def test_html_is_cached_per_query_string(self):
+        self.assertEqual(self.fragment.html(self.factory.get('/', {'class_id': 1})), '<ul>1</ul>')
+        self.fragment.html(self.factory.get('/', {'class_id': 1}))
+        self.fragment.html(self.factory.get('/', {'class_id': 2}))
+
+        self.assertEqual(self.renders, ['class_id=1', 'class_id=2'])
+
+    def test_a_change_to_a_dependency_renders_again(self):
+        self.fragment.html(self.factory.get('/'))
+
+        Book.objects.create(title='Physics', file='books/physics.pdf')
+        self.fragment.html(self.factory.get('/'))
+
+        self.assertEqual(len(self.renders), 2)
+
+    def test_htmx_requests_get_only_the_fragment(self):
+        view = self.fragment.partial(lambda request: HttpResponse('<html>page</html>'))
+
+        page = view(self.factory.get('/'))
+        partial = view(self.factory.get('/', headers={'hx-request': 'true'}))
+        restore = view(self.factory.get('/', headers={'hx-request': 'true', 'hx-history-restore-request': 'true'}))
+
+        self.assertEqual(page.content, b'<html>page</html>')
+        self.assertEqual(partial.content, b'<ul>all</ul>')
+        self.assertEqual(restore.content, b'<html>page</html>')
+        for response in (page, partial, restore):
+            self.assertEqual(response['Vary'], 'HX-Request')
+
+
+class FilterPageTests(SiteTestCase):
+    def test_books_page_and_its_fragment_list_the_filtered_books(self):
+        ten = self.make_class(10)
+        Book.objects.create(title='Physics', file='books/physics.pdf', class_name=ten)
+        Book.objects.create(title='Chemistry', file='books/chemistry.pdf')
+        url = reverse('books')
+
+        page = self.client.get(url, {'class_id': ten.pk})
+        fragment = self.client.get(url, {'class_id': ten.pk}, headers={'hx-request': 'true'})
+
+        self.assertContains(page, 'Physics')
+        self.assertNotContains(page, 'Chemistry')
+        self.assertContains(fragment, 'Physics')
+        self.assertNotContains(fragment, '<html')
+        self.assertIn(fragment.content.decode(), page.content.decode())
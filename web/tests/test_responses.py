@@ -0,0 +1,96 @@
+# web/tests/test_responses.py
+
+import os
+import tempfile
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from web.responses import parse_range, stream_file
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=500-5000', 1000), (500, 999))
+        self.assertEqual(parse_range('bytes=-5000', 1000), (0, 999))
+
+    def test_ranges_served_as_the_whole_file(self):
+        self.assertIsNone(parse_range('bytes=0-99,200-299', 1000))
+        self.assertIsNone(parse_range('bytes=-', 1000))
+        self.assertIsNone(parse_range('bytes=99-0', 1000))
+        self.assertIsNone(parse_range('items=0-99', 1000))
+
+
+class StreamFileTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'result.pdf')
+        self.data = bytes(range(256)) * 40
+        with open(self.path, 'wb') as f:
+            f.write(self.data)
+        self.mtime = os.stat(self.path).st_mtime
+        self.factory = RequestFactory()
+
+    async def body(self, response):
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    async def test_whole_file(self):
+        response = await stream_file(self.factory.get('/'), self.path, 'result.pdf', as_attachment=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await self.body(response), self.data)
+        self.assertEqual(response['Content-Length'], str(len(self.data)))
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="result.pdf"')
+
+    @override_settings(FILE_STREAM_CHUNK_SIZE=1000)
+    async def test_read_in_chunks(self):
+        response = await stream_file(self.factory.get('/'), self.path)
+
+        chunks = [chunk async for chunk in response.streaming_content]
+
+        self.assertEqual([len(chunk) for chunk in chunks], [1000] * 10 + [240])
+
+    async def test_a_range_is_a_206(self):
+        response = await stream_file(self.factory.get('/', HTTP_RANGE='bytes=100-199'), self.path)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(await self.body(response), self.data[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.data)}')
+        self.assertEqual(response['Content-Length'], '100')
+
+    async def test_an_unsatisfiable_range_is_a_416(self):
+        response = await stream_file(self.factory.get('/', HTTP_RANGE=f'bytes={len(self.data)}-'), self.path)
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    async def test_if_range_with_the_current_date_serves_the_range(self):
+        request = self.factory.get('/', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=http_date(self.mtime))
+
+        response = await stream_file(request, self.path)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(await self.body(response), self.data[:10])
+
+    async def test_if_range_for_another_version_sends_the_whole_file(self):
+        request = self.factory.get('/', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=http_date(self.mtime - 3600))
+
+        response = await stream_file(request, self.path)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await self.body(response), self.data)
+
+    async def test_ranges_only_apply_to_reads(self):
+        response = await stream_file(self.factory.post('/', HTTP_RANGE='bytes=0-9'), self.path)
+
+        self.assertEqual(response.status_code, 200)
+
+    async def test_a_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            await stream_file(self.factory.get('/'), self.path + '.missing')
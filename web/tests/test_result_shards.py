@@ -0,0 +1,87 @@
+# web/tests/test_result_shards.py
+
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from web import result_shards
+from web.models import StudentResult
+from .base import ResultTestCase
+
+
+class ResultShardTests(ResultTestCase):
+    def shard(self, roll='7'):
+        key = result_shards.shard_key(self.ten.pk, roll)
+        path = result_shards.result_dir(self.result.pk) / result_shards.CURRENT / key[:2] / f'{key}.json'
+        return json.loads(path.read_text()) if path.is_file() else None
+
+    def test_publish(self):
+        generation, count = result_shards.publish(self.result)
+
+        self.assertEqual(count, 1)
+        self.assertEqual(result_shards.current_generation(self.result.pk), generation)
+        self.assertEqual(self.shard()['result']['name'], 'Karim')
+        self.assertIsNone(self.shard('8'))
+        self.assertEqual(result_shards.verify(self.result), [])
+        self.assertEqual(
+            result_shards.shard_url(self.result.pk),
+            f'/media/{result_shards.SHARD_DIR}/{self.result.pk}/{result_shards.CURRENT}/',
+        )
+
+    def test_inactive_result_cannot_be_published(self):
+        self.result.is_active = False
+
+        with self.assertRaises(result_shards.ShardError):
+            result_shards.publish(self.result)
+
+    def test_verify_reports_changed_rows(self):
+        result_shards.publish(self.result)
+        StudentResult.objects.filter(pk=self.student_result.pk).update(gpa='4.50')
+
+        self.assertEqual(len(result_shards.verify(self.result)), 1)
+
+    def test_rollback_restores_the_previous_generation(self):
+        first, _ = result_shards.publish(self.result)
+        StudentResult.objects.filter(pk=self.student_result.pk).update(gpa='4.50')
+        second, _ = result_shards.publish(self.result)
+        self.assertEqual(self.shard()['result']['gpa'], '4.50')
+
+        self.assertEqual(result_shards.rollback(self.result), first)
+
+        self.assertEqual(result_shards.current_generation(self.result.pk), first)
+        self.assertEqual(self.shard()['result']['gpa'], '5.00')
+        self.assertNotIn(second, result_shards.generations(self.result.pk))
+
+    def test_rollback_of_the_only_generation_unpublishes(self):
+        result_shards.publish(self.result)
+
+        self.assertIsNone(result_shards.rollback(self.result))
+
+        self.assertIsNone(result_shards.shard_url(self.result.pk))
+        with self.assertRaises(result_shards.ShardError):
+            result_shards.rollback(self.result)
+
+    def test_deactivating_the_result_unpublishes_it(self):
+        generation, _ = result_shards.publish(self.result)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.result.is_active = False
+            self.result.save()
+
+        self.assertIsNone(result_shards.shard_url(self.result.pk))
+        self.assertEqual(result_shards.generations(self.result.pk), [generation])
+
+    def test_deleting_the_result_removes_its_shards(self):
+        result_shards.publish(self.result)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.result.delete()
+
+        self.assertFalse(result_shards.result_dir(self.result.pk).exists())
+
+    def test_publish_command_keeps_the_newest_generations(self):
+        for _ in range(3):
+            call_command('result_shards', 'publish', '--keep=2', stdout=StringIO())
+
+        self.assertEqual(len(result_shards.generations(self.result.pk)), 2)
+        self.assertEqual(result_shards.generations(self.result.pk)[-1], result_shards.current_generation(self.result.pk))
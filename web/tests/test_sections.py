@@ -0,0 +1,56 @@
+# web/tests/test_sections.py
+
+from django.urls import reverse
+
+from web.models import SchoolBriefInfo
+from web.sections import Section, load_sections
+from web.versions import bump_version
+from web.views import ABOUT_SECTIONS
+
+from .base import SiteTestCase
+
+
+class SectionTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return {'loads': self.loads}
+
+    def test_cached_until_a_dependency_changes(self):
+        section = Section('counted', self.load, ('web.Book',))
+
+        self.assertEqual(section.get(), {'loads': 1})
+        self.assertEqual(section.get(), {'loads': 1})
+        bump_version('web.Book')
+        self.assertEqual(section.get(), {'loads': 2})
+
+    def test_a_failing_section_falls_back_alone(self):
+        def broken():
+            raise ValueError('no table')
+
+        sections = [Section('broken', broken, ('web.Book',), default='fallback'), Section('counted', self.load, ())]
+
+        with self.assertLogs('web.sections', 'ERROR') as logs:
+            data = load_sections(sections)
+
+        self.assertEqual(data, {'broken': 'fallback', 'counted': {'loads': 1}})
+        self.assertIn('Error loading section broken', logs.output[0])
+
+    def test_defaults_have_no_stray_whitespace(self):
+        for section in ABOUT_SECTIONS:
+            if isinstance(section.default, dict):
+                for key, value in section.default.items():
+                    if isinstance(value, str):
+                        self.assertEqual(value, value.strip(), f'{section.name}.{key}')
+
+    def test_about_page_follows_edits(self):
+        info = SchoolBriefInfo.objects.create(title='At a glance', teachers_count='40')
+        self.assertContains(self.client.get(reverse('about')), 'At a glance')
+
+        info.title = 'In short'
+        info.save()
+
+        self.assertContains(self.client.get(reverse('about')), 'In short')
@@ -0,0 +1,175 @@
+# web/tests/test_singleflight.py
+
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from web import singleflight
+from web.cache_backends import LockingFileBasedCache, can_lock
+from web.singleflight import get_or_compute, single_flight
+from web.versions import bump_version
+
+from .base import SiteTestCase
+
+
+class Counter:
+    def __init__(self, value='value', delay=0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+class GetOrComputeTests(SiteTestCase):
+    def test_a_fresh_entry_is_not_recomputed(self):
+        compute = Counter()
+
+        self.assertEqual(get_or_compute('key', compute), 'value')
+        self.assertEqual(get_or_compute('key', compute), 'value')
+
+        self.assertEqual(compute.calls, 1)
+
+    def test_a_new_version_recomputes(self):
+        compute = Counter()
+
+        get_or_compute('key', compute, version=1)
+        get_or_compute('key', compute, version=2)
+
+        self.assertEqual(compute.calls, 2)
+
+    def test_should_cache_can_refuse_a_value(self):
+        compute = Counter()
+
+        get_or_compute('key', compute, should_cache=lambda value: False)
+        get_or_compute('key', compute, should_cache=lambda value: False)
+
+        self.assertEqual(compute.calls, 2)
+
+    def test_while_another_worker_recomputes_the_stale_value_is_served(self):
+        get_or_compute('key', Counter('old'), ttl=-1)
+        cache.add('key:lock', 1)
+        compute = Counter('new')
+
+        self.assertEqual(get_or_compute('key', compute), 'old')
+        self.assertEqual(compute.calls, 0)
+
+    def test_a_waiting_worker_gives_up_and_computes(self):
+        cache.add('key:lock', 1)
+        compute = Counter('new')
+
+        with mock.patch.object(singleflight, 'WAIT_TIMEOUT', 0.1):
+            self.assertEqual(get_or_compute('key', compute), 'new')
+        self.assertEqual(compute.calls, 1)
+
+    def test_concurrent_misses_compute_once(self):
+        compute = Counter(delay=0.2)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('key', compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(compute.calls, 1)
+
+    def test_without_a_lock_every_miss_computes(self):
+        cache.add('key:lock', 1)
+        compute = Counter()
+
+        with mock.patch.object(singleflight, 'can_lock', return_value=False):
+            self.assertEqual(get_or_compute('key', compute), 'value')
+        self.assertEqual(compute.calls, 1)
+
+
+class SingleFlightViewTests(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.calls = 0
+
+        @single_flight(depends_on=('web.Book',))
+        def view(request):
+            self.calls += 1
+            return HttpResponse(f'call {self.calls}')
+
+        self.view = view
+        self.factory = RequestFactory()
+
+    def test_responses_are_cached_per_url(self):
+        self.assertEqual(self.view(self.factory.get('/a/')).content, b'call 1')
+        self.assertEqual(self.view(self.factory.get('/a/')).content, b'call 1')
+        self.assertEqual(self.view(self.factory.get('/b/')).content, b'call 2')
+
+    def test_a_version_bump_replaces_the_cached_response(self):
+        self.view(self.factory.get('/a/'))
+
+        bump_version('web.Book')
+
+        self.assertEqual(self.view(self.factory.get('/a/')).content, b'call 2')
+
+    def test_posts_are_not_cached(self):
+        self.view(self.factory.post('/a/'))
+        self.view(self.factory.post('/a/'))
+
+        self.assertEqual(self.calls, 2)
+
+
+class LockingFileBasedCacheTests(SimpleTestCase):
+    def make_cache(self, backend):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return backend(directory.name, {})
+
+    def test_only_the_locking_file_cache_can_lock(self):
+        self.assertTrue(can_lock(self.make_cache(LockingFileBasedCache)))
+        self.assertFalse(can_lock(self.make_cache(FileBasedCache)))
+
+    def test_add_is_exclusive_across_threads(self):
+        backend = self.make_cache(LockingFileBasedCache)
+        results = []
+        barrier = threading.Barrier(10)
+
+        def add():
+            # A separate instance per thread, each opening the lock file itself.
+            worker = LockingFileBasedCache(backend._dir, {})
+            barrier.wait()
+            results.append(worker.add('lock', 1, 10))
+
+        threads = [threading.Thread(target=add) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 1)
+
+    def test_incr_counts_every_increment(self):
+        backend = self.make_cache(LockingFileBasedCache)
+        backend.set('counter', 0)
+
+        def incr():
+            for _ in range(20):
+                LockingFileBasedCache(backend._dir, {}).incr('counter')
+
+        threads = [threading.Thread(target=incr) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(backend.get('counter'), 100)
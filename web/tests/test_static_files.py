@@ -0,0 +1,118 @@
+# web/tests/test_static_files.py
+
+import gzip
+import os
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from web.middleware import StaticFilesMiddleware
+from web.storage import CompressedManifestStaticFilesStorage
+
+
+CSS = b'body { color: #333; margin: 0; padding: 0; }\n' * 20
+
+
+class StaticFilesTestMixin:
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.static_root = directory.name
+        test_settings = override_settings(STATIC_ROOT=self.static_root, STATIC_URL='/static/')
+        test_settings.enable()
+        self.addCleanup(test_settings.disable)
+
+    def write(self, name, content):
+        path = os.path.join(self.static_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+
+class StaticFilesMiddlewareTests(StaticFilesTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse('from the view'))
+
+    def get(self, path, **headers):
+        return self.middleware(self.factory.get(path, headers=headers))
+
+    def body(self, response):
+        content = b''.join(response.streaming_content)
+        response.close()
+        return content
+
+    def test_hashed_names_are_immutable(self):
+        self.write('css/style.0123456789ab.css', CSS)
+
+        response = self.get('/static/css/style.0123456789ab.css')
+
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(self.body(response), CSS)
+
+    def test_unhashed_names_are_revalidated(self):
+        path = self.write('css/style.css', CSS)
+
+        response = self.get('/static/css/style.css')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+        self.body(response)
+
+        response = self.get('/static/css/style.css', if_modified_since=http_date(os.stat(path).st_mtime))
+        self.assertEqual(response.status_code, 304)
+
+    def test_the_precompressed_variant_the_client_accepts(self):
+        self.write('css/style.0123456789ab.css', CSS)
+        self.write('css/style.0123456789ab.css.gz', gzip.compress(CSS))
+
+        response = self.get('/static/css/style.0123456789ab.css', accept_encoding='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(self.body(response)), CSS)
+
+        response = self.get('/static/css/style.0123456789ab.css')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(self.body(response), CSS)
+
+    def test_other_requests_reach_the_view(self):
+        self.write('css/style.css', CSS)
+
+        for request in (
+            self.factory.get('/static/css/missing.css'),
+            self.factory.get('/static/../settings.py'),
+            self.factory.post('/static/css/style.css'),
+            self.factory.get('/books/'),
+        ):
+            with self.subTest(path=request.path, method=request.method):
+                self.assertEqual(self.middleware(request).content, b'from the view')
+
+
+class CompressedManifestStaticFilesStorageTests(StaticFilesTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.storage = CompressedManifestStaticFilesStorage(location=self.static_root)
+
+    def test_text_assets_get_compressed_siblings(self):
+        path = self.write('css/style.css', CSS)
+
+        self.storage.precompress('css/style.css')
+
+        with open(path + '.gz', 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), CSS)
+
+    def test_small_or_incompressible_files_are_left_alone(self):
+        small = self.write('css/small.css', b'a{}')
+        noise = self.write('css/noise.css', os.urandom(4096))
+
+        self.storage.precompress('css/small.css')
+        self.storage.precompress('css/noise.css')
+
+        self.assertFalse(os.path.exists(small + '.gz'))
+        self.assertFalse(os.path.exists(noise + '.gz'))
+
+    def test_a_file_missing_from_the_manifest_keeps_its_name(self):
+        self.assertEqual(self.storage.stored_name('img/placeholder.png'), 'img/placeholder.png')
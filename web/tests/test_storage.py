@@ -0,0 +1,100 @@
+# web/tests/test_storage.py
+
+import os
+from datetime import timedelta
+from io import StringIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.utils import timezone
+from web.models import Book, MediaBlob
+from .base import SiteTestCase, SiteTransactionTestCase
+
+
+class ContentAddressedStorageTests(SiteTestCase):
+    def save_book(self, content, title='Book'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Book.objects.create(title=title, file=ContentFile(content, name='book.pdf'))
+
+    def test_same_content_is_stored_once(self):
+        first = self.save_book(b'same bytes', 'First')
+        second = self.save_book(b'same bytes', 'Second')
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(first.file.name.startswith('blobs/'))
+        self.assertEqual(MediaBlob.objects.get().ref_count, 2)
+
+    def test_saving_a_row_again_keeps_its_count(self):
+        book = self.save_book(b'unchanged')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.title = 'Renamed'
+            book.save()
+
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+
+    def test_replacing_a_file_releases_the_old_blob(self):
+        book = self.save_book(b'first edition')
+        old_name = book.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.file = ContentFile(b'second edition', name='book.pdf')
+            book.save()
+
+        self.assertEqual(MediaBlob.objects.get(name=old_name).ref_count, 0)
+        self.assertEqual(MediaBlob.objects.get(name=book.file.name).ref_count, 1)
+
+    def test_deleting_a_row_releases_its_blob(self):
+        first = self.save_book(b'shared')
+        self.save_book(b'shared')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(default_storage.exists(blob.name))
+
+    def test_collect_media_blobs_deletes_unreferenced_blobs(self):
+        kept = self.save_book(b'kept')
+        dropped = self.save_book(b'dropped')
+        dropped_name = dropped.file.name
+        with self.captureOnCommitCallbacks(execute=True):
+            dropped.delete()
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(hours=2))
+
+        call_command('collect_media_blobs', '--grace-hours=1', stdout=StringIO())
+
+        self.assertEqual(list(MediaBlob.objects.values_list('name', flat=True)), [kept.file.name])
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, dropped_name)))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, kept.file.name)))
+
+    def test_collect_media_blobs_keeps_recent_blobs(self):
+        book = self.save_book(b'just released')
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+
+        call_command('collect_media_blobs', stdout=StringIO())
+
+        self.assertEqual(MediaBlob.objects.count(), 1)
+
+    def test_recount_repairs_reference_counts(self):
+        self.save_book(b'counted')
+        MediaBlob.objects.update(ref_count=5)
+
+        call_command('collect_media_blobs', '--recount', stdout=StringIO())
+
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+
+
+class ReferenceCountTests(SiteTransactionTestCase):
+    def test_a_failed_save_adds_no_reference(self):
+        book = Book.objects.create(title='Book', file=ContentFile(b'shared', name='book.pdf'))
+
+        # The file is stored before the INSERT fails on the duplicate primary key.
+        with self.assertRaises(IntegrityError):
+            Book.objects.create(pk=book.pk, title='Copy', file=ContentFile(b'shared', name='copy.pdf'))
+
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
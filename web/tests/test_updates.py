@@ -0,0 +1,112 @@
+# web/tests/test_updates.py
+
+from django.test import RequestFactory
+from django.urls import reverse
+
+from web import async_views
+from web.changelog import alatest_cursor, changes_since, latest_cursor, updates_payload
+from web.models import Book, ChangeLog
+
+from .base import SiteTestCase
+
+
+class UpdatesFeedTests(SiteTestCase):
+    url = reverse('api_updates')
+
+    def create_book(self, title, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Book.objects.create(title=title, file=f'books/{title}.pdf', **fields)
+
+    def save(self, obj):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+
+    def poll(self, since):
+        return self.client.get(self.url, {'since': since})
+
+    def test_without_a_cursor_returns_the_current_one(self):
+        self.create_book('Physics')
+
+        payload = self.client.get(self.url).json()
+
+        self.assertEqual(payload, {'cursor': latest_cursor(), 'changes': [], 'has_more': False})
+        self.assertNotEqual(payload['cursor'], 0)
+
+    def test_a_quiet_site_answers_204(self):
+        cursor = self.client.get(self.url).json()['cursor']
+
+        response = self.poll(cursor)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(response.content, b'')
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_changes_after_the_cursor(self):
+        cursor = self.client.get(self.url).json()['cursor']
+        book = self.create_book('Physics')
+
+        payload = self.poll(cursor).json()
+
+        self.assertEqual(len(payload['changes']), 1)
+        change = payload['changes'][0]
+        self.assertEqual((change['kind'], change['id'], change['action']), ('book', book.pk, 'published'))
+        self.assertEqual(change['url'], reverse('download_book', kwargs={'pk': book.pk}))
+        self.assertEqual(self.poll(payload['cursor']).status_code, 204)
+
+    def test_publish_edit_and_withdraw(self):
+        book = self.create_book('Physics')
+        cursor = latest_cursor()
+
+        book.title = 'Physics 1st Paper'
+        self.save(book)
+        self.assertEqual(self.poll(cursor).json()['changes'][0]['action'], 'updated')
+
+        cursor = latest_cursor()
+        book.is_active = False
+        self.save(book)
+        change = self.poll(cursor).json()['changes'][0]
+        self.assertEqual((change['action'], change['url']), ('removed', ''))
+
+    def test_hidden_rows_are_not_logged(self):
+        cursor = latest_cursor()
+
+        self.create_book('Draft', is_active=False)
+
+        self.assertEqual(self.poll(cursor).status_code, 204)
+
+    def test_several_changes_to_one_item_collapse_into_the_latest(self):
+        cursor = latest_cursor()
+        book = self.create_book('Physics')
+        other = self.create_book('Chemistry')
+        book.title = 'Physics 1st Paper'
+        self.save(book)
+
+        changes = self.poll(cursor).json()['changes']
+
+        self.assertEqual([(change['id'], change['title']) for change in changes],
+                         [(other.pk, 'Chemistry'), (book.pk, 'Physics 1st Paper')])
+
+    def test_a_long_backlog_is_paged(self):
+        cursor = latest_cursor()
+        for title in ('a', 'b', 'c'):
+            self.create_book(title)
+
+        first = updates_payload(changes_since(cursor, limit=2), limit=2)
+        rest = updates_payload(changes_since(first['cursor'], limit=2), limit=2)
+
+        self.assertEqual(([change['title'] for change in first['changes']], first['has_more']), (['a', 'b'], True))
+        self.assertEqual(([change['title'] for change in rest['changes']], rest['has_more']), (['c'], False))
+
+    def test_rows_are_written_only_on_commit(self):
+        Book.objects.create(title='Physics', file='books/physics.pdf')
+
+        self.assertFalse(ChangeLog.objects.exists())
+
+    async def test_async_view(self):
+        factory = RequestFactory()
+
+        start = await async_views.api_updates(factory.get(self.url))
+        quiet = await async_views.api_updates(factory.get(self.url, {'since': await alatest_cursor()}))
+
+        self.assertEqual(start.status_code, 200)
+        self.assertEqual(quiet.status_code, 204)
@@ -0,0 +1,41 @@
+# web/tests/test_versioned_cache.py
+
+from django.template import Context, Template, TemplateSyntaxError
+
+from notice.models import NoticeType
+from web.models import ImportantLink
+
+from .base import SiteTestCase
+
+
+class CacheVersionedTagTests(SiteTestCase):
+    def render(self, models, **context):
+        template = Template(
+            '{% load versioned_cache %}'
+            '{% cache_versioned "links" ' + models + ' %}{{ value }}{% endcache_versioned %}'
+        )
+        return template.render(Context(context))
+
+    def test_the_block_is_cached_until_a_named_model_changes(self):
+        self.assertEqual(self.render('ImportantLink', value='first'), 'first')
+        self.assertEqual(self.render('ImportantLink', value='second'), 'first')
+
+        ImportantLink.objects.create(title='Education Board', url='https://example.com/board')
+
+        self.assertEqual(self.render('ImportantLink', value='third'), 'third')
+
+    def test_dotted_labels_and_other_apps(self):
+        self.assertEqual(self.render('notice.NoticeType', value='first'), 'first')
+
+        NoticeType.objects.create(name='Exam', slug='exam')
+
+        self.assertEqual(self.render('NoticeType', value='second'), 'second')
+
+    def test_bad_arguments_fail_at_compile_time(self):
+        for source in (
+            '{% cache_versioned "links" %}{% endcache_versioned %}',
+            '{% cache_versioned "links" NoSuchModel %}{% endcache_versioned %}',
+            '{% cache_versioned "links" no.Such %}{% endcache_versioned %}',
+        ):
+            with self.subTest(source), self.assertRaises(TemplateSyntaxError):
+                Template('{% load versioned_cache %}' + source)
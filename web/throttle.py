@@ -0,0 +1,103 @@
+# web/throttle.py
+
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.core.cache import cache
+from .cache_backends import can_lock, fcntl, file_lock
+
+
+LOCK_TIMEOUT = 1
+LOCK_ATTEMPTS = 5
+LOCK_RETRY_DELAY = 0.01
+# Used instead of cache locks when the shared cache has no atomic add() (see can_lock()).
+FALLBACK_LOCK_FILE = os.path.join(tempfile.gettempdir(), 'django-web-throttle.lock')
+
+
+def client_ip(request):
+    """
+    The visitor's address. Behind a reverse proxy REMOTE_ADDR is the
+    proxy's, so settings.CLIENT_IP_HEADER names the META key the proxy sets
+    (e.g. 'HTTP_X_FORWARDED_FOR'). In a comma-separated list the client can
+    prepend anything, so the entry CLIENT_IP_PROXY_COUNT places from the
+    right (the one our own proxy added) is used. REMOTE_ADDR is used only
+    when no header is configured; a configured header that is missing gives ''.
+    """
+    header = getattr(settings, 'CLIENT_IP_HEADER', None)
+    if not header:
+        return request.META.get('REMOTE_ADDR', '')
+    addresses = [address.strip() for address in request.META.get(header, '').split(',') if address.strip()]
+    proxies = getattr(settings, 'CLIENT_IP_PROXY_COUNT', 1)
+    return addresses[-proxies] if len(addresses) >= proxies else ''
+
+
+def _host_lock():
+    """The fallback lock: a lock file, which only excludes workers on this host."""
+    return file_lock(FALLBACK_LOCK_FILE) if fcntl is not None else nullcontext()
+
+
+@contextmanager
+def _exclusive(lock_key):
+    """
+    Yields True while this worker alone may update the bucket behind
+    lock_key, or False if the lock could not be had. With an atomic cache
+    add() that is a short cache lock, otherwise _host_lock().
+    """
+    if not can_lock():
+        with _host_lock():
+            yield True
+        return
+
+    for _ in range(LOCK_ATTEMPTS):
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            break
+        time.sleep(LOCK_RETRY_DELAY)
+    else:
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        cache.delete(lock_key)
+
+
+def take_token(key, capacity, refill_seconds):
+    """
+    Cache-backed token bucket: `capacity` requests at once, then one more
+    every `refill_seconds`. Returns (allowed, retry_after_seconds).
+
+    The read-modify-write is guarded by a lock (see _exclusive()). If the
+    lock cannot be had, the request is refused: contention on one bucket
+    only happens when that client is flooding us anyway.
+    """
+    bucket_key = f'throttle:{key}'
+    with _exclusive(f'{bucket_key}:lock') as locked:
+        if not locked:
+            return False, refill_seconds
+        now = time.time()
+        tokens, updated = cache.get(bucket_key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) / refill_seconds)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # A bucket refills completely in capacity * refill_seconds; after that it can go.
+        cache.set(bucket_key, (tokens, now), int(capacity * refill_seconds) + 1)
+        return allowed, 0 if allowed else int((1 - tokens) * refill_seconds) + 1
+
+
+def first_seen(*parts, window=3600):
+    """
+    True the first time this combination of values is seen within `window`
+    seconds, False for repeats. Values are compared case- and
+    whitespace-insensitively.
+    """
+    normalized = '\x1f'.join(' '.join(str(part).split()).casefold() for part in parts)
+    key = f"seen:{hashlib.sha256(normalized.encode()).hexdigest()}"
+    if can_lock():
+        return cache.add(key, 1, window)
+    with _host_lock():
+        return cache.add(key, 1, window)
@@ -1,9 +1,11 @@
 # web/urls.py
 
+from django.conf import settings
 from django.urls import path
 from . views import *
-from django.conf import settings
-from django.conf.urls.static import static
+
+if settings.ASYNC_VIEWS:
+    from .async_views import *
 
 urlpatterns = [
     path('', home, name='home'),
@@ -16,6 +18,7 @@ urlpatterns = [
     # Other paths...
     path('students/', students, name='students'),
     path('filter/', filter_students, name='filter_students'),
+    path('students/lookup/', lookup_student, name='lookup_student'),
     path('books/', books, name='books'),
     path('filter-books/', filter_books, name='filter_books'),
     path('syllabus/', syllabus, name='syllabus'),
@@ -29,6 +32,7 @@ urlpatterns = [
     path('filter-results/', filter_results, name='filter_results'),
     path('download-result/<int:pk>/', download_result, name='download_result'),
     path('view-result-pdf/<int:pk>/', view_result_pdf, name='view_result_pdf'),
+    path('results/lookup/', lookup_result, name='lookup_result'),
     path('admissions/', admission_list, name='admission_list'),
     path('filter-admissions/', filter_admissions, name='filter_admissions'),
     path('download-admission/<int:pk>/', download_admission, name='download_admission'),
@@ -49,9 +53,11 @@ urlpatterns = [
 
     # --- API ENDPOINTS ---
     path('api/principal-message/', api_principal_message, name='api_principal_message'),
+    path('api/documents/', api_documents, name='api_documents'),
+    path('api/updates/', api_updates, name='api_updates'),
+    path('api/updates/stream/', api_updates_stream, name='api_updates_stream'),
+    path('api/notices/stream/', notice_stream, name='notice_stream'),
 
     path('footer/', footer_view, name='footer'),
-]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+    path('metrics/', metrics, name='metrics'),
+]
\ No newline at end of file
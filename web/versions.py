@@ -0,0 +1,65 @@
+# web/versions.py
+
+import threading
+import time
+
+from django.core.cache import cache
+
+
+# Apps whose saves and deletes bump versions (see web.signals).
+CONTENT_APPS = ('web', 'notice')
+
+
+def version_key(name):
+    return f'version:{name.lower()}'
+
+
+_last_version = 0
+_last_version_lock = threading.Lock()
+
+
+def _new_version():
+    # A fresh value per write rather than a counter: incr() is a read and a
+    # write on some backends, so two concurrent bumps could both store n + 1.
+    # A version lost from the cache also restarts at a value it has never
+    # had before, so entries stored under an old version never look current
+    # again. Within a process it is strictly increasing even where the clock
+    # is coarse.
+    global _last_version
+    with _last_version_lock:
+        _last_version = max(time.time_ns(), _last_version + 1)
+        return _last_version
+
+
+def get_versions(*names):
+    """
+    Current versions of content groups, as a tuple. A name is an app
+    label ('web') or a model label ('web.Result'); both are bumped whenever
+    a row of that model is saved or deleted (see web.signals).
+    """
+    keys = [version_key(name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+async def aget_versions(*names):
+    """Async get_versions()."""
+    keys = [version_key(name) for name in names]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, _new_version(), None)
+            versions[key] = await cache.aget(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_version(*names):
+    cache.set_many({version_key(name): _new_version() for name in names}, None)
+
+
+def bump_model_version(model):
+    bump_version(model._meta.app_label, model._meta.label)
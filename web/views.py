@@ -1,6 +1,6 @@
 # web/views.py
 
-from django.http import FileResponse, HttpResponseNotFound, HttpResponseServerError, JsonResponse
+from django.http import FileResponse, HttpResponse, HttpResponseNotFound, HttpResponseServerError, JsonResponse
 from django.shortcuts import get_object_or_404, render
 import json
 from .models import *
@@ -8,14 +8,39 @@ from .models import *
 from urllib.parse import quote
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
+from django.views.decorators.cache import cache_control
+from django.utils.cache import add_never_cache_headers, patch_cache_control
 from django.utils.translation import gettext as _
 import os
 from django.urls import reverse
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from collections import OrderedDict
 from django.template.loader import render_to_string
 from django.db.models import Sum
-
-
+from .images import image_metadata
+from .layout import footer_html
+from .listings import Listing, listing_context
+from .partials import Fragment
+from .sections import Section, load_sections
+from .taxonomy import TAXONOMY_MODELS, taxonomy
+from .changelog import changes_since, latest_cursor, parse_cursor, updates_payload
+from .document_index import DOCUMENT_VALUES, SOURCES_BY_KIND, document_counts, document_row, latest_documents
+from .conditional import conditional_listing
+from .singleflight import single_flight
+from . import metrics as metrics_registry
+from .lookup import find_by_roll, normalize_number
+from .result_shards import shard_url, student_result_data
+from .throttle import client_ip, first_seen, take_token
+from .write_buffer import WriteBuffer
+
+
+@single_flight(ttl=300, depends_on=(
+    'web.Slider', 'web.SchoolBriefInfo', 'web.SchoolHistory', 'web.Gallery', 'web.AboutMessage', 'web.Notice',
+    'web.ImportantLink', 'web.News', 'web.NewsLink', 'web.EventAndNews', 'web.EventAndNewsImage',
+    # the navbar and footer spliced into the page (see web.layout)
+    'web.SchoolInfo', 'notice.Notice',
+))
 def home(request):
     slider_images = Slider.objects.filter(is_active=True).exclude(image='').order_by('-created_at')
     brief_info_obj = SchoolBriefInfo.objects.filter(is_active=True).first()
@@ -145,11 +170,28 @@ def administration(request):
 
 
 
+def _render_student_results(request):
+    students_data, male_count, female_count = _student_listing(request)
+    return render_to_string('component/students/student_results.html', {
+        'students': students_data,
+        'male_count': male_count,
+        'female_count': female_count,
+        'total_count': male_count + female_count,
+    })
+
+
+students_fragment = Fragment(
+    'students', _render_student_results, depends_on=('web.Student', 'web.Class', 'web.Department'),
+)
+
+
+@students_fragment.partial
 def students(request):
-    classes = Class.objects.all().order_by('numeric_value')
-    departments = Department.objects.all()
+    snapshot = taxonomy()
+    classes = snapshot.classes
+    departments = snapshot.departments
     
-    initial_class = classes.first()
+    initial_class = classes[0] if classes else None
     students_to_display_qs = Student.objects.none()
     male_count = 0
     female_count = 0
@@ -189,6 +231,17 @@ def students(request):
 
 
 def filter_students(request):
+    return _students_response(*_student_listing(request))
+
+
+def _student_listing(request):
+    """(students data, male count, female count) for ?class_id= or ?dept_slug=."""
+    students, male_count, female_count = _student_query(request, taxonomy())
+    return [_student_data(student) for student in students], male_count, female_count
+
+
+def _student_query(request, snapshot):
+    """(students queryset, male count, female count) for ?class_id= or ?dept_slug=; shared with the async view."""
     class_id = request.GET.get('class_id')
     dept_slug = request.GET.get('dept_slug')
     
@@ -197,37 +250,30 @@ def filter_students(request):
     display_students = Student.objects.none()
 
     if class_id:
-        try:
-            cls = Class.objects.get(id=class_id)
+        cls = snapshot.get_class(class_id)
+        if cls is not None:
             male_count = cls.male_student
             female_count = cls.female_student
             if cls.show_students_publicly:
-                display_students = Student.objects.filter(class_name=cls).select_related('class_name', 'department')
-        except Class.DoesNotExist:
-            pass # Counts will remain 0, display_students will be empty
-    
+                display_students = Student.objects.filter(class_name_id=cls.pk).select_related('class_name', 'department')
+
     elif dept_slug:
-        # Get students from publicly visible classes first
-        visible_class_ids = Class.objects.filter(
-            students__department__slug=dept_slug,
-            show_students_publicly=True
-        ).distinct().values_list('id', flat=True)
-        
-        display_students = Student.objects.filter(
-            department__slug=dept_slug,
-            class_name_id__in=visible_class_ids
-        ).select_related('class_name', 'department')
-
-        # Get the department and use its direct manual counts
-        try:
-            department = Department.objects.get(slug=dept_slug)
+        department = snapshot.get_department(dept_slug)
+        if department is not None:
+            # Only students of publicly visible classes are listed; the
+            # department's manual counts are shown either way.
+            display_students = Student.objects.filter(
+                department_id=department.pk,
+                class_name_id__in=snapshot.public_class_ids
+            ).select_related('class_name', 'department')
             male_count = department.male_student
             female_count = department.female_student
-        except Department.DoesNotExist:
-            pass # Counts remain 0
 
-    # Serialize student data
-    students_data = [{
+    return display_students, male_count, female_count
+
+
+def _student_data(student):
+    return {
         'id': student.id,
         'name': student.name,
         'roll': student.roll_number,
@@ -238,8 +284,10 @@ def filter_students(request):
         'guardian_name': student.guardian_name,
         'guardian_phone': student.guardian_phone,
         'address': student.address,
-    } for student in display_students]
-    
+    }
+
+
+def _students_response(students_data, male_count, female_count):
     # Render components to HTML strings
     student_list_html = render_to_string(
         'component/students/student_list.html',
@@ -257,254 +305,259 @@ def filter_students(request):
     })
 
 
+def lookup_student(request):
+    """Public roll-number lookup: ?class_id=<id>&roll=<roll number>"""
+    class_id = request.GET.get('class_id')
+    roll = request.GET.get('roll', '').strip()
+    if not class_id or not class_id.isdigit() or not roll:
+        return JsonResponse({'error': 'class_id and roll are required'}, status=400)
 
+    student = find_by_roll(class_id, roll)
+    # Only classes the school chose to list publicly are searchable.
+    if student is None or not student.class_name.show_students_publicly:
+        return JsonResponse({'found': False}, status=404)
 
+    return JsonResponse({
+        'found': True,
+        'student': {
+            'id': student.id,
+            'name': student.name,
+            'roll': student.roll_number,
+            'class_name': student.class_name.name,
+            'department': student.department.name if student.department else '',
+            'image': student.photo.url if student.photo else f'/static/img/administration/{student.id % 10 + 1}.jpeg',
+        },
+    })
 
 
 
 
 
-def about(request):
-    """Enhanced About page with modern UI elements from information service"""
-    try:
-        # === EXISTING ABOUT PAGE DATA ===
-        about_page = AboutPage.objects.filter(is_active=True).first()
-        school_history = SchoolHistory.objects.all().first()
-        brief_info = SchoolBriefInfo.objects.filter(is_active=True).first()
-        
-        principal_message_obj = (
-            AboutMessage.objects.filter(is_active=True, show_on_home_page=True)
-            .first()
-            or AboutMessage.objects.filter(is_active=True)
-            .order_by('order', '-created_at')
-            .first()
-        )
-        
-        messages = AboutMessage.objects.filter(is_active=True, show_on_home_page=False).order_by('serial_no')
-        approval = SchoolApproval.objects.filter(is_active=True).first()
-        recognition = SchoolRecognition.objects.filter(is_active=True).first()
-        aims = SchoolAims.objects.filter(is_active=True).first()
-        
-        aim_points = []
-        if aims:
-            aim_points = AimPoint.objects.filter(aim=aims, is_active=True).order_by('order')
-        
-        news_items = EventAndNews.objects.filter(status=True, type='NEWS').prefetch_related('gallery_images').order_by('-created_at')[:3]
-        links = ImportantLink.objects.filter(is_active=True).order_by('order')[:5]
-        
-        # === NEW: INFORMATION SERVICE DATA FOR MODERN UI ===
-        slider_images = Slider.objects.filter(is_active=True).exclude(image='').order_by('-created_at')
-        
-        # ### FIXED FACILITY GATHERING LOGIC ###
-        # 1. Get all active facility types to ensure all filter buttons are created, preserving order.
-        all_active_types = FacilityType.objects.filter(is_active=True).order_by('order')
-
-        # 2. Pre-populate an ordered dictionary. This ensures types with no facilities still appear for filtering.
-        facility_groups = OrderedDict((ftype, []) for ftype in all_active_types)
-
-        # 3. Get all active facilities that belong to an active type.
-        # This query excludes facilities with deleted (NULL) types or inactive types.
-        facilities_qs = FacilityInfo.objects.filter(
-            is_active=True,
-            facility_type__is_active=True
-        ).select_related('facility_type').order_by('order')
-
-        # 4. Populate the groups with the fetched facilities.
-        for facility in facilities_qs:
-            if facility.facility_type in facility_groups:
-                facility_groups[facility.facility_type].append(facility)
-        
-        # Get faculty information for team section (use administration teachers only)
-        faculty_members = FacultyMember.objects.filter(is_active=True, category='administration').order_by('order')[:8]  # Limit to 8 for about page
-        
-        # Get information service content
-        info_service = InformationService.objects.filter(is_active=True).first()
-        
-        # Prepare context data
-        about_content = {
-            'title': about_page.title if about_page else 'আমাদের সম্পর্কে (About Us)',
-            'history': {
-                'title': school_history.title if school_history else 'প্রতিষ্ঠানের ইতিহাস',
-                'content': school_history.content if school_history else 'ইতিহাসের তথ্য পাওয়া যায়নি।'
-            },
-            'brief_info': {
-                'title': brief_info.title if brief_info else 'সংক্ষিপ্ত তথ্য',
-                'teachers': brief_info.teachers_count if brief_info else '৫০+',
-                'departments': brief_info.departments_count if brief_info else '৫',
-                'classrooms': brief_info.classrooms_count if brief_info else '৩০+',
-                'students': brief_info.students_count if brief_info else '১০০০+',
-                'description': brief_info.description if brief_info else 'সংক্ষিপ্ত তথ্যের বিবরণ পাওয়া যায়নি।'
-            },
-            'principal_message': principal_message_obj,
-            'approval': {
-                'title': approval.title if approval else 'অনুমোদন',
-                'content': approval.content if approval else 'অনুমোদনের তথ্য পাওয়া যায়নি।',
-                'image': approval.image if approval else None
-            },
-            'recognition': recognition,
-            'aims': {
-                'title': aims.title if aims else 'লক্ষ্য ও উদ্দেশ্য',
-                'content': aims.content if aims else 'লক্ষ্য ও উদ্দেশ্যের বিবরণ পাওয়া যায়নি।',
-                'points': [point.point for point in aim_points]
-            },
-            'news_links': {
-                'title': 'সংবাদ/প্রয়োজনীয় লিংক',
-                'news': [
-                    {
-                        'id': news.id,
-                        'title': news.title,
-                        'description': news.description,
-                        'date': news.created_at.strftime('%d %B, %Y') if news.created_at else 'তারিখ নেই',
-                        'time': news.created_at.strftime('%H:%M') if news.created_at else '',
-                        'primary_image': news.primary_image.url if news.primary_image else '',
-                        'gallery_images': [
-                            {
-                                'url': img.image.url,
-                                'title': img.title,
-                                'description': img.description
-                            } for img in news.gallery_images.all()
-                        ]
-                    } for news in news_items
-                ],
-                'links': [
+
+
+
+
+def _about_title():
+    about_page = AboutPage.objects.filter(is_active=True).first()
+    return about_page.title if about_page else 'আমাদের সম্পর্কে (About Us)'
+
+
+def _about_history():
+    school_history = SchoolHistory.objects.all().first()
+    return {
+        'title': school_history.title if school_history else 'প্রতিষ্ঠানের ইতিহাস',
+        'content': school_history.content if school_history else 'ইতিহাসের তথ্য পাওয়া যায়নি।',
+        'object': school_history,
+    }
+
+
+def _about_brief_info():
+    brief_info = SchoolBriefInfo.objects.filter(is_active=True).first()
+    return {
+        'title': brief_info.title if brief_info else 'সংক্ষিপ্ত তথ্য',
+        'teachers': brief_info.teachers_count if brief_info else '৫০+',
+        'departments': brief_info.departments_count if brief_info else '৫',
+        'classrooms': brief_info.classrooms_count if brief_info else '৩০+',
+        'students': brief_info.students_count if brief_info else '১০০০+',
+        'description': brief_info.description if brief_info else 'সংক্ষিপ্ত তথ্যের বিবরণ পাওয়া যায়নি।'
+    }
+
+
+def _about_messages():
+    principal_message = (
+        AboutMessage.objects.filter(is_active=True, show_on_home_page=True).first()
+        or AboutMessage.objects.filter(is_active=True).order_by('serial_no', '-created_at').first()
+    )
+    messages = AboutMessage.objects.filter(is_active=True, show_on_home_page=False).order_by('serial_no')
+    return {'principal_message': principal_message, 'messages': list(messages)}
+
+
+def _about_approval():
+    approval = SchoolApproval.objects.filter(is_active=True).first()
+    return {
+        'title': approval.title if approval else 'অনুমোদন',
+        'content': approval.content if approval else 'অনুমোদনের তথ্য পাওয়া যায়নি।',
+        'image': approval.image if approval else None
+    }
+
+
+def _about_recognition():
+    return SchoolRecognition.objects.filter(is_active=True).first()
+
+
+def _about_aims():
+    aims = SchoolAims.objects.filter(is_active=True).first()
+    aim_points = AimPoint.objects.filter(aim=aims, is_active=True).order_by('order') if aims else []
+    return {
+        'title': aims.title if aims else 'লক্ষ্য ও উদ্দেশ্য',
+        'content': aims.content if aims else 'লক্ষ্য ও উদ্দেশ্যের বিবরণ পাওয়া যায়নি।',
+        'points': [point.point for point in aim_points]
+    }
+
+
+def _about_news_links():
+    news_items = EventAndNews.objects.filter(status=True, type='NEWS').prefetch_related('gallery_images').order_by('-created_at')[:3]
+    links = ImportantLink.objects.filter(is_active=True).order_by('order')[:5]
+    return {
+        'title': 'সংবাদ/প্রয়োজনীয় লিংক',
+        'news': [
+            {
+                'id': news.id,
+                'title': news.title,
+                'description': news.description,
+                'date': news.created_at.strftime('%d %B, %Y') if news.created_at else 'তারিখ নেই',
+                'time': news.created_at.strftime('%H:%M') if news.created_at else '',
+                'primary_image': news.primary_image.url if news.primary_image else '',
+                'gallery_images': [
                     {
-                        'title': link.title,
-                        'url': link.url
-                    } for link in links
-                ]
-            }
-        }
-        
-        # Enhanced context with modern UI data
-        context = {
-            'about_content': about_content,
-            'messages': messages,
-            'principal_message': principal_message_obj,
-            # === NEW: MODERN UI DATA ===
-            'slider_images': slider_images,
-            'facility_groups': facility_groups, # Pass the new, ordered, and complete groups
-            'faculty_members': faculty_members,
-            'info_service': info_service,
-            'school_history': school_history, 
-        }
-        
-        return render(request, 'website/about.html', context)
-        
-    except Exception as e:
-        # Fallback to default content if there's any error
-        # (This part remains unchanged)
-        about_content = {
-            'title': 'আমাদের সম্পর্কে (About Us)',
-            'history': {
-                'title': 'প্রতিষ্ঠানের ইতিহাস',
-                'content': 'আমাদের স্কুল ১৯৮০ সালে প্রতিষ্ঠিত হয়েছিল। প্রতিষ্ঠানটি প্রথমে একটি ছোট ভবনে শুরু হয়েছিল মাত্র ৫০ জন শিক্ষার্থী নিয়ে। বর্তমানে আমাদের প্রতিষ্ঠানে ১০০০+ শিক্ষার্থী অধ্যয়নরত। গত ৪০+ বছরে আমাদের প্রতিষ্ঠান অনেক চড়াই-উতরাই পেরিয়ে আজ একটি সম্মানজনক অবস্থানে পৌঁছেছে। আমাদের প্রাক্তন শিক্ষার্থীরা দেশের বিভিন্ন গুরুত্বপূর্ণ পদে অধিষ্ঠিত আছেন এবং সমাজের উন্নয়নে অবদান রাখছেন।'
-            },
-            'brief_info': {
-                'title': 'সংক্ষিপ্ত তথ্য',
-                'teachers': ' ৫০+',
-                'departments': '৫',
-                'classrooms': '৩০+',
-                'students': '১০০০+',
-                'description': 'আমাদের প্রতিষ্ঠানে অভিজ্ঞ শিক্ষক-শিক্ষিকা দ্বারা পরিচালিত বিভিন্ন বিভাগ রয়েছে। আধুনিক সুযোগ-সুবিধা সম্পন্ন ক্লাসরুম, ল্যাবরেটরি, লাইব্রেরি এবং খেলার মাঠ রয়েছে।'
-            },
-            'principal_message': None,
-            'approval': {
-                'title': 'অনুমোদন',
-                'content': 'আমাদের প্রতিষ্ঠানটি শিক্ষা মন্ত্রণালয় কর্তৃক অনুমোদিত এবর বাংলাদেশ শিক্ষা বোর্ড দ্বারা স্বীকৃত। আমাদের প্রতিষ্ঠানের সকল শাখা সরকারি নিয়ম অনুযায়ী পরিচালিত হয়।',
-                'branches': [
-                    {'name': 'প্রধান শাখা', 'location': 'মিরপুর, ঢাকা', 'established': '১৯৮০'},
-                    {'name': 'দ্বিতীয় শাখা', 'location': 'উত্তরা, ঢাকা', 'established': '২০০৫'}
-                ]
-            },
-            'recognition': None,
-            'aims': {
-                'title': 'লক্ষ্য ও উদ্দেশ্য',
-                'content': 'আমাদের প্রতিষ্ঠানের মূল লক্ষ্য হল শিক্ষার্থীদের মেধা ও মননের সর্বাঙ্গীণ বিকাশ সাধন করা। আমরা চাই আমাদের শিক্ষার্থীরা শুধু একাডেমিক জ্ঞান নয়, বরং নৈতিক মূল্যবোধ, সামাজিক দায়বদ্ধতা এবং নেতৃত্বের গুণাবলী অর্জন করুক।',
-                'points': [
-                    'উচ্চমানের শিক্ষা প্রদান',
-                    'নৈতিক মূল্যবোধ গঠন',
-                    'সৃজনশীলতা ও উদ্ভাবনী চিন্তার বিকাশ',
-                    'দেশপ্রেম ও সামাজিক দায়বদ্ধতা সৃষ্টি',
-                    'আধুনিক প্রযুক্তি ব্যবহারে দক্ষতা অর্জন'
-                ]
-            },
-            'news_links': {
-                'title': 'সংবাদ/প্রয়োজনীয় লিংক',
-                'news': [
-                    {'title': 'বার্ষিক ক্রীড়া প্রতিযোগিতা ২০২৩', 'date': '১০ ডিসেম্বর, ২০২৩', 'link': '#'},
-                    {'title': 'বিজ্ঞান মেলা আয়োজন', 'date': '১৪ নভেম্বর, ২০২৩', 'link': '#'},
-                    {'title': 'শিক্ষক নিয়োগ বিজ্ঞপ্তি', 'date': '০৫ অক্টোবর, ২০২৩', 'link': '#'}
-                ],
-                'links': [
-                    {'title': 'শিক্ষা মন্ত্রণালয়', 'url': 'https://moedu.gov.bd/'},
-                    {'title': 'বাংলাদেশ শিক্ষা বোর্ড', 'url': 'https://www.educationboard.gov.bd/'},
-                    {'title': 'জাতীয় শিক্ষাক্রম ও পাঠ্যপুস্তক বোর্ড', 'url': 'http://www.nctb.gov.bd/'}
+                        'url': img.image.url,
+                        'title': img.title,
+                        'description': img.description
+                    } for img in news.gallery_images.all()
                 ]
-            }
-        }
-        
-        return render(request, 'website/about.html', {
-            'about_content': about_content,
-            'messages': []  # Empty list as fallback
-        })
+            } for news in news_items
+        ],
+        'links': [
+            {
+                'title': link.title,
+                'url': link.url
+            } for link in links
+        ]
+    }
 
 
+def _about_sliders():
+    return list(Slider.objects.filter(is_active=True).exclude(image='').order_by('-created_at'))
 
 
+def _about_facilities():
+    # Every active type gets a filter button, even one without facilities.
+    facility_groups = OrderedDict(
+        (ftype, []) for ftype in FacilityType.objects.filter(is_active=True).order_by('order')
+    )
+    facilities = FacilityInfo.objects.filter(
+        is_active=True,
+        facility_type__is_active=True
+    ).select_related('facility_type').order_by('order')
+    for facility in facilities:
+        if facility.facility_type in facility_groups:
+            facility_groups[facility.facility_type].append(facility)
+    return facility_groups
+
+
+def _about_faculty():
+    # Administration members only, at most 8 on this page.
+    return list(FacultyMember.objects.filter(is_active=True, category='administration').order_by('order')[:8])
+
+
+# Each section is cached on its own and falls back on its own; the defaults
+# are what the page showed when it could not load anything.
+ABOUT_SECTIONS = [
+    Section('about_title', _about_title, ('web.AboutPage',), default='আমাদের সম্পর্কে (About Us)'),
+    Section('about_history', _about_history, ('web.SchoolHistory',), default={
+        'title': 'প্রতিষ্ঠানের ইতিহাস',
+        'content': 'আমাদের স্কুল ১৯৮০ সালে প্রতিষ্ঠিত হয়েছিল। প্রতিষ্ঠানটি প্রথমে একটি ছোট ভবনে শুরু হয়েছিল মাত্র ৫০ জন শিক্ষার্থী নিয়ে। বর্তমানে আমাদের প্রতিষ্ঠানে ১০০০+ শিক্ষার্থী অধ্যয়নরত। গত ৪০+ বছরে আমাদের প্রতিষ্ঠান অনেক চড়াই-উতরাই পেরিয়ে আজ একটি সম্মানজনক অবস্থানে পৌঁছেছে। আমাদের প্রাক্তন শিক্ষার্থীরা দেশের বিভিন্ন গুরুত্বপূর্ণ পদে অধিষ্ঠিত আছেন এবং সমাজের উন্নয়নে অবদান রাখছেন।',
+        'object': None,
+    }),
+    Section('about_brief_info', _about_brief_info, ('web.SchoolBriefInfo',), default={
+        'title': 'সংক্ষিপ্ত তথ্য',
+        'teachers': '৫০+',
+        'departments': '৫',
+        'classrooms': '৩০+',
+        'students': '১০০০+',
+        'description': 'আমাদের প্রতিষ্ঠানে অভিজ্ঞ শিক্ষক-শিক্ষিকা দ্বারা পরিচালিত বিভিন্ন বিভাগ রয়েছে। আধুনিক সুযোগ-সুবিধা সম্পন্ন ক্লাসরুম, ল্যাবরেটরি, লাইব্রেরি এবং খেলার মাঠ রয়েছে।'
+    }),
+    Section('about_messages', _about_messages, ('web.AboutMessage',), default={
+        'principal_message': None, 'messages': [],
+    }),
+    Section('about_approval', _about_approval, ('web.SchoolApproval',), default={
+        'title': 'অনুমোদন',
+        'content': 'আমাদের প্রতিষ্ঠানটি শিক্ষা মন্ত্রণালয় কর্তৃক অনুমোদিত এবর বাংলাদেশ শিক্ষা বোর্ড দ্বারা স্বীকৃত। আমাদের প্রতিষ্ঠানের সকল শাখা সরকারি নিয়ম অনুযায়ী পরিচালিত হয়।',
+        'image': None,
+    }),
+    Section('about_recognition', _about_recognition, ('web.SchoolRecognition',)),
+    Section('about_aims', _about_aims, ('web.SchoolAims', 'web.AimPoint'), default={
+        'title': 'লক্ষ্য ও উদ্দেশ্য',
+        'content': 'আমাদের প্রতিষ্ঠানের মূল লক্ষ্য হল শিক্ষার্থীদের মেধা ও মননের সর্বাঙ্গীণ বিকাশ সাধন করা। আমরা চাই আমাদের শিক্ষার্থীরা শুধু একাডেমিক জ্ঞান নয়, বরং নৈতিক মূল্যবোধ, সামাজিক দায়বদ্ধতা এবং নেতৃত্বের গুণাবলী অর্জন করুক।',
+        'points': [
+            'উচ্চমানের শিক্ষা প্রদান',
+            'নৈতিক মূল্যবোধ গঠন',
+            'সৃজনশীলতা ও উদ্ভাবনী চিন্তার বিকাশ',
+            'দেশপ্রেম ও সামাজিক দায়বদ্ধতা সৃষ্টি',
+            'আধুনিক প্রযুক্তি ব্যবহারে দক্ষতা অর্জন'
+        ]
+    }),
+    Section('about_news_links', _about_news_links, ('web.EventAndNews', 'web.EventAndNewsImage', 'web.ImportantLink'), default={
+        'title': 'সংবাদ/প্রয়োজনীয় লিংক',
+        'news': [],
+        'links': [
+            {'title': 'শিক্ষা মন্ত্রণালয়', 'url': 'https://moedu.gov.bd/'},
+            {'title': 'বাংলাদেশ শিক্ষা বোর্ড', 'url': 'https://www.educationboard.gov.bd/'},
+            {'title': 'জাতীয় শিক্ষাক্রম ও পাঠ্যপুস্তক বোর্ড', 'url': 'http://www.nctb.gov.bd/'}
+        ]
+    }),
+    Section('about_sliders', _about_sliders, ('web.Slider',), default=[]),
+    Section('about_facilities', _about_facilities, ('web.FacilityType', 'web.FacilityInfo'), default=OrderedDict()),
+    Section('about_faculty', _about_faculty, ('web.FacultyMember',), default=[]),
+]
+
 
+def about(request):
+    """About page, assembled from the cached ABOUT_SECTIONS."""
+    sections = load_sections(ABOUT_SECTIONS)
+    messages = sections['about_messages']
+    about_content = {
+        'title': sections['about_title'],
+        'history': sections['about_history'],
+        'brief_info': sections['about_brief_info'],
+        'principal_message': messages['principal_message'],
+        'approval': sections['about_approval'],
+        'recognition': sections['about_recognition'],
+        'aims': sections['about_aims'],
+        'news_links': sections['about_news_links'],
+    }
+    context = {
+        'about_content': about_content,
+        'messages': messages['messages'],
+        'principal_message': messages['principal_message'],
+        'slider_images': sections['about_sliders'],
+        'facility_groups': sections['about_facilities'],
+        'faculty_members': sections['about_faculty'],
+        'school_history': sections['about_history']['object'],
+    }
+    return render(request, 'website/about.html', context)
+
+
+routines_listing = Listing(
+    'routines', Routine, 'download_routine', params={'type': 'category'}, defaults={'type': 'class'},
+)
+filter_routines = routines_listing.view()
+
+
+def _render_routine_list(request):
+    return render_to_string('component/listing/file_table.html', {
+        **listing_context(request, routines_listing),
+        'empty_message': 'কোন রুটিন পাওয়া যায়নি',
+    })
+
+
+routine_fragment = Fragment('routine', _render_routine_list, depends_on=routines_listing.depends_on)
+
+
+@routine_fragment.partial
 def routine(request):
-    classes = Class.objects.all().order_by('numeric_value')
-    departments = Department.objects.all()
-    
-    # Get initial routines (class routines by default)
-    initial_routines = Routine.objects.filter(
-        category='class', 
-        is_active=True
-    ).select_related('class_name', 'department')
+    snapshot = taxonomy()
+    classes = snapshot.classes
+    departments = snapshot.departments
     
     context = {
         'classes': classes,
         'departments': departments,
-        'initial_routines': initial_routines,
+        'routine_list_html': routine_fragment.html(request),
     }
     return render(request, 'website/routine.html', context)
 
 
-def filter_routines(request):
-    routine_type = request.GET.get('type', 'class')
-    class_id = request.GET.get('class_id')
-    dept_slug = request.GET.get('dept_slug')
-    
-    routines = Routine.objects.filter(
-        category=routine_type,
-        is_active=True
-    ).select_related('class_name', 'department')
-    
-    if class_id and class_id.isdigit():
-        routines = routines.filter(class_name_id=int(class_id))
-    elif dept_slug:
-        routines = routines.filter(department__slug=dept_slug)
-    
-    routines = routines.order_by('-updated_at')
-    
-    # Prepare data for JSON response
-    routines_data = []
-    for routine in routines:
-        routines_data.append({
-            'id': routine.id,
-            'title': routine.title,
-            'class_name': routine.class_name.name if routine.class_name else '',
-            'department': routine.department.name if routine.department else '',
-            'updated_at': routine.updated_at.strftime('%d %b %Y'),
-            'file_url': routine.file.url,
-            'download_url': f'/download-routine/{routine.id}/'
-        })
-        
-    return JsonResponse({'routines': routines_data})
-
-
-
-
 def download_routine(request, pk):
     routine = Routine.objects.get(pk=pk)
     response = FileResponse(routine.file.open(), as_attachment=True)
@@ -513,104 +566,66 @@ def download_routine(request, pk):
 
 
 
+books_listing = Listing('books', Book, 'download_book', absolute_urls=True)
+filter_books = books_listing.view()
+
+
+def _render_book_list(request):
+    return render_to_string('component/listing/file_table.html', {
+        **listing_context(request, books_listing),
+        'empty_message': 'কোন বই পাওয়া যায়নি',
+    })
+
+
+books_fragment = Fragment('books', _render_book_list, depends_on=books_listing.depends_on)
+
+
+@books_fragment.partial
 def books(request):
-    classes = Class.objects.all().order_by('numeric_value')
-    departments = Department.objects.all()
-    
-    # Get initial books
-    initial_books = Book.objects.filter(
-        is_active=True
-    ).select_related('class_name', 'department')
+    snapshot = taxonomy()
+    classes = snapshot.classes
+    departments = snapshot.departments
     
     context = {
         'classes': classes,
         'departments': departments,
-        'initial_books': initial_books,
+        'books_list_html': books_fragment.html(request),
     }
     return render(request, 'website/books.html', context)
 
 
 
 
-def filter_books(request):
-    class_id = request.GET.get('class_id')
-    dept_slug = request.GET.get('dept_slug')
-    
-    books = Book.objects.filter(
-        is_active=True
-    ).select_related('class_name', 'department')
-    
-    if class_id and class_id.isdigit():
-        books = books.filter(class_name_id=int(class_id))
-    elif dept_slug:
-        books = books.filter(department__slug=dept_slug)
-    
-    books = books.order_by('-updated_at')
-    
-    # Prepare data for JSON response
-    books_data = []
-    for book in books:
-        books_data.append({
-            'id': book.id,
-            'title': book.title,
-            'class_name': book.class_name.name if book.class_name else '',
-            'department': book.department.name if book.department else '',
-            'updated_at': book.updated_at.strftime('%d %b %Y'),
-            'file_url': request.build_absolute_uri(book.file.url),
-            'download_url': request.build_absolute_uri(f'/download-book/{book.id}/')
-        })
-        
-    return JsonResponse({'books': books_data})
+syllabus_listing = Listing('syllabus', Syllabus, 'download_syllabus', exclude={'file': ''}, absolute_urls=True)
+filter_syllabus = syllabus_listing.view()
+
+
+def _render_syllabus_list(request):
+    return render_to_string('component/listing/file_table.html', {
+        **listing_context(request, syllabus_listing),
+        'title_heading': 'পাঠ্যক্রমের শিরোনাম',
+        'empty_message': 'কোন পাঠ্যক্রম পাওয়া যায়নি',
+        'empty_hint': 'দয়া করে অন্য বিভাগ বা শ্রেণি নির্বাচন করুন',
+    })
 
 
+syllabus_fragment = Fragment('syllabus', _render_syllabus_list, depends_on=syllabus_listing.depends_on)
+
+
+@syllabus_fragment.partial
 def syllabus(request):
-    classes = Class.objects.all().order_by('numeric_value')
-    departments = Department.objects.all()
-    
-    # Get initial syllabus
-    initial_syllabus = Syllabus.objects.filter(
-        is_active=True
-    ).exclude(file='').select_related('class_name', 'department')
+    snapshot = taxonomy()
+    classes = snapshot.classes
+    departments = snapshot.departments
     
     context = {
         'classes': classes,
         'departments': departments,
-        'initial_syllabus': initial_syllabus,
+        'syllabus_list_html': syllabus_fragment.html(request),
     }
     return render(request, 'website/syllabus.html', context)
 
 
-def filter_syllabus(request):
-    class_id = request.GET.get('class_id')
-    dept_slug = request.GET.get('dept_slug')
-    
-    syllabus_items = Syllabus.objects.filter(
-        is_active=True
-    ).exclude(file='').select_related('class_name', 'department')
-    
-    if class_id and class_id.isdigit():
-        syllabus_items = syllabus_items.filter(class_name_id=int(class_id))
-    elif dept_slug:
-        syllabus_items = syllabus_items.filter(department__slug=dept_slug)
-    
-    syllabus_items = syllabus_items.order_by('-updated_at')
-    
-    # Prepare data for JSON response
-    syllabus_data = []
-    for syllabus in syllabus_items:
-        syllabus_data.append({
-            'id': syllabus.id,
-            'title': syllabus.title,
-            'class_name': syllabus.class_name.name if syllabus.class_name else '',
-            'department': syllabus.department.name if syllabus.department else '',
-            'updated_at': syllabus.updated_at.strftime('%d %b %Y'),
-            'file_url': request.build_absolute_uri(syllabus.file.url) if syllabus.file else '',
-            'download_url': request.build_absolute_uri(f'/download-syllabus/{syllabus.id}/')
-        })
-        
-    return JsonResponse({'syllabus': syllabus_data})
-
-
 def download_book(request, pk):
     try:
         book = Book.objects.get(pk=pk)
@@ -647,42 +662,38 @@ def download_syllabus(request, pk):
         print(f"Error downloading syllabus: {e}")
         return HttpResponseServerError('An error occurred during download.')
 
-def result_list(request):
-    classes = Class.objects.all().order_by('numeric_value')
-    departments = Department.objects.all()
+def _result_extra(row, values, snapshot):
+    # shard_url() is a single stat() per result, cheap enough to do inline.
+    row['class_id'] = values['class_name_id'] or ''
+    row['shard_url'] = shard_url(values['id'])
 
-    context = {
-        'classes': classes,
-        'departments': departments,
-    }
-    return render(request, 'website/results.html', context)
 
-def filter_results(request):
-    class_id = request.GET.get('class_id')
-    dept_slug = request.GET.get('dept_slug')
+results_listing = Listing(
+    'results', Result, 'download_result', order_by='-created_at', extra=_result_extra,
+)
+filter_results = results_listing.view()
 
-    results = Result.objects.filter(is_active=True)
 
-    if class_id and class_id.isdigit():
-        results = results.filter(class_name_id=int(class_id))
-    elif dept_slug:
-        results = results.filter(department__slug=dept_slug)
+def _render_result_list(request):
+    return render_to_string('component/results/result_listing.html', listing_context(request, results_listing))
+
 
-    results = results.order_by('-created_at')
+# Publishing shards bumps the Result version too (see result_shards._mark_changed).
+results_fragment = Fragment('results', _render_result_list, depends_on=results_listing.depends_on)
 
-    results_data = []
-    for result in results:
-        results_data.append({
-            'id': result.id,
-            'title': result.title,
-            'class_name': result.class_name.name if result.class_name else '',
-            'department': result.department.name if result.department else '',
-            'updated_at': result.updated_at.strftime('%d %b %Y'),
-            'file_url': result.file.url,
-            'download_url': f'/download-result/{result.id}/',
-        })
 
-    return JsonResponse({'results': results_data})
+@results_fragment.partial
+def result_list(request):
+    snapshot = taxonomy()
+    classes = snapshot.classes
+    departments = snapshot.departments
+
+    context = {
+        'classes': classes,
+        'departments': departments,
+        'result_list_html': results_fragment.html(request),
+    }
+    return render(request, 'website/results.html', context)
 
 def download_result(request, pk):
     try:
@@ -706,43 +717,75 @@ def view_result_pdf(request, pk):
     return response
 
 
+LOOKUP_MAX_AGE = 300
+
+
+def lookup_result(request):
+    """
+    One student's result: ?result_id=<exam>&roll=<roll>[&class_id=<id>].
+    JSON by default, a small HTML fragment with &format=html.
+
+    Only found results are publicly cacheable; a "not found" made just
+    before results are published must not stick in browsers and proxies.
+    """
+    response = _lookup_result(request)
+    if response.status_code == 200:
+        patch_cache_control(response, public=True, max_age=LOOKUP_MAX_AGE)
+    else:
+        add_never_cache_headers(response)
+    return response
+
+
+def _lookup_result(request):
+    result_id = request.GET.get('result_id', '')
+    class_id = request.GET.get('class_id', '')
+    roll = normalize_number(request.GET.get('roll', ''))
+    if not result_id.isdigit() or not roll:
+        return JsonResponse({'error': 'result_id and roll are required'}, status=400)
+
+    student_results = StudentResult.objects.filter(
+        result_id=result_id, result__is_active=True, roll_number=roll,
+    ).select_related('result', 'class_name')
+    if class_id.isdigit():
+        student_results = student_results.filter(class_name_id=class_id)
+    student_result = student_results.first()
+
+    if request.GET.get('format') == 'html':
+        html = render_to_string('component/results/student_result.html', {'student_result': student_result, 'roll': roll})
+        return HttpResponse(html, status=200 if student_result else 404)
+
+    if student_result is None:
+        return JsonResponse({'found': False}, status=404)
+    return JsonResponse({
+        'found': True,
+        'result': student_result_data(student_result),
+    }, json_dumps_params={'ensure_ascii': False})
+
+
 # Admission Views
-def admission_list(request):
-    classes = Class.objects.all().order_by('numeric_value')
-    departments = Department.objects.all()
+admissions_listing = Listing('admissions', Admission, 'download_admission', order_by='-created_at')
+filter_admissions = admissions_listing.view()
 
-    context = {
-        'classes': classes,
-        'departments': departments,
-    }
-    return render(request, 'website/admissions.html', context)
 
-def filter_admissions(request):
-    class_id = request.GET.get('class_id')
-    dept_slug = request.GET.get('dept_slug')
+def _render_admission_list(request):
+    return render_to_string('component/admissions/admission_list.html', listing_context(request, admissions_listing))
 
-    admissions = Admission.objects.filter(is_active=True)
 
-    if class_id and class_id.isdigit():
-        admissions = admissions.filter(class_name_id=int(class_id))
-    elif dept_slug:
-        admissions = admissions.filter(department__slug=dept_slug)
+admissions_fragment = Fragment('admissions', _render_admission_list, depends_on=admissions_listing.depends_on)
 
-    admissions = admissions.order_by('-created_at')
 
-    admissions_data = []
-    for admission in admissions:
-        admissions_data.append({
-            'id': admission.id,
-            'title': admission.title,
-            'class_name': admission.class_name.name if admission.class_name else '',
-            'department': admission.department.name if admission.department else '',
-            'updated_at': admission.updated_at.strftime('%d %b %Y'),
-            'file_url': admission.file.url,
-            'download_url': reverse('download_admission', kwargs={'pk': admission.id}),
-        })
+@admissions_fragment.partial
+def admission_list(request):
+    snapshot = taxonomy()
+    classes = snapshot.classes
+    departments = snapshot.departments
 
-    return JsonResponse({'admissions': admissions_data})
+    context = {
+        'classes': classes,
+        'departments': departments,
+        'admission_list_html': admissions_fragment.html(request),
+    }
+    return render(request, 'website/admissions.html', context)
 
 def download_admission(request, pk):
     try:
@@ -777,7 +820,7 @@ def gallery_list(request):
     }
     return render(request, 'website/gallery.html', context)
 
-def filter_gallery_images(request):
+def _filtered_gallery_images(request):
     category = request.GET.get('category', 'all')
     
     images = Gallery.objects.filter(is_slider=False) # Exclude sliders from main gallery
@@ -785,22 +828,27 @@ def filter_gallery_images(request):
     if category != 'all':
         images = images.filter(category=category)
 
-    images = images.order_by('-created_at')
+    return images.order_by('-created_at')
 
-    images_data = []
-    for image in images:
-        image_url = ''
-        if image.image:
-            image_url = request.build_absolute_uri(image.image.url)
-        
-        images_data.append({
-            'id': image.id,
-            'title': image.title,
-            'image_url': image_url,
-            'description': image.description,
-            'category': image.get_category_display(),
-        })
-    return JsonResponse({'images': images_data})
+
+def filter_gallery_images(request):
+    images = _filtered_gallery_images(request)
+    return JsonResponse({'images': [_gallery_image_data(request, image) for image in images]})
+
+
+def _gallery_image_data(request, image):
+    image_url = ''
+    if image.image:
+        image_url = request.build_absolute_uri(image.image.url)
+
+    return {
+        'id': image.id,
+        'title': image.title,
+        'image_url': image_url,
+        'description': image.description,
+        'category': image.get_category_display(),
+        **image_metadata(image, 'image'),
+    }
 
 def filter_gallery_videos(request):
     videos = Video.objects.filter(is_active=True).order_by('-created_at')
@@ -813,18 +861,22 @@ def filter_gallery_videos(request):
             video.save()
         
         if video.youtube_id:  # Only include videos with valid YouTube IDs
-            videos_data.append({
-                'id': video.id,
-                'title': video.title,
-                'youtube_id': video.youtube_id,
-                'description': video.description,
-                'embed_url': video.embed_url,
-                'thumbnail_url': video.thumbnail_url,
-            })
+            videos_data.append(_video_data(video))
     
     return JsonResponse({'videos': videos_data})
 
 
+def _video_data(video):
+    return {
+        'id': video.id,
+        'title': video.title,
+        'youtube_id': video.youtube_id,
+        'description': video.description,
+        'embed_url': video.embed_url,
+        'thumbnail_url': video.thumbnail_url,
+    }
+
+
 # def information_service(request):
 #     """Information Service Center page"""
 #     # Get slider images
@@ -864,8 +916,7 @@ def filter_gallery_videos(request):
 #     return render(request, 'website/information_service.html', context)
 
 
-def filter_facilities(request):
-    """AJAX endpoint for filtering facilities"""
+def _filtered_facilities(request):
     facility_type_name = request.GET.get('type', 'all')
     
     # Eager load the related facility_type to prevent N+1 query issues
@@ -875,24 +926,28 @@ def filter_facilities(request):
         # FIXED: Correctly filter by the 'name' of the related FacilityType model
         facilities = facilities.filter(facility_type__name=facility_type_name)
     
-    facilities = facilities.order_by('order')
-    
-    facilities_data = []
-    for facility in facilities:
-        # Safely access related object's attributes
-        facility_type_obj = facility.facility_type
-        facilities_data.append({
-            'id': facility.id,
-            'type': facility_type_obj.name if facility_type_obj else '',
-            'type_display': facility_type_obj.name if facility_type_obj else '', # Display name is just the name
-            'title': facility.title,
-            'description': facility.description,
-            'count': facility.count,
-            'unit': facility.unit,
-            'image_url': facility.image.url if facility.image else '',
-        })
-    
-    return JsonResponse({'facilities': facilities_data})
+    return facilities.order_by('order')
+
+
+def filter_facilities(request):
+    """AJAX endpoint for filtering facilities"""
+    facilities = _filtered_facilities(request)
+    return JsonResponse({'facilities': [_facility_data(facility) for facility in facilities]})
+
+
+def _facility_data(facility):
+    # Safely access related object's attributes
+    facility_type_obj = facility.facility_type
+    return {
+        'id': facility.id,
+        'type': facility_type_obj.name if facility_type_obj else '',
+        'type_display': facility_type_obj.name if facility_type_obj else '', # Display name is just the name
+        'title': facility.title,
+        'description': facility.description,
+        'count': facility.count,
+        'unit': facility.unit,
+        'image_url': facility.image.url if facility.image else '',
+    }
 
 
 def contact(request):
@@ -901,15 +956,26 @@ def contact(request):
         'contact_info': contact_info
     })
 
+CONTACT_IP_BUCKET = (5, 60)         # burst of 5, then one message per minute per IP
+CONTACT_PHONE_BUCKET = (3, 600)     # burst of 3, then one per 10 minutes per phone number
+CONTACT_DUPLICATE_WINDOW = 60 * 60
+contact_message_buffer = WriteBuffer(ContactMessage)
+metrics_registry.describe('contact_messages_total', 'counter', 'Contact form submissions by outcome.')
+
+
 @csrf_exempt
 @require_POST
 def submit_contact_message(request):
-    import json
-    data = json.loads(request.body.decode('utf-8'))
-    name = data.get('name', '').strip()
-    phone = data.get('phone', '').strip()
-    title = data.get('title', '').strip()
-    message = data.get('message', '').strip()
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return JsonResponse({'success': False, 'message': 'অবৈধ অনুরোধ।'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'success': False, 'message': 'অবৈধ অনুরোধ।'}, status=400)
+    name = str(data.get('name') or '').strip()
+    phone = str(data.get('phone') or '').strip()
+    title = str(data.get('title') or '').strip()
+    message = str(data.get('message') or '').strip()
 
     errors = {}
     if not name:
@@ -924,32 +990,51 @@ def submit_contact_message(request):
     if errors:
         return JsonResponse({'success': False, 'errors': errors}, status=400)
 
-    ContactMessage.objects.create(
-        name=name,
-        phone=phone,
-        title=title,
-        message=message
-    )
-    return JsonResponse({'success': True, 'message': 'আপনার বার্তা সফলভাবে পাঠানো হয়েছে!'}, status=201)
+    # Rows are written later by the buffer, which cannot reject them, so
+    # everything the database would refuse (e.g. max_length) is caught here.
+    contact_message = ContactMessage(name=name, phone=phone, title=title, message=message)
+    try:
+        contact_message.full_clean()
+    except ValidationError as e:
+        return JsonResponse({
+            'success': False,
+            'errors': {field: ' '.join(messages) for field, messages in e.message_dict.items()},
+        }, status=400)
+
+    phone_digits = normalize_number(phone)
+    for key, (capacity, refill_seconds) in (
+        (f"contact:ip:{client_ip(request)}", CONTACT_IP_BUCKET),
+        (f"contact:phone:{phone_digits}", CONTACT_PHONE_BUCKET),
+    ):
+        allowed, retry_after = take_token(key, capacity, refill_seconds)
+        if not allowed:
+            metrics_registry.inc('contact_messages_total', outcome='throttled')
+            response = JsonResponse({'success': False, 'message': 'অনেক বেশি বার্তা পাঠানো হয়েছে। কিছুক্ষণ পরে আবার চেষ্টা করুন।'}, status=429)
+            response['Retry-After'] = str(retry_after)
+            return response
+
+    # The same message sent twice (double click, retry, bot) is stored once.
+    if not first_seen(phone_digits, title, message, window=CONTACT_DUPLICATE_WINDOW):
+        metrics_registry.inc('contact_messages_total', outcome='duplicate')
+        return JsonResponse({'success': True, 'duplicate': True, 'message': 'এই বার্তাটি আগেই পাঠানো হয়েছে।'})
+
+    # 202: the row is buffered and written shortly (see web.write_buffer).
+    contact_message_buffer.add(contact_message)
+    metrics_registry.inc('contact_messages_total', outcome='accepted')
+    return JsonResponse({'success': True, 'message': 'আপনার বার্তা সফলভাবে পাঠানো হয়েছে!'}, status=202)
 
 
 
 
 # --- NEW DEDICATED FOOTER VIEW ---
+@cache_control(public=True, max_age=300)
+@single_flight(ttl=300, depends_on=('web.SchoolInfo', 'web.ImportantLink'))
 def footer_view(request):
     """
-    This view fetches all the data needed for the footer component.
+    The footer on its own, for clients that load it separately. Full pages
+    already include it (see web.layout), from the same cached render.
     """
-    # The school_info object is already available everywhere via context processor,
-    # but fetching it here ensures the footer can be loaded independently if needed.
-    school_info = SchoolInfo.objects.first()
-    important_links = ImportantLink.objects.filter(is_active=True).order_by('order')[:5]
-
-    context = {
-        'school_info': school_info,
-        'footer_links': important_links,
-    }
-    return render(request, 'website/include/footer.html', context)
+    return HttpResponse(footer_html())
 
 
 # --- RECENT EVENTS VIEW ---
@@ -982,7 +1067,7 @@ def recent_events_view(request):
         'events': events,
     }
     
-    return render(request, 'recent_events.html', context)
+    return render(request, 'website/recent_events.html', context)
 
 
 def samprotik_khobor(request):
@@ -1017,37 +1102,38 @@ def event_news_detail(request, pk):
     """
     try:
         item = EventAndNews.objects.prefetch_related('gallery_images').get(pk=pk, status=True)
-        
-        # Prepare gallery images
-        gallery_images = []
-        if item.gallery_images.exists():
-            gallery_images = [
-                {
-                    'url': img.image.url,
-                    'title': img.title,
-                    'description': img.description
-                }
-                for img in item.gallery_images.all()
-            ]
-        
-        data = {
-            'id': item.id,
-            'title': item.title,
-            'type': item.type,
-            'type_display': item.type_display_bengali,
-            'description': item.description,
-            'primary_image': item.primary_image.url if item.primary_image else '',
-            'gallery_images': gallery_images,
-            'created_at': item.created_at.strftime('%d %B, %Y'),
-            'created_at_time': item.created_at.strftime('%H:%M'),
-        }
-        
-        return JsonResponse({'success': True, 'data': data})
+        return JsonResponse({'success': True, 'data': _event_news_data(item)})
     
     except EventAndNews.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Item not found'})
 
 
+def _event_news_data(item):
+    """Expects gallery_images to be prefetched."""
+    gallery_images = [
+        {
+            'url': img.image.url,
+            'title': img.title,
+            'description': img.description,
+            **image_metadata(img, 'image'),
+        }
+        for img in item.gallery_images.all()
+    ]
+
+    return {
+        'id': item.id,
+        'title': item.title,
+        'type': item.type,
+        'type_display': item.type_display_bengali,
+        'description': item.description,
+        'primary_image': item.primary_image.url if item.primary_image else '',
+        'primary_image_meta': image_metadata(item, 'primary_image'),
+        'gallery_images': gallery_images,
+        'created_at': item.created_at.strftime('%d %B, %Y'),
+        'created_at_time': item.created_at.strftime('%H:%M'),
+    }
+
+
 
 
 def api_principal_message(request):
@@ -1061,24 +1147,7 @@ def api_principal_message(request):
             show_on_home_page=True
         ).select_related('role').first()
         
-        if principal_message:
-            data = {
-                'success': True,
-                'data': {
-                    'id': principal_message.id,
-                    'name': principal_message.name,
-                    'role': principal_message.role.name if principal_message.role else None,
-                    'message': principal_message.message,
-                    'photo_url': principal_message.photo.url if principal_message.photo else None,
-                    'created_at': principal_message.created_at.isoformat(),
-                    'updated_at': principal_message.updated_at.isoformat(),
-                }
-            }
-        else:
-            data = {
-                'success': False,
-                'message': 'No principal message found for home page'
-            }
+        data = _principal_message_data(principal_message)
             
     except Exception as e:
         data = {
@@ -1086,4 +1155,117 @@ def api_principal_message(request):
             'message': f'Error fetching principal message: {str(e)}'
         }
     
-    return JsonResponse(data)
\ No newline at end of file
+    return JsonResponse(data)
+
+
+def _principal_message_data(principal_message):
+    if not principal_message:
+        return {
+            'success': False,
+            'message': 'No principal message found for home page'
+        }
+    return {
+        'success': True,
+        'data': {
+            'id': principal_message.id,
+            'name': principal_message.name,
+            'role': principal_message.role.name if principal_message.role else None,
+            'message': principal_message.message,
+            'photo_url': principal_message.photo.url if principal_message.photo else None,
+            'created_at': principal_message.created_at.isoformat(),
+            'updated_at': principal_message.updated_at.isoformat(),
+        }
+    }
+
+
+DOCUMENTS_PAGE_SIZE = 20
+
+
+@single_flight(ttl=60, depends_on=('web.DocumentIndex',) + TAXONOMY_MODELS)
+def api_documents(request):
+    """
+    Newest documents of every type (web.document_index), narrowed by ?kind=,
+    ?class_id=, ?dept_slug= or ?type_slug= (notice type) and paged by ?page=,
+    with the number of active documents per kind.
+    """
+    snapshot = taxonomy()
+    kind = request.GET.get('kind') or None
+    class_id = request.GET.get('class_id', '')
+    dept_slug = request.GET.get('dept_slug')
+    type_slug = request.GET.get('type_slug')
+    # An unknown slug becomes id 0, which matches nothing.
+    department_id = snapshot.department_id_by_slug.get(dept_slug, 0) if dept_slug else None
+    notice_type_id = snapshot.notice_type_id_by_slug.get(type_slug, 0) if type_slug else None
+
+    documents = []
+    has_next = False
+    page = request.GET.get('page', '')
+    page = int(page) if page.isdigit() and int(page) > 0 else 1
+    if kind is None or kind in SOURCES_BY_KIND:
+        rows = latest_documents(
+            kind=kind, class_id=int(class_id) if class_id.isdigit() else None,
+            department_id=department_id, notice_type_id=notice_type_id,
+        ).values(*DOCUMENT_VALUES)
+        # One row past the page tells whether there is a next page without a COUNT.
+        start = (page - 1) * DOCUMENTS_PAGE_SIZE
+        rows = list(rows[start:start + DOCUMENTS_PAGE_SIZE + 1])
+        documents = [document_row(values, snapshot) for values in rows[:DOCUMENTS_PAGE_SIZE]]
+        has_next = len(rows) > DOCUMENTS_PAGE_SIZE
+
+    return JsonResponse({
+        'documents': documents,
+        'counts': document_counts(),
+        'page': page,
+        'has_next': has_next,
+    })
+
+
+@cache_control(no_cache=True)
+def api_updates(request):
+    """
+    Changes since ?since=<cursor> (see web.changelog): 204 with an empty body
+    when there are none. Without a cursor, returns the current one to start from.
+    """
+    since = parse_cursor(request.GET.get('since'))
+    if since is None:
+        return JsonResponse({'cursor': latest_cursor(), 'changes': [], 'has_more': False})
+    rows = list(changes_since(since))
+    if not rows:
+        return HttpResponse(status=204)
+    return JsonResponse(updates_payload(rows))
+
+
+def api_updates_stream(request):
+    """
+    The event streams are served by the async views (web/async_views.py).
+    Under WSGI they would hold a worker thread each, so this answers 204,
+    which tells EventSource not to reconnect.
+    """
+    return HttpResponse(status=204)
+
+
+notice_stream = api_updates_stream
+
+
+PROXY_HEADERS = ('HTTP_X_FORWARDED_FOR', 'HTTP_FORWARDED', 'HTTP_X_REAL_IP')
+
+
+def _metrics_ip_allowed(request):
+    """
+    Whether the client's address is in METRICS_ALLOWED_IPS (empty by
+    default: staff only). Without CLIENT_IP_HEADER a proxied request's
+    REMOTE_ADDR is the proxy's, often 127.0.0.1, so it is never trusted.
+    """
+    allowed_ips = getattr(settings, 'METRICS_ALLOWED_IPS', ())
+    if not allowed_ips:
+        return False
+    if not getattr(settings, 'CLIENT_IP_HEADER', None) and any(header in request.META for header in PROXY_HEADERS):
+        return False
+    return client_ip(request) in allowed_ips
+
+
+def metrics(request):
+    """Process metrics in the Prometheus text format, for staff and METRICS_ALLOWED_IPS."""
+    if not (request.user.is_staff or _metrics_ip_allowed(request)):
+        return HttpResponseNotFound()
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,87 @@
+# web/write_buffer.py
+
+import atexit
+import logging
+import threading
+
+from django.db import connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBuffer:
+    """
+    Collects unsaved model instances and writes them with bulk_create,
+    batch_size at a time or flush_interval seconds after the first one
+    arrived, whichever comes first. Anything still buffered is written at
+    interpreter exit.
+
+    bulk_create skips save() and the post_save signal, and rows buffered in
+    a process that is killed are lost. Use it only for append-only rows
+    like contact messages where that trade-off is acceptable.
+    """
+
+    def __init__(self, model, batch_size=20, flush_interval=2.0):
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pending = []
+        self.timer = None
+        atexit.register(self.flush)
+
+    def add(self, instance):
+        with self.lock:
+            self.pending.append(instance)
+            full = len(self.pending) >= self.batch_size
+            if not full and self.timer is None:
+                self.timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self.timer.daemon = True
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Write everything buffered; returns the number of rows written. If the
+        batch fails, rows are written one at a time and any that still fail
+        are logged and dropped, so one bad row cannot block the rest. Never
+        raises: it runs inside whichever request or timer filled the buffer.
+        """
+        with self.lock:
+            batch, self.pending = self.pending, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if not batch:
+            return 0
+        # Each write gets its own savepoint, so a failure cannot break a
+        # transaction the caller happens to be in.
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(batch)
+            return len(batch)
+        except Exception:
+            logger.warning(
+                "Error writing %d buffered %s row(s), retrying one by one",
+                len(batch), self.model.__name__, exc_info=True,
+            )
+        written = 0
+        for instance in batch:
+            try:
+                with transaction.atomic():
+                    self.model.objects.bulk_create([instance])
+                written += 1
+            except Exception:
+                # Logged in full, since this is the only copy left of the row.
+                values = {field.attname: getattr(instance, field.attname) for field in self.model._meta.concrete_fields}
+                logger.exception("Dropped buffered %s row %r", self.model.__name__, values)
+        return written
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread opened its own database connection.
+            connections.close_all()